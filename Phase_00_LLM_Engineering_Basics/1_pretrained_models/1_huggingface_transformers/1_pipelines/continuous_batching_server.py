@@ -0,0 +1,573 @@
+"""
+Continuous-Batching Text Generation Server on CPU
+
+This script turns the text-generation model used in `text_generation_pipeline.py`
+into a local generation service that serves many concurrent requests at once.
+
+Requirements:
+- transformers library: pip install transformers
+- torch: pip install torch
+
+Overview:
+    - Every request is prefilled (its prompt encoded) on its own and then JOINS the
+      running decode batch at the next step boundary. It does not wait for the
+      current batch to finish — this is "continuous batching".
+    - One decode step produces one new token for EVERY active sequence with a
+      single forward pass, so the cost of the model weights is shared.
+    - Finished sequences leave the batch immediately, freeing their slot.
+    - Tokens are streamed back to each caller as soon as they are sampled.
+
+Key Concepts:
+    - KV cache: the attention keys/values of all previous tokens. Reusing it means
+      each decode step only processes the single newest token of each sequence.
+    - Sequences in a batch have different lengths, so their caches are LEFT-padded
+      to a common length. The attention mask hides the padding and explicit
+      position ids keep every sequence's positions correct.
+
+Example:
+    >>> server = ContinuousBatchingServer()
+    >>> server.start()
+    >>> for piece in server.submit("In this course i'll will teach you", max_new_tokens=20):
+    ...     print(piece, end="", flush=True)
+    >>> server.stop()
+"""
+
+import json
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import torch
+import torch.nn.functional as F
+from transformers import AutoModelForCausalLM, AutoTokenizer, DynamicCache
+
+from model_registry import get_pipeline
+
+# Same default model as pipeline("text-generation")
+DEFAULT_MODEL_NAME = "openai-community/gpt2"
+
+
+# -----------------------------------------------------------------------------
+# KV cache helpers
+# -----------------------------------------------------------------------------
+def to_legacy_cache(past_key_values) -> tuple:
+    """
+    Convert a model's KV cache into a tuple of (key, value) tensors per layer,
+    each shaped [batch, heads, seq_len, head_dim].
+    """
+    if hasattr(past_key_values, "to_legacy_cache"):
+        return past_key_values.to_legacy_cache()
+    if hasattr(past_key_values, "layers"):
+        return tuple((layer.keys, layer.values) for layer in past_key_values.layers)
+    return tuple(past_key_values)
+
+
+def build_cache(legacy_cache: tuple) -> DynamicCache:
+    """
+    Build a fresh DynamicCache from per-layer (key, value) tensors.
+
+    A new cache object is created on every call, so the model can extend it
+    without touching the tensors it was built from.
+    """
+    cache = DynamicCache()
+    for layer_index, (key, value) in enumerate(legacy_cache):
+        cache.update(key, value, layer_index)
+    return cache
+
+
+def left_pad_cache(legacy_cache: tuple, target_length: int) -> tuple:
+    """
+    Left-pad every layer of a cache with zeros up to `target_length` positions.
+    """
+    missing = target_length - legacy_cache[0][0].shape[2]
+    if missing == 0:
+        return legacy_cache
+    return tuple(
+        (F.pad(key, (0, 0, missing, 0)), F.pad(value, (0, 0, missing, 0)))
+        for key, value in legacy_cache
+    )
+
+
+# -----------------------------------------------------------------------------
+# Request bookkeeping
+# -----------------------------------------------------------------------------
+class TokenStream:
+    """
+    Iterator over the text pieces generated for one request.
+
+    The server thread pushes pieces with `put` and finishes the stream with
+    `close`; the caller simply iterates over it.
+    """
+
+    _DONE = object()
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._error = None
+        self.submitted_at = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+        self.num_tokens = 0
+
+    def put(self, piece: str) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.num_tokens += 1
+        self._queue.put(piece)
+
+    def close(self, error: Exception | None = None) -> None:
+        self._error = error
+        self.finished_at = time.perf_counter()
+        if self.first_token_at is None:  # e.g. EOS as the first token: the response starts here
+            self.first_token_at = self.finished_at
+        self._queue.put(self._DONE)
+
+    def __iter__(self):
+        while True:
+            piece = self._queue.get()
+            if piece is self._DONE:
+                if self._error is not None:
+                    raise RuntimeError("Generation failed") from self._error
+                return
+            yield piece
+
+    def text(self) -> str:
+        """
+        Block until generation finishes and return the full generated text.
+        """
+        return "".join(self)
+
+
+@dataclass
+class _Sequence:
+    """
+    State of one request while it is part of the decode batch.
+    """
+    prompt_ids: list[int]
+    max_new_tokens: int
+    temperature: float
+    stream: TokenStream
+    generated: list[int] = field(default_factory=list)
+    emitted_text: str = ""
+
+
+# -----------------------------------------------------------------------------
+# Continuous-batching server
+# -----------------------------------------------------------------------------
+class ContinuousBatchingServer:
+    """
+    Local text generation service with continuous batching and token streaming.
+
+    Args:
+        model_name (str): Causal language model from the Hugging Face Hub.
+        max_batch_size (int): Maximum number of sequences decoded together.
+        num_threads (int | None): Torch intra-op threads (None keeps torch's default).
+        top_k (int): Top-k filtering used when sampling with temperature > 0.
+        prefix_cache (PrefixKVCache | None): Optional cache of prompt prefixes
+            (see `prefix_kv_cache.py`); new prompts resume from the longest hit.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        max_batch_size: int = 16,
+        num_threads: int | None = None,
+        top_k: int = 50,
+        prefix_cache=None,
+    ):
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForCausalLM.from_pretrained(model_name)
+        self.model.eval()
+
+        self.max_batch_size = max_batch_size
+        self.top_k = top_k
+        self.prefix_cache = prefix_cache
+        self.eos_token_id = self.tokenizer.eos_token_id
+        self.max_positions = getattr(self.model.config, "max_position_embeddings", None) or 1024
+
+        self._pending: queue.Queue[_Sequence] = queue.Queue()
+        self._thread = None
+        self._running = threading.Event()
+
+        # Decode batch state: one row per active sequence
+        self._active: list[_Sequence] = []
+        self._cache: tuple | None = None          # per-layer (key, value), left-padded
+        self._attention_mask: torch.Tensor | None = None
+        self._positions: list[int] = []          # next position id of every row
+        self._last_tokens: list[int] = []        # token to feed at the next step
+
+    # --------------------------- public API ----------------------------------
+    def start(self) -> "ContinuousBatchingServer":
+        """
+        Start the background decode loop.
+        """
+        if self._thread is None:
+            self._running.set()
+            self._thread = threading.Thread(target=self._loop, name="decode-loop", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the decode loop; unfinished requests are closed with an error.
+        """
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, prompt: str, max_new_tokens: int = 40, temperature: float = 0.0) -> TokenStream:
+        """
+        Queue a prompt for generation.
+
+        Args:
+            prompt (str): Input prompt.
+            max_new_tokens (int): Maximum number of tokens to generate.
+            temperature (float): 0 for greedy decoding, > 0 for sampling.
+
+        Returns:
+            TokenStream: Iterator yielding generated text pieces as they arrive.
+
+        Raises:
+            ValueError: If the prompt is not a non-empty string or max_new_tokens < 1.
+        """
+        if not isinstance(prompt, str):
+            raise ValueError(f"prompt must be a string, got {type(prompt).__name__}")
+        if max_new_tokens < 1:
+            raise ValueError(f"max_new_tokens must be at least 1, got {max_new_tokens}")
+        prompt_ids = self.tokenizer(prompt)["input_ids"][-(self.max_positions - 1):]
+        if not prompt_ids:
+            raise ValueError("prompt must contain at least one token")
+        stream = TokenStream()
+        self._pending.put(_Sequence(prompt_ids, max_new_tokens, temperature, stream))
+        return stream
+
+    def generate(self, prompt: str, max_new_tokens: int = 40, temperature: float = 0.0) -> str:
+        """
+        Convenience wrapper: submit a prompt and wait for the full continuation.
+        """
+        return self.submit(prompt, max_new_tokens, temperature).text()
+
+    # --------------------------- decode loop ---------------------------------
+    def _loop(self) -> None:
+        try:
+            with torch.inference_mode():
+                while self._running.is_set():
+                    try:
+                        self._admit_pending()
+                        if self._active:
+                            self._decode_step()
+                    except Exception as error:
+                        # Fail the current batch and continue with an empty one
+                        for sequence in self._active:
+                            sequence.stream.close(error)
+                        self._reset_batch()
+        finally:
+            # Fail whatever is left so no caller blocks forever
+            stopped = RuntimeError("Server stopped")
+            for sequence in self._active:
+                sequence.stream.close(stopped)
+            self._reset_batch()
+            while not self._pending.empty():
+                self._pending.get_nowait().stream.close(stopped)
+
+    def _reset_batch(self) -> None:
+        """
+        Drop the decode batch state, so the next batch starts from a clean cache.
+        """
+        self._active, self._positions, self._last_tokens = [], [], []
+        self._cache, self._attention_mask = None, None
+
+    def _admit_pending(self) -> None:
+        """
+        Move waiting requests into the decode batch at a step boundary.
+        """
+        while len(self._active) < self.max_batch_size:
+            try:
+                # Block briefly only when there is nothing to decode
+                timeout = None if self._active else 0.05
+                sequence = self._pending.get(block=not self._active, timeout=timeout)
+            except queue.Empty:
+                return
+            try:
+                self._prefill(sequence)
+            except Exception as error:
+                if any(active is sequence for active in self._active):
+                    raise  # already in the batch: _loop fails the whole batch
+                # Only this request failed; the running batch was not touched
+                sequence.stream.close(error)
+
+    def _prefill(self, sequence: _Sequence) -> None:
+        """
+        Encode a new prompt on its own and merge its cache into the batch.
+        """
+        if self.prefix_cache is not None:
+            from prefix_kv_cache import prefill_with_prefix_cache
+            output, prompt_cache = prefill_with_prefix_cache(self.model, sequence.prompt_ids, self.prefix_cache)
+        else:
+            output = self.model(input_ids=torch.tensor([sequence.prompt_ids]), use_cache=True)
+            prompt_cache = to_legacy_cache(output.past_key_values)
+        self._join_batch(sequence, prompt_cache, output.logits[0, -1])
+
+    def _join_batch(self, sequence: _Sequence, prompt_cache: tuple, next_token_logits: torch.Tensor) -> None:
+        """
+        Add a prefilled sequence to the decode batch and emit its first token.
+        """
+        token = self._sample(next_token_logits, sequence.temperature)
+        prompt_length = prompt_cache[0][0].shape[2]
+
+        if self._cache is None:
+            cache = prompt_cache
+            attention_mask = torch.ones(1, prompt_length, dtype=torch.long)
+        else:
+            # Left-pad the shorter side so every row has the same cache length
+            target = max(self._cache[0][0].shape[2], prompt_length)
+            batch_cache = left_pad_cache(self._cache, target)
+            new_cache = left_pad_cache(prompt_cache, target)
+            cache = tuple(
+                (torch.cat([batch_key, new_key]), torch.cat([batch_value, new_value]))
+                for (batch_key, batch_value), (new_key, new_value) in zip(batch_cache, new_cache)
+            )
+            new_mask = torch.zeros(1, target, dtype=torch.long)
+            new_mask[0, target - prompt_length:] = 1
+            attention_mask = torch.cat([
+                F.pad(self._attention_mask, (target - self._attention_mask.shape[1], 0)),
+                new_mask,
+            ])
+
+        # Commit to the batch state only once nothing above can fail
+        self._cache, self._attention_mask = cache, attention_mask
+        self._active.append(sequence)
+        self._positions.append(prompt_length)
+        self._last_tokens.append(token)
+        self._emit(sequence, token)
+        self._retire_finished()
+
+    def _decode_step(self) -> None:
+        """
+        Generate one token for every active sequence with a single forward pass.
+        """
+        attention_mask = F.pad(self._attention_mask, (0, 1), value=1)
+        output = self.model(
+            input_ids=torch.tensor(self._last_tokens).unsqueeze(1),
+            attention_mask=attention_mask,
+            position_ids=torch.tensor(self._positions).unsqueeze(1),
+            past_key_values=build_cache(self._cache),
+            use_cache=True,
+        )
+        self._cache = to_legacy_cache(output.past_key_values)
+        self._attention_mask = attention_mask
+
+        for row, sequence in enumerate(self._active):
+            token = self._sample(output.logits[row, -1], sequence.temperature)
+            self._positions[row] += 1
+            self._last_tokens[row] = token
+            self._emit(sequence, token)
+
+        self._retire_finished()
+
+    def _retire_finished(self) -> None:
+        """
+        Drop finished sequences from the batch and trim all-padding columns.
+        """
+        keep = [
+            row for row, sequence in enumerate(self._active)
+            if not self._is_finished(sequence, self._positions[row])
+        ]
+        if len(keep) == len(self._active):
+            return
+
+        for row, sequence in enumerate(self._active):
+            if row not in keep:
+                sequence.stream.close()
+
+        if not keep:
+            self._reset_batch()
+            return
+
+        rows = torch.tensor(keep)
+        mask = self._attention_mask[rows]
+        # Columns that are padding for every remaining row can be dropped
+        first_used = int(mask.any(dim=0).nonzero()[0])
+        self._attention_mask = mask[:, first_used:]
+        self._cache = tuple(
+            (key[rows, :, first_used:], value[rows, :, first_used:]) for key, value in self._cache
+        )
+        self._active = [self._active[row] for row in keep]
+        self._positions = [self._positions[row] for row in keep]
+        self._last_tokens = [self._last_tokens[row] for row in keep]
+
+    def _is_finished(self, sequence: _Sequence, position: int) -> bool:
+        return (
+            len(sequence.generated) >= sequence.max_new_tokens
+            or (sequence.generated and sequence.generated[-1] == self.eos_token_id)
+            or position >= self.max_positions
+        )
+
+    def _sample(self, logits: torch.Tensor, temperature: float) -> int:
+        """
+        Greedy pick for temperature 0, otherwise top-k sampling.
+        """
+        if temperature <= 0:
+            return int(logits.argmax())
+        top_logits, top_indices = logits.float().topk(min(self.top_k, logits.shape[-1]))
+        probabilities = (top_logits / temperature).softmax(dim=-1)
+        return int(top_indices[torch.multinomial(probabilities, 1)])
+
+    def _emit(self, sequence: _Sequence, token: int) -> None:
+        """
+        Record a token and stream the newly decoded text to the caller.
+        """
+        sequence.generated.append(token)
+        if token == self.eos_token_id:
+            return
+        # Decode the whole continuation so multi-token characters come out intact
+        text = self.tokenizer.decode(sequence.generated, skip_special_tokens=True)
+        piece = text[len(sequence.emitted_text):]
+        sequence.emitted_text = text
+        sequence.stream.put(piece)
+
+
+# -----------------------------------------------------------------------------
+# Minimal HTTP front-end
+# -----------------------------------------------------------------------------
+def serve_http(server: ContinuousBatchingServer, host: str = "127.0.0.1", port: int = 8000) -> None:
+    """
+    Expose the server over HTTP.
+
+    POST /generate with a JSON body {"prompt": ..., "max_new_tokens": ..., "temperature": ...}
+    streams the generated text back as it is produced.
+    """
+
+    class GenerateHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/generate":
+                self.send_error(404)
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                stream = server.submit(
+                    body.get("prompt", ""),
+                    max_new_tokens=int(body.get("max_new_tokens", 40)),
+                    temperature=float(body.get("temperature", 0.0)),
+                )
+            except (ValueError, TypeError, AttributeError) as error:  # bad JSON or parameters
+                self.send_error(400, str(error))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.end_headers()
+            for piece in stream:
+                self.wfile.write(piece.encode("utf-8"))
+                self.wfile.flush()
+
+    print(f"Serving continuous-batching generation on http://{host}:{port}/generate")
+    ThreadingHTTPServer((host, port), GenerateHandler).serve_forever()
+
+
+# -----------------------------------------------------------------------------
+# Load-generator benchmark
+# -----------------------------------------------------------------------------
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+def run_load_benchmark(
+    prompts: list[str],
+    concurrency: int = 8,
+    max_new_tokens: int = 32,
+    model_name: str = DEFAULT_MODEL_NAME,
+) -> dict:
+    """
+    Fire `prompts` at both generation paths from `concurrency` client threads.
+
+    - Baseline: independent `generator(...)` pipeline calls (one full generate per request).
+    - Server: continuous batching with streaming.
+
+    Args:
+        prompts (list[str]): Prompts to send.
+        concurrency (int): Number of concurrent client threads.
+        max_new_tokens (int): Tokens generated per request.
+        model_name (str): Model shared by both paths.
+
+    Returns:
+        dict: Aggregate tokens/sec and p50/p99 time-to-first-token for both paths.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Baseline: N independent pipeline calls (time-to-first-token == full latency)
+    generator = get_pipeline("text-generation", model=model_name)
+    generator.tokenizer.pad_token_id = generator.tokenizer.eos_token_id
+
+    def baseline_call(prompt):
+        start = time.perf_counter()
+        result = generator(prompt, max_new_tokens=max_new_tokens, do_sample=False, return_full_text=False)
+        new_tokens = len(generator.tokenizer(result[0]["generated_text"])["input_ids"])
+        return time.perf_counter() - start, new_tokens
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        baseline = list(pool.map(baseline_call, prompts))
+    baseline_seconds = time.perf_counter() - start
+
+    # Continuous batching server
+    server = ContinuousBatchingServer(model_name=model_name, max_batch_size=concurrency).start()
+
+    def server_call(prompt):
+        stream = server.submit(prompt, max_new_tokens=max_new_tokens)
+        for _ in stream:
+            pass
+        return stream.first_token_at - stream.submitted_at, stream.num_tokens
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        batched = list(pool.map(server_call, prompts))
+    server_seconds = time.perf_counter() - start
+    server.stop()
+
+    def summarize(results, seconds):
+        ttft = [first_token for first_token, _ in results]
+        return {
+            "tokens_per_sec": sum(tokens for _, tokens in results) / seconds,
+            "ttft_p50": percentile(ttft, 50),
+            "ttft_p99": percentile(ttft, 99),
+            "wall_seconds": seconds,
+        }
+
+    return {
+        "requests": len(prompts),
+        "concurrency": concurrency,
+        "independent_calls": summarize(baseline, baseline_seconds),
+        "continuous_batching": summarize(batched, server_seconds),
+    }
+
+
+if __name__ == "__main__":
+    prompt_text = "In this course i'll will teach you how to use LangChain, but first let us"
+
+    print("--- Streaming a single request ---")
+    demo_server = ContinuousBatchingServer().start()
+    for text_piece in demo_server.submit(prompt_text, max_new_tokens=20):
+        print(text_piece, end="", flush=True)
+    print()
+    demo_server.stop()
+
+    print("\n--- Load benchmark: 32 requests, 8 concurrent clients ---")
+    report = run_load_benchmark([prompt_text] * 32, concurrency=8)
+    for name in ("independent_calls", "continuous_batching"):
+        stats = report[name]
+        print(
+            f"{name:20s} {stats['tokens_per_sec']:8.1f} tok/s | "
+            f"TTFT p50 {stats['ttft_p50'] * 1000:7.1f} ms | p99 {stats['ttft_p99'] * 1000:7.1f} ms"
+        )
@@ -0,0 +1,333 @@
+"""
+Process-Wide Warm Pool for HuggingFace Pipelines
+
+This module keeps HuggingFace pipelines resident in memory so that only the
+FIRST request for a model pays the download/deserialize cost. Every later
+request in the same process gets the already-loaded pipeline back instantly.
+
+Requirements:
+- transformers library: pip install transformers
+- psutil (optional, for accurate RSS readings): pip install psutil
+
+Overview:
+    - Pipelines are loaded lazily on first use with `get_pipeline(...)`.
+    - Loaded pipelines stay in an LRU-ordered pool.
+    - When the pipelines' recorded footprints add up to more than the configured
+      budget, the least recently used pipelines are evicted until we are back
+      under budget. (Process RSS is not used: it rarely drops after a pipeline
+      is freed, because allocators and torch keep the memory cached.)
+    - Load times, hits, misses and evictions are recorded and exposed via `stats()`.
+    - Each pipeline can run on the default fp32 backend or on the dynamic int8
+      backend from `quantized_backend.py`.
+
+Configuration:
+    HF_PIPELINE_BUDGET_MB: Budget in megabytes for the summed footprints of the
+                           default registry's pipelines (unset = never evict).
+                           HF_PIPELINE_RSS_BUDGET_MB is read as a fallback.
+    HF_PIPELINE_BACKEND:   Backend used when none is requested explicitly,
+                           "fp32" (default) or "int8".
+
+Example:
+    >>> from model_registry import get_pipeline, registry
+    >>> classifier = get_pipeline("sentiment-analysis")   # miss: loads the model
+    >>> classifier = get_pipeline("sentiment-analysis")   # hit: near zero latency
+    >>> registry.stats()["hits"]
+    1
+"""
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from transformers import pipeline
+
+
+def current_rss_bytes() -> int:
+    """
+    Return the resident set size (RSS) of the current process in bytes.
+
+    Uses psutil when available and falls back to /proc/self/statm on Linux.
+    Returns 0 when RSS cannot be measured.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+@dataclass
+class PoolEntry:
+    """
+    A pipeline resident in the pool together with its bookkeeping.
+    """
+    pipeline: object
+    load_seconds: float
+    footprint_bytes: int
+    uses: int = 0
+    last_used: float = 0.0
+
+
+class ModelRegistry:
+    """
+    LRU pool of lazily loaded HuggingFace pipelines bounded by a memory budget.
+
+    Args:
+        rss_budget_mb (float | None): Maximum total footprint of the resident
+            pipelines in megabytes before least recently used pipelines are
+            evicted. None disables eviction.
+        loader (callable): Function used to build fp32 pipelines. Defaults to
+            `transformers.pipeline`.
+        default_backend (str): Backend used when `get` is called without one.
+    """
+
+    def __init__(self, rss_budget_mb: float | None = None, loader=pipeline, default_backend: str = "fp32"):
+        self.rss_budget_bytes = int(rss_budget_mb * 1024 * 1024) if rss_budget_mb else None
+        self.default_backend = default_backend
+        self._loaders = {"fp32": loader}
+        self._entries: OrderedDict[tuple, PoolEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple, threading.Lock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _make_key(task: str, model: str | None, backend: str, kwargs: dict) -> tuple:
+        """
+        Build a hashable pool key from the pipeline arguments.
+        """
+        return task, model, backend, tuple(sorted((name, repr(value)) for name, value in kwargs.items()))
+
+    def _get_loader(self, backend: str):
+        """
+        Return the function that builds pipelines for a backend.
+        """
+        if backend not in self._loaders:
+            if backend != "int8":
+                raise ValueError(f"Unknown backend '{backend}'. Use 'fp32' or 'int8'.")
+            from quantized_backend import load_int8_pipeline
+            self._loaders["int8"] = load_int8_pipeline
+        return self._loaders[backend]
+
+    def get(self, task: str, model: str | None = None, backend: str | None = None, **kwargs):
+        """
+        Return a resident pipeline, loading it on first use.
+
+        Args:
+            task (str): Pipeline task, e.g. "sentiment-analysis".
+            model (str | None): Model name; None uses the task's default model.
+            backend (str | None): "fp32" or "int8"; None uses the registry default.
+            **kwargs: Extra keyword arguments forwarded to the loader.
+
+        Returns:
+            Pipeline: The (shared) pipeline instance.
+        """
+        backend = backend or self.default_backend
+        loader = self._get_loader(backend)
+        key = self._make_key(task, model, backend, kwargs)
+
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                self._hits += 1
+                return entry.pipeline
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Load outside the global lock so other models stay available meanwhile.
+        # The per-key lock makes concurrent first requests share a single load.
+        with key_lock:
+            with self._lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    self._hits += 1
+                    return entry.pipeline
+
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            loaded = loader(task, model=model, **kwargs)
+            load_seconds = time.perf_counter() - start
+            # The weights are the footprint. The RSS delta is only a fallback for
+            # pipelines without a torch model: it also counts other loads running meanwhile.
+            footprint = self._parameter_bytes(loaded) or max(current_rss_bytes() - rss_before, 0)
+
+            with self._lock:
+                self._misses += 1
+                self._entries[key] = PoolEntry(
+                    pipeline=loaded,
+                    load_seconds=load_seconds,
+                    footprint_bytes=footprint,
+                    uses=1,
+                    last_used=time.time(),
+                )
+                self._evict_over_budget(keep=key)
+            return loaded
+
+    def _touch(self, key: tuple) -> PoolEntry | None:
+        """
+        Mark an entry as most recently used (caller must hold the lock).
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            entry.uses += 1
+            entry.last_used = time.time()
+        return entry
+
+    def _resident_bytes(self) -> int:
+        """
+        Memory used for the budget check: the sum of the recorded pipeline footprints.
+        """
+        return sum(entry.footprint_bytes for entry in self._entries.values())
+
+    def _evict_over_budget(self, keep: tuple) -> None:
+        """
+        Evict least recently used pipelines until their footprints fit the budget
+        (caller must hold the lock). The pipeline just requested is never evicted.
+        """
+        if self.rss_budget_bytes is None:
+            return
+
+        while self._resident_bytes() > self.rss_budget_bytes:
+            victim = next((key for key in self._entries if key != keep), None)
+            if victim is None:
+                break
+            del self._entries[victim]
+            self._key_locks.pop(victim, None)
+            self._evictions += 1
+            gc.collect()
+
+    @staticmethod
+    def _parameter_bytes(loaded) -> int:
+        """
+        Size of the model weights held by a pipeline, in bytes.
+
+        Quantized layers keep their int8 weights in packed buffers that are
+        invisible to `parameters()`, so the state dict is measured instead,
+        unpacking the (weight, bias) tuples of quantized linear layers.
+        """
+        model = getattr(loaded, "model", None)
+        if model is None or not hasattr(model, "state_dict"):
+            return 0
+        return sum(ModelRegistry._value_bytes(value) for value in model.state_dict().values())
+
+    @staticmethod
+    def _value_bytes(value) -> int:
+        """
+        Bytes held by one state dict value (tensor, packed tuple or packed params).
+        """
+        if hasattr(value, "element_size"):
+            return value.numel() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(ModelRegistry._value_bytes(item) for item in value)
+        if hasattr(value, "weight") and hasattr(value, "bias"):  # LinearPackedParams
+            return ModelRegistry._value_bytes((value.weight(), value.bias()))
+        return 0
+
+    def evict(self, task: str, model: str | None = None, backend: str | None = None, **kwargs) -> bool:
+        """
+        Explicitly drop a pipeline from the pool.
+
+        Returns:
+            bool: True if the pipeline was resident.
+        """
+        key = self._make_key(task, model, backend or self.default_backend, kwargs)
+        with self._lock:
+            removed = self._entries.pop(key, None)
+            if removed is not None:
+                self._key_locks.pop(key, None)
+        if removed is not None:
+            gc.collect()
+        return removed is not None
+
+    def clear(self) -> None:
+        """
+        Drop every pipeline from the pool.
+        """
+        with self._lock:
+            for key in self._entries:
+                self._key_locks.pop(key, None)
+            self._entries.clear()
+        gc.collect()
+
+    def stats(self) -> dict:
+        """
+        Snapshot of pool statistics.
+
+        Returns:
+            dict: hits, misses, hit_rate, evictions, rss_mb, resident_mb (sum of
+                  footprints, what the budget applies to), budget_mb and
+                  per-pipeline load time / footprint / use count (LRU first).
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "rss_mb": current_rss_bytes() / (1024 * 1024),
+                "resident_mb": self._resident_bytes() / (1024 * 1024),
+                "budget_mb": self.rss_budget_bytes / (1024 * 1024) if self.rss_budget_bytes else None,
+                "resident": [
+                    {
+                        "task": key[0],
+                        "model": key[1],
+                        "backend": key[2],
+                        "load_seconds": entry.load_seconds,
+                        "footprint_mb": entry.footprint_bytes / (1024 * 1024),
+                        "uses": entry.uses,
+                    }
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+
+# -----------------------------------------------------------------------------
+# Default process-wide registry
+# -----------------------------------------------------------------------------
+_budget = os.getenv("HF_PIPELINE_BUDGET_MB") or os.getenv("HF_PIPELINE_RSS_BUDGET_MB")
+registry = ModelRegistry(
+    rss_budget_mb=float(_budget) if _budget else None,
+    default_backend=os.getenv("HF_PIPELINE_BACKEND", "fp32"),
+)
+
+
+def get_pipeline(task: str, model: str | None = None, backend: str | None = None, **kwargs):
+    """
+    Return a warm pipeline from the process-wide registry.
+
+    Args:
+        task (str): Pipeline task, e.g. "zero-shot-classification".
+        model (str | None): Model name; None uses the task's default model.
+        backend (str | None): "fp32" or "int8"; None uses HF_PIPELINE_BACKEND.
+        **kwargs: Extra keyword arguments forwarded to `transformers.pipeline`.
+
+    Returns:
+        Pipeline: A shared, already-loaded pipeline instance.
+    """
+    return registry.get(task, model=model, backend=backend, **kwargs)
+
+
+if __name__ == "__main__":
+    # Cold start: the model is loaded from disk/Hub
+    start = time.perf_counter()
+    get_pipeline("sentiment-analysis")
+    print(f"Cold request: {time.perf_counter() - start:.3f}s")
+
+    # Warm start: the same pipeline is served from the pool
+    start = time.perf_counter()
+    get_pipeline("sentiment-analysis")
+    print(f"Warm request: {time.perf_counter() - start:.6f}s")
+
+    print(registry.stats())
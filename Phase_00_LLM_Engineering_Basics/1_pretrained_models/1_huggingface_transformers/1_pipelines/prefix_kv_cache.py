@@ -0,0 +1,297 @@
+"""
+Shared-Prefix KV-Cache Reuse for Repeated Prompt Preambles
+
+Many generation prompts start with the same long preamble, for example:
+
+    "In this course i'll will teach you how to use LangChain, but first let us ..."
+
+Without caching, the model re-encodes ("prefills") that whole preamble for every
+call. This script stores the attention keys/values (KV cache) of previously seen
+prompts and lets new prompts resume from the longest prefix already computed.
+
+Requirements:
+- transformers library: pip install transformers
+- torch: pip install torch
+
+Overview:
+    - Prompts are indexed token by token in a trie. Walking a new prompt down the
+      trie finds the longest prefix shared with any cached prompt.
+    - The KV cache of a causal model at position i only depends on tokens 0..i, so
+      the cache of ANY prompt sharing the first m tokens can be sliced to length m
+      and reused as is.
+    - Cached entries are evicted in LRU order once their total size exceeds the
+      memory budget.
+    - Hit rate and the number of prefill tokens saved are tracked in `stats()`.
+
+Example:
+    >>> cache = PrefixKVCache(max_bytes=256 * 1024 * 1024)
+    >>> generate_with_prefix_cache(model, tokenizer, preamble + " write a poem", cache)
+    >>> generate_with_prefix_cache(model, tokenizer, preamble + " write a song", cache)  # reuses the preamble
+    >>> cache.stats()["saved_prefill_tokens"]
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+from continuous_batching_server import DEFAULT_MODEL_NAME, build_cache, to_legacy_cache
+
+
+@dataclass
+class _CacheEntry:
+    """
+    KV cache of one stored prompt.
+    """
+    tokens: tuple[int, ...]
+    legacy_cache: tuple
+    num_bytes: int
+
+
+@dataclass
+class _TrieNode:
+    """
+    One token position in the prefix trie.
+
+    `entry` points at a cached prompt whose path runs through this node, so its
+    KV cache can be sliced to this node's depth.
+    """
+    children: dict[int, "_TrieNode"] = field(default_factory=dict)
+    entry: _CacheEntry | None = None
+
+
+class PrefixKVCache:
+    """
+    Trie-indexed, memory-bounded LRU cache of prompt KV caches.
+
+    Args:
+        max_bytes (int): Memory budget for all cached keys/values.
+        min_prefix_tokens (int): Shortest shared prefix worth reusing; shorter
+            matches (and shorter prompts) are treated as misses.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024, min_prefix_tokens: int = 8):
+        self.max_bytes = max_bytes
+        self.min_prefix_tokens = min_prefix_tokens
+        self._root = _TrieNode()
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._num_bytes = 0
+
+        self._lookups = 0
+        self._hits = 0
+        self._prompt_tokens = 0
+        self._saved_tokens = 0
+        self._evictions = 0
+
+    def lookup(self, token_ids: list[int]) -> tuple[int, tuple | None]:
+        """
+        Find the longest cached prefix of a prompt.
+
+        At least one prompt token is always left uncached, because the model
+        needs to process it to produce the next-token logits.
+
+        Args:
+            token_ids (list[int]): Prompt token ids.
+
+        Returns:
+            tuple: (number of reusable tokens, per-layer KV cache sliced to that
+                   length) or (0, None) on a miss.
+        """
+        self._lookups += 1
+        self._prompt_tokens += len(token_ids)
+
+        node, depth, best = self._root, 0, None
+        for token in token_ids[:-1]:
+            node = node.children.get(token)
+            if node is None:
+                break
+            depth += 1
+            best = node.entry
+
+        if best is None or depth < self.min_prefix_tokens:
+            return 0, None
+
+        self._entries.move_to_end(id(best))
+        self._hits += 1
+        self._saved_tokens += depth
+        sliced = tuple((key[:, :, :depth], value[:, :, :depth]) for key, value in best.legacy_cache)
+        return depth, sliced
+
+    def insert(self, token_ids: list[int], legacy_cache: tuple) -> None:
+        """
+        Store the KV cache computed for a prompt.
+
+        Args:
+            token_ids (list[int]): Prompt token ids.
+            legacy_cache (tuple): Per-layer (key, value) tensors covering exactly
+                                  `token_ids` (batch size 1).
+        """
+        if len(token_ids) < self.min_prefix_tokens:
+            return
+
+        # Already covered by a stored prompt that has this one as a prefix?
+        node = self._root
+        for token in token_ids:
+            node = node.children.get(token)
+            if node is None:
+                break
+        else:
+            self._entries.move_to_end(id(node.entry))
+            return
+
+        length = len(token_ids)
+        legacy_cache = tuple((key[:, :, :length], value[:, :, :length]) for key, value in legacy_cache)
+        num_bytes = sum(
+            key.numel() * key.element_size() + value.numel() * value.element_size()
+            for key, value in legacy_cache
+        )
+        if num_bytes > self.max_bytes:
+            return
+
+        entry = _CacheEntry(tuple(token_ids), legacy_cache, num_bytes)
+        node, replaced = self._root, {}
+        for token in token_ids:
+            node = node.children.setdefault(token, _TrieNode())
+            if node.entry is not None:
+                replaced[id(node.entry)] = node.entry
+            node.entry = entry
+
+        # A stored prompt that is a prefix of this one has no node left pointing at it
+        for old in replaced.values():
+            if entry.tokens[:len(old.tokens)] == old.tokens:
+                del self._entries[id(old)]
+                self._num_bytes -= old.num_bytes
+
+        self._entries[id(entry)] = entry
+        self._num_bytes += num_bytes
+        while self._num_bytes > self.max_bytes:
+            self._evict(next(iter(self._entries.values())))
+
+    def _evict(self, entry: _CacheEntry) -> None:
+        """
+        Remove an entry and repair the trie nodes that pointed at it.
+        """
+        del self._entries[id(entry)]
+        self._num_bytes -= entry.num_bytes
+        self._evictions += 1
+
+        # Collect the entry's path, then fix it bottom-up
+        path = [self._root]
+        for token in entry.tokens:
+            path.append(path[-1].children[token])
+
+        for depth in range(len(entry.tokens), 0, -1):
+            node, parent = path[depth], path[depth - 1]
+            if node.entry is not entry:
+                continue
+            if node.children:
+                # Any child subtree still holds a live entry through this node
+                node.entry = next(iter(node.children.values())).entry
+            else:
+                del parent.children[entry.tokens[depth - 1]]
+
+    def stats(self) -> dict:
+        """
+        Cache effectiveness counters.
+
+        Returns:
+            dict: lookups, hits, hit_rate, prompt/saved prefill tokens,
+                  resident entries and bytes, evictions.
+        """
+        return {
+            "lookups": self._lookups,
+            "hits": self._hits,
+            "hit_rate": self._hits / self._lookups if self._lookups else 0.0,
+            "prompt_tokens": self._prompt_tokens,
+            "saved_prefill_tokens": self._saved_tokens,
+            "saved_prefill_fraction": self._saved_tokens / self._prompt_tokens if self._prompt_tokens else 0.0,
+            "entries": len(self._entries),
+            "cached_mb": self._num_bytes / (1024 * 1024),
+            "evictions": self._evictions,
+        }
+
+
+def prefill_with_prefix_cache(model, token_ids: list[int], cache: PrefixKVCache | None):
+    """
+    Run the prompt through the model, reusing the longest cached prefix.
+
+    Args:
+        model: Causal language model.
+        token_ids (list[int]): Prompt token ids.
+        cache (PrefixKVCache | None): Prefix cache (None disables reuse).
+
+    Returns:
+        tuple: (model output of the prefill, per-layer KV cache of the full prompt)
+    """
+    cached_length, cached = cache.lookup(token_ids) if cache is not None else (0, None)
+
+    output = model(
+        input_ids=torch.tensor([token_ids[cached_length:]]),
+        past_key_values=build_cache(cached) if cached is not None else None,
+        use_cache=True,
+    )
+    prompt_cache = to_legacy_cache(output.past_key_values)
+
+    if cache is not None:
+        cache.insert(token_ids, prompt_cache)
+    return output, prompt_cache
+
+
+def generate_with_prefix_cache(
+    model,
+    tokenizer,
+    prompt: str,
+    cache: PrefixKVCache | None,
+    max_new_tokens: int = 20,
+) -> str:
+    """
+    Greedy generation that resumes from the longest cached prompt prefix.
+
+    Args:
+        model: Causal language model.
+        tokenizer: Matching tokenizer.
+        prompt (str): Input prompt.
+        cache (PrefixKVCache | None): Prefix cache (None = plain generation).
+        max_new_tokens (int): Number of tokens to generate.
+
+    Returns:
+        str: The generated continuation.
+    """
+    token_ids = tokenizer(prompt)["input_ids"]
+
+    with torch.inference_mode():
+        output, prompt_cache = prefill_with_prefix_cache(model, token_ids, cache)
+        past = build_cache(prompt_cache)
+        generated = []
+        for _ in range(max_new_tokens):
+            token = int(output.logits[0, -1].argmax())
+            if token == tokenizer.eos_token_id:
+                break
+            generated.append(token)
+            output = model(input_ids=torch.tensor([[token]]), past_key_values=past, use_cache=True)
+            past = output.past_key_values
+
+    return tokenizer.decode(generated, skip_special_tokens=True)
+
+
+if __name__ == "__main__":
+    tokenizer = AutoTokenizer.from_pretrained(DEFAULT_MODEL_NAME)
+    model = AutoModelForCausalLM.from_pretrained(DEFAULT_MODEL_NAME).eval()
+
+    # Long shared preamble, like the one in text_generation_pipeline.py
+    preamble = (
+        "In this course i'll will teach you how to use LangChain, but first let us "
+        "review what large language models are, how prompts are structured, and why "
+        "chaining several model calls together is such a powerful idea. "
+    )
+    tasks = ["Lesson one:", "Lesson two:", "Lesson three:", "A quick quiz:", "Homework:"] * 4
+
+    for label, prefix_cache in (("no cache", None), ("prefix cache", PrefixKVCache())):
+        start = time.perf_counter()
+        for task in tasks:
+            generate_with_prefix_cache(model, tokenizer, preamble + task, prefix_cache, max_new_tokens=10)
+        print(f"{label:12s}: {time.perf_counter() - start:.2f}s for {len(tasks)} prompts")
+
+    print(prefix_cache.stats())
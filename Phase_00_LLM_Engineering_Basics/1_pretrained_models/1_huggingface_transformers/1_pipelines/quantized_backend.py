@@ -0,0 +1,282 @@
+"""
+Dynamic int8 Quantization Backend for CPU Inference
+
+All transformer examples in this phase run fp32 PyTorch weights on CPU. This
+module adds an optional optimized backend: dynamic int8 quantization of the
+linear layers, cached on disk so the conversion is paid only once per model
+revision.
+
+Requirements:
+- transformers library: pip install transformers
+- torch: pip install torch
+
+Overview:
+    - Dynamic quantization stores Linear weights as int8 (1 byte instead of 4) and
+      quantizes activations on the fly. On CPU this typically gives lower latency
+      and roughly 4x smaller weights for the quantized layers.
+    - GPT-2 style models implement their projections as `Conv1D` modules; these are
+      converted to equivalent `nn.Linear` layers first so they get quantized too.
+    - The quantized state dict is cached under INT8_CACHE_DIR, keyed by model name
+      and revision. Later loads build the architecture from its config and load the
+      int8 weights directly, skipping the fp32 checkpoint entirely.
+    - `check_accuracy_drift` compares int8 outputs against fp32 outputs so you can
+      verify quantization did not change predictions.
+
+Usage:
+    The warm pool in `model_registry.py` selects the backend per pipeline:
+        >>> get_pipeline("sentiment-analysis", backend="int8")
+    or for every pipeline in the process with HF_PIPELINE_BACKEND=int8.
+
+    Plain models (e.g. the AutoModel used in `hf_pytorch.py`) can be loaded with:
+        >>> model = load_int8_model("distilbert-base-uncased", AutoModel)
+
+Configuration:
+    INT8_CACHE_DIR: Directory for converted artifacts (default ~/.cache/agentic_ai/int8).
+"""
+
+import hashlib
+import io
+import os
+import re
+import time
+from pathlib import Path
+
+import torch
+from torch import nn
+from torch.ao.quantization import quantize_dynamic
+from transformers import AutoConfig, AutoTokenizer, pipeline
+from transformers.pipelines import check_task, get_default_model_and_revision
+from transformers.pytorch_utils import Conv1D
+
+CACHE_DIR = Path(os.getenv("INT8_CACHE_DIR", Path.home() / ".cache" / "agentic_ai" / "int8"))
+
+
+# -----------------------------------------------------------------------------
+# Quantization
+# -----------------------------------------------------------------------------
+def _conv1d_to_linear(model: nn.Module) -> nn.Module:
+    """
+    Replace GPT-2 style Conv1D layers with equivalent nn.Linear layers in place.
+
+    Conv1D stores its weight as [in_features, out_features]; nn.Linear expects
+    [out_features, in_features], so the weight is transposed.
+    """
+    for name, child in model.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(model, name, linear)
+        else:
+            _conv1d_to_linear(child)
+    return model
+
+
+def quantize_int8(model: nn.Module) -> nn.Module:
+    """
+    Apply dynamic int8 quantization to every linear layer of a model.
+
+    Args:
+        model (nn.Module): fp32 model (modified in place).
+
+    Returns:
+        nn.Module: The quantized model in eval mode.
+    """
+    model.eval()
+    _conv1d_to_linear(model)
+    return quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def state_dict_bytes(model: nn.Module) -> int:
+    """
+    Serialized size of a model's weights (includes packed int8 parameters).
+    """
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+# -----------------------------------------------------------------------------
+# On-disk artifact cache
+# -----------------------------------------------------------------------------
+def resolve_revision(model_name: str, revision: str | None = None) -> str:
+    """
+    Identify the exact weights a model name refers to.
+
+    Uses the explicit revision, else the Hub commit hash of the cached config,
+    else a fingerprint of the files of a local model directory.
+    """
+    if revision:
+        return revision
+
+    commit_hash = getattr(AutoConfig.from_pretrained(model_name), "_commit_hash", None)
+    if commit_hash:
+        return commit_hash
+
+    fingerprint = hashlib.sha256()
+    local_dir = Path(model_name)
+    if local_dir.is_dir():
+        for file in sorted(local_dir.iterdir()):
+            stat = file.stat()
+            fingerprint.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return fingerprint.hexdigest()[:12]
+
+
+def _artifact_path(model_name: str, revision: str, auto_class) -> Path:
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]", "--", model_name.strip("/"))
+    return CACHE_DIR / safe_name / revision / f"{auto_class.__name__}-torch{torch.__version__}.pt"
+
+
+def load_int8_model(model_name: str, auto_class, revision: str | None = None) -> nn.Module:
+    """
+    Load a dynamically quantized model, converting and caching it on first use.
+
+    Args:
+        model_name (str): Name of the pretrained Hugging Face model.
+        auto_class: Auto class to build the model with, e.g. AutoModel or
+                    AutoModelForSequenceClassification.
+        revision (str | None): Hub revision; None resolves the current one.
+
+    Returns:
+        nn.Module: Quantized model in eval mode.
+    """
+    resolved = resolve_revision(model_name, revision)
+    artifact = _artifact_path(model_name, resolved, auto_class)
+
+    if artifact.exists():
+        # Build the architecture without downloading fp32 weights, then load int8 ones
+        config = AutoConfig.from_pretrained(model_name, revision=revision)
+        model = quantize_int8(auto_class.from_config(config))
+        model.load_state_dict(torch.load(artifact, weights_only=False))
+        return model
+
+    model = quantize_int8(auto_class.from_pretrained(model_name, revision=revision))
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), artifact)
+    return model
+
+
+def _task_model(task: str, model_name: str | None) -> tuple[str, str | None, object]:
+    """
+    Resolve the model name, default revision and auto class a pipeline task uses.
+    """
+    _, targeted_task, task_options = check_task(task)
+    auto_class = targeted_task["pt"][0]
+    if model_name is not None:
+        return model_name, None, auto_class
+    default_model, default_revision = get_default_model_and_revision(targeted_task, "pt", task_options)
+    return default_model, default_revision, auto_class
+
+
+def load_int8_pipeline(task: str, model: str | None = None, revision: str | None = None, **kwargs):
+    """
+    Build a transformers pipeline backed by a cached int8 model.
+
+    Args:
+        task (str): Pipeline task, e.g. "sentiment-analysis".
+        model (str | None): Model name; None uses the task's default model.
+        revision (str | None): Hub revision of the model.
+        **kwargs: Extra keyword arguments forwarded to `transformers.pipeline`.
+
+    Returns:
+        Pipeline: Pipeline running the quantized model on CPU.
+    """
+    model_name, default_revision, auto_class = _task_model(task, model)
+    revision = revision or default_revision
+    quantized = load_int8_model(model_name, auto_class, revision=revision)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+    return pipeline(task, model=quantized, tokenizer=tokenizer, device=-1, **kwargs)
+
+
+# -----------------------------------------------------------------------------
+# Accuracy drift check
+# -----------------------------------------------------------------------------
+def check_accuracy_drift(
+    task: str,
+    texts: list[str],
+    model: str | None = None,
+    min_top1_agreement: float = 0.95,
+) -> dict:
+    """
+    Compare fp32 and int8 outputs of the same model on the same inputs.
+
+    For every text the raw model outputs (logits, or the last hidden state for
+    bare encoders) are compared position by position.
+
+    Args:
+        task (str): Pipeline task whose model should be checked.
+        texts (list[str]): Evaluation inputs.
+        model (str | None): Model name; None uses the task's default model.
+        min_top1_agreement (float): Minimum fraction of positions whose argmax
+                                    must agree for the check to pass.
+
+    Returns:
+        dict: top-1 agreement, mean cosine similarity, max abs difference,
+              weight sizes, mean latencies and whether the check passed.
+    """
+    model_name, revision, auto_class = _task_model(task, model)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+    fp32_model = auto_class.from_pretrained(model_name, revision=revision).eval()
+    int8_model = load_int8_model(model_name, auto_class, revision=revision)
+
+    agreements, cosines, max_abs_diff = [], [], 0.0
+    fp32_seconds = int8_seconds = 0.0
+
+    with torch.inference_mode():
+        for text in texts:
+            inputs = tokenizer(text, return_tensors="pt", truncation=True)
+
+            start = time.perf_counter()
+            fp32_output = fp32_model(**inputs)
+            fp32_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            int8_output = int8_model(**inputs)
+            int8_seconds += time.perf_counter() - start
+
+            reference = getattr(fp32_output, "logits", None)
+            if reference is None:
+                reference, candidate = fp32_output.last_hidden_state, int8_output.last_hidden_state
+            else:
+                candidate = int8_output.logits
+            reference, candidate = reference.float().flatten(0, -2), candidate.float().flatten(0, -2)
+
+            agreements.append((reference.argmax(-1) == candidate.argmax(-1)).float().mean().item())
+            cosines.append(torch.nn.functional.cosine_similarity(reference, candidate, dim=-1).mean().item())
+            max_abs_diff = max(max_abs_diff, (reference - candidate).abs().max().item())
+
+    fp32_bytes, int8_bytes = state_dict_bytes(fp32_model), state_dict_bytes(int8_model)
+    top1_agreement = sum(agreements) / len(agreements)
+
+    return {
+        "model": model_name,
+        "top1_agreement": top1_agreement,
+        "mean_cosine_similarity": sum(cosines) / len(cosines),
+        "max_abs_diff": max_abs_diff,
+        "fp32_mb": fp32_bytes / (1024 * 1024),
+        "int8_mb": int8_bytes / (1024 * 1024),
+        "size_ratio": fp32_bytes / int8_bytes,
+        "fp32_ms_per_text": fp32_seconds / len(texts) * 1000,
+        "int8_ms_per_text": int8_seconds / len(texts) * 1000,
+        "passed": top1_agreement >= min_top1_agreement,
+    }
+
+
+if __name__ == "__main__":
+    sample_texts = [
+        "I love to code!",
+        "This is LangChain Technology",
+        "The update broke my login and I am very annoyed.",
+        "In this course i'll will teach you how to use LangChain",
+    ]
+
+    for task_name in ("sentiment-analysis", "text-generation"):
+        report = check_accuracy_drift(task_name, sample_texts)
+        print(f"\n--- {task_name} ({report['model']}) ---")
+        print(f"Top-1 agreement : {report['top1_agreement']:.1%}")
+        print(f"Cosine sim      : {report['mean_cosine_similarity']:.4f}")
+        print(f"Weights         : {report['fp32_mb']:.1f} MB → {report['int8_mb']:.1f} MB "
+              f"({report['size_ratio']:.1f}x smaller)")
+        print(f"Latency         : {report['fp32_ms_per_text']:.1f} ms → {report['int8_ms_per_text']:.1f} ms")
+        print("PASSED" if report["passed"] else "FAILED: int8 drift above threshold")
@@ -4,22 +4,26 @@ Sentiment Analysis Example using HuggingFace Transformers Pipeline
 This script demonstrates how to perform sentiment analysis on a given text
 using a pretrained model through the transformers pipeline.
 
+`get_pipeline` keeps the sentiment model loaded after the first call.
+
 Requirements:
 - transformers library: pip install transformers
 """
 
-from transformers import pipeline
-
-# Initialize a sentiment-analysis pipeline
-# This loads a pretrained model capable of detecting positive/negative sentiment
-classifier = pipeline("sentiment-analysis")
+from model_registry import get_pipeline
 
 # Define the text to analyze
 text_to_analyze = "I love to code!"
 
-# Perform sentiment analysis
-# The pipeline will return a list of dictionaries with 'label' and 'score'
-result = classifier(text_to_analyze)
 
-# Print the sentiment analysis result
-print(result)
+if __name__ == "__main__":
+    # Get a sentiment-analysis pipeline from the warm pool
+    # This loads a pretrained model capable of detecting positive/negative sentiment
+    classifier = get_pipeline("sentiment-analysis")
+
+    # Perform sentiment analysis
+    # The pipeline will return a list of dictionaries with 'label' and 'score'
+    result = classifier(text_to_analyze)
+
+    # Print the sentiment analysis result
+    print(result)
@@ -4,27 +4,32 @@ Text Generation Example using HuggingFace Transformers Pipeline
 This script demonstrates how to generate text continuations using a pretrained
 model through the transformers pipeline.
 
+The generator comes from the warm pool in `model_registry.py`; for many
+concurrent prompts see `continuous_batching_server.py`.
+
 Requirements:
 - transformers library: pip install transformers
 """
 
-from transformers import pipeline
-
-# Initialize a text-generation pipeline
-# This loads a pretrained language model capable of generating text continuations
-generator = pipeline("text-generation")
+from model_registry import get_pipeline
 
 # Input prompt for the model
 prompt_text = "In this course i'll will teach you how to use LangChain, but first let us"
 
-# Generate text continuations
-# - max_length: maximum length of generated text including the prompt
-# - num_return_sequences: number of different continuations to generate
-result = generator(
-    prompt_text,
-    max_length=20,
-    num_return_sequences=2
-)
-
-# Print the generated text sequences
-print(result)
+
+if __name__ == "__main__":
+    # Get a text-generation pipeline from the warm pool
+    # This loads a pretrained language model capable of generating text continuations
+    generator = get_pipeline("text-generation")
+
+    # Generate text continuations
+    # - max_length: maximum length of generated text including the prompt
+    # - num_return_sequences: number of different continuations to generate
+    result = generator(
+        prompt_text,
+        max_length=20,
+        num_return_sequences=2
+    )
+
+    # Print the generated text sequences
+    print(result)
@@ -2,7 +2,7 @@
 Educational script demonstrating how Hugging Face Transformers tokenizers work.
 
 Requirements:
-    pip install transformers
+    pip install transformers numpy
 
 Overview:
     - Uses a pretrained DistilBERT sentiment-analysis model
@@ -21,7 +21,7 @@ Key Concepts:
       automatically lowercases input. That’s why 'I' becomes 'i' when decoded.
 """
 
-from transformers import AutoTokenizer
+from tokenization_service import get_tokenizer
 
 
 def demonstrate_tokenization(model_name: str, text: str) -> None:
@@ -42,8 +42,9 @@ def demonstrate_tokenization(model_name: str, text: str) -> None:
         Token IDs: [1045, 2293, 11374, 24925, 2078, 999]
         Decoded Text: i love langchain!
     """
-    # Load tokenizer for the given model
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    # Load tokenizer for the given model (cached after the first call,
+    # see tokenization_service.py for batched corpus encoding)
+    tokenizer = get_tokenizer(model_name)
 
     # Step 1: Break text into tokens (subwords)
     tokens = tokenizer.tokenize(text)
@@ -0,0 +1,246 @@
+"""
+Cached, Batched Tokenization Service with NumPy Outputs
+
+`tokenization.py` explains tokenization one sentence at a time. This module is
+the production counterpart for token counting and encoding over whole corpora.
+
+Requirements:
+    pip install transformers numpy
+
+Overview:
+    - Tokenizer instances are cached per model name, so `from_pretrained` runs
+      once per process instead of once per call.
+    - Whole batches are encoded with ONE call into the fast (Rust) tokenizer,
+      which parallelizes across CPU cores internally.
+    - Results come back as contiguous NumPy arrays instead of Python lists:
+        ids     → int32 array with the token ids of every text, back to back
+        offsets → int64 array of length n + 1; text i owns ids[offsets[i]:offsets[i+1]]
+      This "ragged array" layout is compact and trivial to save with np.save.
+    - `encode_jsonl` streams large JSONL files through a pool of worker processes.
+
+Example:
+    >>> batch = encode_batch(["I love LangChain!", "Hello"], "distilbert-base-uncased")
+    >>> batch.lengths
+    array([8, 3])
+    >>> batch[0]
+    array([  101,  1045,  2293, 11374, 24925,  2078,   999,   102], dtype=int32)
+"""
+
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from multiprocessing import get_context
+from typing import Iterable, Iterator
+
+import numpy as np
+from transformers import AutoTokenizer
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model_name: str):
+    """
+    Load a fast tokenizer once per process and reuse it afterwards.
+
+    Args:
+        model_name (str): Name of the pretrained model from Hugging Face Hub.
+
+    Returns:
+        PreTrainedTokenizerFast: The cached tokenizer.
+
+    Raises:
+        ValueError: If the model has no fast (Rust) tokenizer.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    if not tokenizer.is_fast:
+        raise ValueError(f"'{model_name}' has no fast tokenizer.")
+    return tokenizer
+
+
+@dataclass
+class EncodedBatch:
+    """
+    Token ids of many texts stored as one flat array plus offsets.
+
+    Attributes:
+        ids (np.ndarray): int32 token ids of all texts, concatenated.
+        offsets (np.ndarray): int64 array of length n + 1 delimiting each text.
+        char_offsets (np.ndarray | None): Optional int32 array of shape
+            (len(ids), 2) with the (start, end) character span of every token.
+    """
+    ids: np.ndarray
+    offsets: np.ndarray
+    char_offsets: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """
+        Number of tokens of every text.
+        """
+        return np.diff(self.offsets)
+
+
+def _backend(model_name: str):
+    """
+    Rust tokenizer behind the cached HF tokenizer, with truncation and padding
+    switched off (the HF wrapper may leave them enabled after a call).
+    """
+    backend = get_tokenizer(model_name).backend_tokenizer
+    if backend.truncation is not None:
+        backend.no_truncation()
+    if backend.padding is not None:
+        backend.no_padding()
+    return backend
+
+
+def encode_batch(
+    texts: Iterable[str],
+    model_name: str,
+    add_special_tokens: bool = True,
+    return_char_offsets: bool = False,
+) -> EncodedBatch:
+    """
+    Encode a batch of texts with a single call into the Rust tokenizer.
+
+    Args:
+        texts (Iterable[str]): Texts to encode.
+        model_name (str): Name of the pretrained model from Hugging Face Hub.
+        add_special_tokens (bool): Add [CLS]/[SEP]-style special tokens.
+        return_char_offsets (bool): Also return the character span of each token.
+
+    Returns:
+        EncodedBatch: Flat int32 ids plus offsets (and optional character spans).
+    """
+    texts = list(texts)
+    encodings = _backend(model_name).encode_batch(texts, add_special_tokens=add_special_tokens)
+
+    offsets = np.zeros(len(encodings) + 1, dtype=np.int64)
+    np.cumsum([len(encoding.ids) for encoding in encodings], out=offsets[1:])
+    total = int(offsets[-1])
+
+    ids = np.fromiter(
+        itertools.chain.from_iterable(encoding.ids for encoding in encodings),
+        dtype=np.int32,
+        count=total,
+    )
+
+    char_offsets = None
+    if return_char_offsets:
+        char_offsets = np.fromiter(
+            itertools.chain.from_iterable(
+                itertools.chain.from_iterable(encoding.offsets) for encoding in encodings
+            ),
+            dtype=np.int32,
+            count=total * 2,
+        ).reshape(total, 2)
+
+    return EncodedBatch(ids=ids, offsets=offsets, char_offsets=char_offsets)
+
+
+def count_tokens(texts: Iterable[str], model_name: str, add_special_tokens: bool = True) -> np.ndarray:
+    """
+    Count the tokens of every text.
+
+    Returns:
+        np.ndarray: int64 array with one token count per text.
+    """
+    return encode_batch(texts, model_name, add_special_tokens=add_special_tokens).lengths
+
+
+def decode_batch(batch: EncodedBatch, model_name: str, skip_special_tokens: bool = True) -> list[str]:
+    """
+    Decode every text of an EncodedBatch back into a string.
+    """
+    sequences = [batch[index].tolist() for index in range(len(batch))]
+    return _backend(model_name).decode_batch(sequences, skip_special_tokens=skip_special_tokens)
+
+
+# -----------------------------------------------------------------------------
+# Parallel JSONL streaming
+# -----------------------------------------------------------------------------
+def _init_worker() -> None:
+    # Each worker process already owns a core; stop the Rust thread pool from
+    # oversubscribing the machine.
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+
+def _encode_lines(lines: list[str], model_name: str, text_field: str, add_special_tokens: bool) -> EncodedBatch:
+    """
+    Worker task: parse a chunk of JSONL lines and encode their texts.
+    """
+    texts = [json.loads(line)[text_field] for line in lines]
+    return encode_batch(texts, model_name, add_special_tokens=add_special_tokens)
+
+
+def _read_chunks(path: str, chunk_size: int) -> Iterator[list[str]]:
+    with open(path, encoding="utf-8") as file:
+        lines = (line for line in file if line.strip())
+        while True:
+            chunk = list(itertools.islice(lines, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def encode_jsonl(
+    path: str,
+    model_name: str,
+    text_field: str = "text",
+    chunk_size: int = 10_000,
+    workers: int | None = None,
+    add_special_tokens: bool = True,
+) -> Iterator[EncodedBatch]:
+    """
+    Stream-encode a large JSONL file in parallel worker processes.
+
+    Chunks are yielded in file order. At most two chunks per worker are in
+    flight, so memory stays bounded no matter how large the file is.
+
+    Args:
+        path (str): JSONL file with one object per line.
+        model_name (str): Name of the pretrained model from Hugging Face Hub.
+        text_field (str): Key holding the text in every JSON object.
+        chunk_size (int): Number of lines encoded per task.
+        workers (int | None): Worker processes (default: CPU count; 1 = in-process).
+        add_special_tokens (bool): Add [CLS]/[SEP]-style special tokens.
+
+    Yields:
+        EncodedBatch: One batch per chunk of `chunk_size` lines.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _read_chunks(path, chunk_size)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield _encode_lines(chunk, model_name, text_field, add_special_tokens)
+        return
+
+    # "spawn" avoids forking a process whose Rust thread pool is already running
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"), initializer=_init_worker) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(_encode_lines, chunk, model_name, text_field, add_special_tokens))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+if __name__ == "__main__":
+    model_name = "distilbert-base-uncased-finetuned-sst-2-english"
+    texts = ["I love LangChain!", "Tokenizers split text into subwords.", "Hello"]
+
+    batch = encode_batch(texts, model_name, return_char_offsets=True)
+    print("Flat ids:", batch.ids)
+    print("Offsets:", batch.offsets)
+    print("Token counts:", batch.lengths)
+    print("Decoded:", decode_batch(batch, model_name))
@@ -0,0 +1,220 @@
+"""
+High-Throughput CPU Embedding Extractor built on Hugging Face + PyTorch.
+
+Requirements:
+    pip install torch transformers numpy
+
+Overview:
+    - `hf_pytorch.py` shows a single forward pass: it loads the model on every call
+      and runs with gradients enabled. That is fine for learning, slow for a corpus.
+    - This module turns the same workflow into a production embedding extractor:
+        - The tokenizer and model are loaded ONCE.
+        - Forward passes run under `torch.inference_mode()` (no autograd bookkeeping).
+        - Texts are sorted by token length and grouped into dynamically padded
+          batches, so almost no compute is spent on padding tokens.
+        - Token embeddings are pooled into one vector per text (mean or CLS).
+        - `embed_to_npy` writes embeddings incrementally into a memory-mapped `.npy`
+          file, so the corpus size is not bounded by RAM.
+
+Key Concepts:
+    - Mean pooling: average of all real (non-padding) token embeddings.
+    - CLS pooling: the embedding of the first ([CLS]) token.
+    - Memory-mapped arrays live on disk; only the pages being written stay in RAM.
+"""
+
+import contextlib
+import io
+import time
+from typing import Sequence
+
+import numpy as np
+import torch
+from transformers import AutoModel, AutoTokenizer
+
+from hf_pytorch import demonstrate_hf_pytorch
+
+
+class EmbeddingExtractor:
+    """
+    Load a Hugging Face encoder once and turn texts into fixed-size embeddings.
+
+    Args:
+        model_name (str): Name of the pretrained Hugging Face model.
+        pooling (str): "mean" or "cls".
+        batch_size (int): Maximum number of texts per forward pass.
+        max_length (int): Texts longer than this (in tokens) are truncated.
+        chunk_size (int): Number of texts tokenized and length-sorted together.
+        normalize (bool): L2-normalize embeddings (handy for cosine similarity).
+        num_threads (int | None): Torch intra-op threads (None keeps torch's default).
+
+    Example:
+        >>> extractor = EmbeddingExtractor("distilbert-base-uncased")
+        >>> extractor.embed(["Hello world!", "Hey this is me!"]).shape
+        (2, 768)
+    """
+
+    def __init__(
+        self,
+        model_name: str = "distilbert-base-uncased",
+        pooling: str = "mean",
+        batch_size: int = 64,
+        max_length: int = 512,
+        chunk_size: int = 8192,
+        normalize: bool = False,
+        num_threads: int | None = None,
+    ):
+        if pooling not in ("mean", "cls"):
+            raise ValueError("pooling must be 'mean' or 'cls'.")
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        # Step 1: Load tokenizer and model ONCE
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name)
+        self.model.eval()
+
+        self.pooling = pooling
+        self.batch_size = batch_size
+        self.max_length = min(max_length, self.tokenizer.model_max_length)
+        self.chunk_size = chunk_size
+        self.normalize = normalize
+        self.dimension = self.model.config.hidden_size
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts in memory.
+
+        Args:
+            texts (Sequence[str]): Texts to embed.
+
+        Returns:
+            np.ndarray: float32 array of shape [len(texts), hidden_size].
+        """
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for indices, batch_embeddings in self._iter_batches(texts):
+            embeddings[indices] = batch_embeddings
+        return embeddings
+
+    def embed_to_npy(self, texts: Sequence[str], path: str) -> np.memmap:
+        """
+        Embed texts straight into a memory-mapped `.npy` file.
+
+        Each chunk is flushed to disk as soon as it is done, so memory use stays
+        flat regardless of corpus size. The file can later be opened with
+        `np.load(path, mmap_mode="r")`.
+
+        Args:
+            texts (Sequence[str]): Texts to embed.
+            path (str): Output `.npy` file.
+
+        Returns:
+            np.memmap: The on-disk array of shape [len(texts), hidden_size].
+        """
+        embeddings = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float32, shape=(len(texts), self.dimension)
+        )
+        for chunk_start in range(0, len(texts), self.chunk_size):
+            chunk = texts[chunk_start:chunk_start + self.chunk_size]
+            for indices, batch_embeddings in self._iter_batches(chunk):
+                embeddings[chunk_start + indices] = batch_embeddings
+            embeddings.flush()
+        return embeddings
+
+    def _iter_batches(self, texts: Sequence[str]):
+        """
+        Yield (original indices, pooled embeddings) for length-sorted batches.
+        """
+        for chunk_start in range(0, len(texts), self.chunk_size):
+            chunk = list(texts[chunk_start:chunk_start + self.chunk_size])
+
+            # Step 2: Tokenize the chunk once, without padding
+            encoded = self.tokenizer(chunk, truncation=True, max_length=self.max_length)["input_ids"]
+
+            # Step 3: Sort by length so each batch is padded only to its own longest text
+            order = np.argsort([len(ids) for ids in encoded], kind="stable")
+
+            for batch_start in range(0, len(order), self.batch_size):
+                batch_indices = order[batch_start:batch_start + self.batch_size]
+                inputs = self._pad([encoded[index] for index in batch_indices])
+                yield chunk_start + batch_indices, self._forward(inputs)
+
+    def _pad(self, batch_ids: list[list[int]]) -> dict:
+        """
+        Right-pad a length-sorted batch to its own longest text.
+        """
+        longest = max(len(ids) for ids in batch_ids)
+        input_ids = torch.full((len(batch_ids), longest), self.tokenizer.pad_token_id or 0, dtype=torch.long)
+        attention_mask = torch.zeros((len(batch_ids), longest), dtype=torch.long)
+        for row, ids in enumerate(batch_ids):
+            input_ids[row, :len(ids)] = torch.tensor(ids)
+            attention_mask[row, :len(ids)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+    def _forward(self, inputs: dict) -> np.ndarray:
+        """
+        Run one batch through the model and pool token embeddings.
+        """
+        # Step 4: No autograd graph is built inside inference_mode
+        with torch.inference_mode():
+            hidden = self.model(**inputs).last_hidden_state
+
+            if self.pooling == "cls":
+                pooled = hidden[:, 0]
+            else:
+                mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+
+            if self.normalize:
+                pooled = torch.nn.functional.normalize(pooled, dim=-1)
+
+        return pooled.float().numpy()
+
+
+def benchmark(texts: Sequence[str], model_name: str = "distilbert-base-uncased") -> dict:
+    """
+    Compare sentences/sec of `demonstrate_hf_pytorch` against the extractor.
+
+    Args:
+        texts (Sequence[str]): Sentences to embed.
+        model_name (str): Model used by both paths.
+
+    Returns:
+        dict: Throughput of both paths and the speedup.
+    """
+    # Current function: reloads the model and runs with gradients for each sentence
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text in texts:
+            demonstrate_hf_pytorch(model_name, text)
+    baseline_seconds = time.perf_counter() - start
+
+    extractor = EmbeddingExtractor(model_name)
+    start = time.perf_counter()
+    extractor.embed(texts)
+    extractor_seconds = time.perf_counter() - start
+
+    return {
+        "sentences": len(texts),
+        "baseline_sentences_per_sec": len(texts) / baseline_seconds,
+        "extractor_sentences_per_sec": len(texts) / extractor_seconds,
+        "speedup": baseline_seconds / extractor_seconds,
+    }
+
+
+if __name__ == "__main__":
+    model_name = "distilbert-base-uncased"
+    sentences = [
+        "Hey this is me!",
+        "Hugging Face models are subclasses of torch.nn.Module.",
+        "Sorting by length keeps padding to a minimum.",
+        "Embeddings turn text into vectors.",
+    ] * 16
+
+    extractor = EmbeddingExtractor(model_name, pooling="mean")
+    on_disk = extractor.embed_to_npy(sentences, "embeddings.npy")
+    print("Embeddings written to embeddings.npy with shape:", on_disk.shape)
+
+    report = benchmark(sentences, model_name)
+    print(f"demonstrate_hf_pytorch : {report['baseline_sentences_per_sec']:.1f} sentences/sec")
+    print(f"EmbeddingExtractor     : {report['extractor_sentences_per_sec']:.1f} sentences/sec")
+    print(f"Speedup                : {report['speedup']:.1f}x")
@@ -8,9 +8,10 @@ using the official Python client library (`openai`).
 
 What it does:
 -------------
-- Initializes an OpenAI client.
+- Reuses one pooled OpenAI client per process (see `openai_client_pool.py`).
 - Sends a prompt to the Chat Completions API.
 - Receives and prints the response in a user-friendly format.
+- Fans out many chat completions concurrently with `get_ai_responses_async`.
 
 Requirements:
 -------------
@@ -41,11 +42,14 @@ Notes:
   quick educational examples.
 - Modify the `system_message` and `user_message` variables 
   to experiment with different contexts or queries.
+- The client is NOT rebuilt per call: reusing it keeps HTTP connections
+  (and their TLS sessions) alive between requests.
 
 """
 
-from openai import OpenAI
-import os
+import asyncio
+
+from openai_client_pool import get_async_client, get_client
 
 def get_ai_response(system_message: str, user_message: str, model_name: str = "gpt-4o-mini") -> str:
     """
@@ -78,14 +82,8 @@ def get_ai_response(system_message: str, user_message: str, model_name: str = "g
     >>> print(response)
     "Neural Networks are computer systems inspired by the human brain..."
     """
-    # Initialize the client (automatically uses the API key from environment variable)
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-            raise ValueError(
-                "ERROR: OPENAI_API_KEY not found. "
-                "Please set your API key in environment variables."
-            )
-    client = OpenAI(api_key = api_key)
+    # Reuse the process-wide client (automatically uses the API key from environment variable)
+    client = get_client()
 
     # Send messages to the Chat Completions API
     response = client.chat.completions.create(
@@ -97,7 +95,49 @@ def get_ai_response(system_message: str, user_message: str, model_name: str = "g
     )
 
     # Extract and return the assistant's reply text
-    return response.choices[0].message["content"]
+    return response.choices[0].message.content
+
+
+async def get_ai_responses_async(
+    messages_list: list[list[dict]],
+    max_concurrency: int = 8,
+    model_name: str = "gpt-4o-mini",
+) -> list[str]:
+    """
+    Send many chat completions concurrently and return replies in input order.
+
+    Parameters
+    ----------
+    messages_list : list[list[dict]]
+        One Chat Completions `messages` list per request, e.g.
+        [{"role": "system", "content": ...}, {"role": "user", "content": ...}].
+    max_concurrency : int, optional
+        Maximum number of requests in flight at the same time. Defaults to 8.
+    model_name : str, optional
+        The OpenAI model to use. Defaults to "gpt-4o-mini".
+
+    Returns
+    -------
+    list[str]
+        Reply texts; the i-th reply belongs to the i-th messages list.
+
+    Example
+    -------
+    >>> replies = asyncio.run(get_ai_responses_async([
+    ...     [{"role": "user", "content": "Define overfitting"}],
+    ...     [{"role": "user", "content": "Define underfitting"}],
+    ... ], max_concurrency=2))
+    """
+    client = get_async_client()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def complete(messages: list[dict]) -> str:
+        async with semaphore:
+            response = await client.chat.completions.create(model=model_name, messages=messages)
+        return response.choices[0].message.content
+
+    # gather() returns results in the order the coroutines were passed in
+    return await asyncio.gather(*(complete(messages) for messages in messages_list))
 
 
 if __name__ == "__main__":
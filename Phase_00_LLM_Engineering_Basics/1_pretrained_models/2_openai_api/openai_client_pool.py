@@ -0,0 +1,134 @@
+"""
+=====================================================
+Pooled, Reusable OpenAI Clients
+=====================================================
+
+Creating a new `OpenAI(...)` client for every request throws away its HTTP
+connection pool: each call pays a fresh TCP connect and TLS handshake. This
+module hands out ONE pooled client per process instead, so connections are
+kept alive and reused across calls.
+
+What it provides:
+-----------------
+- `get_client()`: shared synchronous `OpenAI` client.
+- `get_async_client()`: shared `AsyncOpenAI` client for the running event loop.
+- `reset_clients()`: close and forget the shared clients.
+
+Requirements:
+-------------
+1. pip install openai httpx
+2. export OPENAI_API_KEY="your_api_key_here"
+3. Optional: OPENAI_BASE_URL to point the clients at another endpoint
+   (for example the local stub in `openai_stub_server.py`).
+
+Notes:
+------
+- Clients are re-created automatically after `fork()`, because a pooled
+  connection must never be shared between processes.
+- An async HTTP pool is bound to the event loop that created it, so one
+  async client is kept per running loop (normally exactly one per worker).
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+# Connection pool limits shared by the sync and async clients
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+_lock = threading.Lock()
+_owner_pid = None
+_sync_client = None
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _api_key() -> str:
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "ERROR: OPENAI_API_KEY not found. "
+            "Please set your API key in environment variables."
+        )
+    return api_key
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+
+def _forget_after_fork() -> None:
+    """
+    Drop clients inherited from a parent process (caller must hold the lock).
+    """
+    global _owner_pid, _sync_client, _async_clients
+    if _owner_pid != os.getpid():
+        _owner_pid = os.getpid()
+        _sync_client = None
+        _async_clients = weakref.WeakKeyDictionary()
+
+
+def get_client() -> OpenAI:
+    """
+    Return the process-wide synchronous OpenAI client.
+
+    Returns
+    -------
+    OpenAI
+        Client with a keep-alive connection pool, created on first use.
+    """
+    global _sync_client
+    with _lock:
+        _forget_after_fork()
+        if _sync_client is None:
+            _sync_client = OpenAI(
+                api_key=_api_key(),
+                http_client=DefaultHttpxClient(limits=_limits()),
+            )
+        return _sync_client
+
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for the running event loop.
+
+    Must be called from inside a coroutine.
+
+    Returns
+    -------
+    AsyncOpenAI
+        Client with a keep-alive connection pool, created on first use.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _forget_after_fork()
+        client = _async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=_api_key(),
+                http_client=DefaultAsyncHttpxClient(limits=_limits()),
+            )
+            _async_clients[loop] = client
+        return client
+
+
+def reset_clients() -> None:
+    """
+    Close the shared synchronous client and forget all shared clients.
+
+    Async clients are simply dropped; their pools are released together
+    with the event loop they belong to.
+    """
+    global _sync_client, _async_clients
+    with _lock:
+        if _sync_client is not None and _owner_pid == os.getpid():
+            _sync_client.close()
+        _sync_client = None
+        _async_clients = weakref.WeakKeyDictionary()
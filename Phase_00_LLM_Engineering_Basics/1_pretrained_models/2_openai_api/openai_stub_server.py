@@ -0,0 +1,177 @@
+"""
+=====================================================
+Local OpenAI Stub Server for Connection-Reuse Benchmarks
+=====================================================
+
+A tiny HTTP/1.1 server that answers `POST /v1/chat/completions` with a canned
+chat completion. It counts how many TCP connections clients open, which makes
+the cost of building a new client per call directly visible.
+
+What it does:
+-------------
+- Serves OpenAI-compatible chat completion responses with keep-alive.
+- Optionally sleeps to simulate model latency.
+- Benchmarks three ways of calling the API against it:
+    1. a fresh `OpenAI(...)` client per call (the old `get_ai_response`)
+    2. the pooled client from `openai_client_pool.py`
+    3. `get_ai_responses_async` fan-out with bounded concurrency
+
+Requirements:
+-------------
+pip install openai httpx
+
+Usage:
+------
+    python openai_stub_server.py
+"""
+
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import OpenAI
+
+
+class StubCompletionHandler(BaseHTTPRequestHandler):
+    """
+    Answers every chat completion request with a fixed reply.
+    """
+
+    # HTTP/1.1 keeps connections open between requests (keep-alive)
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; without TCP_NODELAY, Nagle's
+        # algorithm and delayed ACKs would add ~40 ms to every keep-alive response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.server.latency_seconds:
+            time.sleep(self.server.latency_seconds)
+
+        with self.server.stats_lock:
+            self.server.requests += 1
+
+        last_message = request.get("messages", [{}])[-1].get("content", "")
+        body = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"Echo: {last_message}"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, latency_seconds: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the stub server in a background thread.
+
+    Parameters
+    ----------
+    host : str
+        Interface to bind.
+    port : int
+        Port to bind; 0 picks a free port (see `server.server_address`).
+    latency_seconds : float
+        Artificial delay added to every response.
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        Running server with `connections` and `requests` counters.
+    """
+    server = ThreadingHTTPServer((host, port), StubCompletionHandler)
+    server.daemon_threads = True
+    server.latency_seconds = latency_seconds
+    server.stats_lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _measure(server: ThreadingHTTPServer, run) -> dict:
+    connections_before, start = server.connections, time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "connections_opened": server.connections - connections_before}
+
+
+def benchmark_connection_reuse(num_requests: int = 200, latency_seconds: float = 0.0) -> dict:
+    """
+    Compare per-call client construction with the pooled clients.
+
+    Parameters
+    ----------
+    num_requests : int
+        Number of chat completions per strategy.
+    latency_seconds : float
+        Simulated server-side latency per request.
+
+    Returns
+    -------
+    dict
+        Wall time and TCP connections opened for each strategy.
+    """
+    server = start_stub_server(latency_seconds=latency_seconds)
+    host, port = server.server_address
+    os.environ["OPENAI_BASE_URL"] = f"http://{host}:{port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+
+    # Imported after OPENAI_BASE_URL is set so the pooled clients point at the stub
+    from gpt3_basic_examples import get_ai_response, get_ai_responses_async
+    from openai_client_pool import reset_clients
+
+    reset_clients()
+    messages = [{"role": "user", "content": "ping"}]
+
+    def per_call_clients():
+        for _ in range(num_requests):
+            client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+            client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+
+    def pooled_client():
+        for _ in range(num_requests):
+            get_ai_response("You are a helpful assistant", "ping")
+
+    def async_fan_out():
+        asyncio.run(get_ai_responses_async([messages] * num_requests, max_concurrency=16))
+
+    results = {
+        "per_call_client": _measure(server, per_call_clients),
+        "pooled_client": _measure(server, pooled_client),
+        "async_fan_out": _measure(server, async_fan_out),
+    }
+    server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    report = benchmark_connection_reuse(num_requests=200, latency_seconds=0.005)
+
+    print("\nConnection reuse benchmark (200 requests each)\n" + "-" * 60)
+    for strategy, stats in report.items():
+        print(f"{strategy:16s} {stats['seconds']:7.2f}s  | TCP connections opened: {stats['connections_opened']}")
@@ -23,6 +23,13 @@ Usage:
 Run the script and interact with the chatbot in the terminal.
 Type 'exit' to quit.
 
+Local fast path:
+----------------
+A local classifier (`query_classifier.py`) categorizes every query in
+microseconds before any API call. Frequent FAQ questions get a canned answer
+with no API call at all, confidently categorized queries skip the LLM's
+categorization step, and only uncertain queries go through the full prompt.
+
 Example:
 --------
 Enter Prompt: I forgot my password and can't log in
@@ -33,10 +40,17 @@ your password using the 'Forgot Password' option. If the problem persists,
 contact our support team."
 """
 
+import json
 import os
-from openai import OpenAI
+import re
+from collections import Counter
+from typing import AsyncIterator
+
+from openai import AsyncOpenAI, OpenAI
 from colorama import Fore, Style, init
 
+from query_classifier import CATEGORIES, QueryClassifier
+
 # Initialize colorama
 init(autoreset=True)
 
@@ -51,16 +65,34 @@ class Chatbot:
         Name of the OpenAI model (default: "gpt-4o-mini")
     client : OpenAI
         OpenAI API client
+    async_client : AsyncOpenAI
+        Async OpenAI API client, created on first async use
     system_instructions : str
         Instructions for the AI system prompt
+    classifier : QueryClassifier | None
+        Optional local classifier that categorizes queries before any API call
+    query_log_path : str | None
+        Optional JSONL file where LLM-categorized queries are logged, so the
+        classifier can be retrained on them later
+    route_counts : Counter
+        How many queries got a canned answer, a local category or a full LLM call
 
     Methods
     -------
-    get_ai_response(query: str) -> str
+    get_ai_response(query: str, history: list | None) -> str
         Sends a query to the AI and returns the response
+    stream_ai_response(query: str, history: list | None) -> AsyncIterator[str]
+        Sends a query with the async client and yields the response as it arrives
     """
 
-    def __init__(self, model_name: str = "gpt-4o-mini", *, system_instructions: str):
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        *,
+        system_instructions: str,
+        classifier: QueryClassifier | None = None,
+        query_log_path: str | None = None,
+    ):
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             raise ValueError(
@@ -71,8 +103,107 @@ class Chatbot:
         self.client = OpenAI(api_key=api_key)
         self.model_name = model_name
         self.system_instructions = system_instructions
+        self.classifier = classifier
+        self.query_log_path = query_log_path
+        self.route_counts = Counter()
+        self._api_key = api_key
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """
+        Async client, created lazily so it belongs to the event loop that uses it.
+        """
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(api_key=self._api_key)
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """
+        Close the async client's connection pool.
+        """
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def route(self, query: str) -> tuple[str | None, str | None]:
+        """
+        Classify a query locally before deciding whether to call the API.
+
+        Parameters
+        ----------
+        query : str
+            The user's query
+
+        Returns
+        -------
+        tuple[str | None, str | None]
+            (category, canned answer). The category is None when there is no
+            classifier or it is not confident; the canned answer is set only for
+            high-confidence FAQ queries.
+        """
+        if self.classifier is None:
+            self.route_counts["llm"] += 1
+            return None, None
+
+        prediction = self.classifier.predict(query)
+        if not self.classifier.is_confident(prediction):
+            self.route_counts["llm"] += 1
+            return None, None
 
-    def get_ai_response(self, query: str) -> str:
+        canned_answer = self.classifier.faq_answer(prediction)
+        self.route_counts["canned" if canned_answer else "local_category"] += 1
+        return prediction.category, canned_answer
+
+    def build_messages(self, query: str, history: list | None = None, category: str | None = None) -> list:
+        """
+        Build the chat messages: system prompt, earlier turns, then the new query.
+
+        Parameters
+        ----------
+        query : str
+            The user's query
+        history : list | None
+            Earlier {"role", "content"} messages of the same conversation
+        category : str | None
+            Category already resolved locally; the model is told to skip categorizing
+
+        Returns
+        -------
+        list
+            Messages for the Chat Completions API
+        """
+        system_content = self.system_instructions
+        if category:
+            system_content += (
+                f"\nThe query has already been categorized as '{category}'. "
+                "Do not categorize it again; only write the answer."
+            )
+        return [
+            {"role": "system", "content": system_content},
+            *(history or []),
+            {"role": "user", "content": query}
+        ]
+
+    @staticmethod
+    def format_answer(category: str, answer: str) -> str:
+        """
+        Format a locally categorized answer like the LLM's own responses.
+        """
+        return f"Category: {category.capitalize()}\nAnswer: {answer}"
+
+    def _log_query(self, query: str, response: str) -> None:
+        """
+        Append the category the LLM chose to the query log (training data).
+        """
+        if not self.query_log_path:
+            return
+        match = re.search(r"category:\W*(\w+)", response, re.IGNORECASE)
+        if match and match.group(1).lower() in CATEGORIES:
+            with open(self.query_log_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps({"query": query, "label": match.group(1).lower()}) + "\n")
+
+    def get_ai_response(self, query: str, history: list | None = None) -> str:
         """
         Send a user query to the OpenAI API and return the AI's response.
 
@@ -80,20 +211,67 @@ class Chatbot:
         ----------
         query : str
             The user's query
+        history : list | None
+            Earlier messages of the same conversation
 
         Returns
         -------
         str
             AI-generated response
         """
+        category, canned_answer = self.route(query)
+        if canned_answer:
+            # High-confidence FAQ: answered locally, no API call
+            return self.format_answer(category, canned_answer)
+
         response = self.client.chat.completions.create(
             model=self.model_name,
-            messages=[
-                {"role": "system", "content": self.system_instructions},
-                {"role": "user", "content": query}
-            ]
+            messages=self.build_messages(query, history, category)
+        )
+        answer = response.choices[0].message.content
+        if category:
+            return self.format_answer(category, answer)
+        self._log_query(query, answer)
+        return answer
+
+    async def stream_ai_response(self, query: str, history: list | None = None) -> AsyncIterator[str]:
+        """
+        Send a user query with the async client and stream the response.
+
+        The event loop stays free while waiting on the API, so one Chatbot
+        instance can serve many conversations at once (see chatbot_server.py).
+
+        Parameters
+        ----------
+        query : str
+            The user's query
+        history : list | None
+            Earlier messages of the same conversation
+
+        Yields
+        ------
+        str
+            Pieces of the AI-generated response as they arrive
+        """
+        category, canned_answer = self.route(query)
+        if canned_answer:
+            yield self.format_answer(category, canned_answer)
+            return
+        if category:
+            yield self.format_answer(category, "")
+
+        stream = await self.async_client.chat.completions.create(
+            model=self.model_name,
+            messages=self.build_messages(query, history, category),
+            stream=True
         )
-        return response.choices[0].message.content
+        parts = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield parts[-1]
+        if not category:
+            self._log_query(query, "".join(parts))
 
 
 def main():
@@ -104,8 +282,9 @@ def main():
     or 'general'. Provide a concise and helpful response.
     """
 
-    # Initialize chatbot
-    bot = Chatbot(model_name="gpt-4o-mini", system_instructions=system_instructions)
+    # Initialize chatbot with the local classifier in front of the API
+    classifier = QueryClassifier.from_jsonl()
+    bot = Chatbot(model_name="gpt-4o-mini", system_instructions=system_instructions, classifier=classifier)
 
     print(Fore.CYAN + "="*60)
     print(Fore.CYAN + "        Welcome to the Customer Support Chatbot")
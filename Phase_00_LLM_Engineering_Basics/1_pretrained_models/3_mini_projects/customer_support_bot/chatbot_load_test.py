@@ -0,0 +1,293 @@
+"""
+=====================================================
+   Customer Support Chatbot - Load Test Harness
+=====================================================
+
+Drives `chatbot_server.py` with many concurrent multi-turn sessions and reports
+throughput and tail latency, without spending a single real API call.
+
+What it does:
+-------------
+1. Starts a fake OpenAI endpoint that answers `POST /v1/chat/completions`
+   with a streamed (server-sent events) reply, one token at a time with a
+   configurable delay, just like the real API streams (non-streaming
+   requests get the whole reply after the same total delay).
+2. Points the `Chatbot` at it through OPENAI_BASE_URL and starts a
+   `ChatbotServer` on a free port.
+3. Runs `num_sessions` simulated users, each sending `turns_per_session`
+   messages in order, with at most `concurrency` users active at once.
+4. Reports requests/sec, p50/p99 time-to-first-chunk, p50/p99 total latency
+   and how many requests were rejected with 503 by backpressure.
+
+Requirements:
+-------------
+pip install openai
+
+Usage:
+------
+    python chatbot_load_test.py
+"""
+
+import asyncio
+import json
+import math
+import os
+import time
+
+from chatbot import Chatbot
+from chatbot_server import ChatbotServer
+
+
+# -----------------------------------------------------------------------------
+# Fake completion endpoint
+# -----------------------------------------------------------------------------
+class FakeCompletionEndpoint:
+    """
+    Minimal OpenAI-compatible streaming chat completion endpoint.
+
+    Parameters
+    ----------
+    tokens_per_reply : int
+        Number of streamed tokens in every reply
+    token_delay_seconds : float
+        Delay between two streamed tokens
+    """
+
+    def __init__(self, tokens_per_reply: int = 20, token_delay_seconds: float = 0.01):
+        self.tokens_per_reply = tokens_per_reply
+        self.token_delay_seconds = token_delay_seconds
+        self.requests = 0
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving and return the base URL to use as OPENAI_BASE_URL.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request_line := await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = json.loads(await reader.readexactly(int(headers.get("content-length", 0))) or b"{}")
+                self.requests += 1
+                if body.get("stream"):
+                    await self._stream_completion(body, writer)
+                else:
+                    await self._send_completion(body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _reply_tokens(self, request: dict) -> list[str]:
+        # The reply echoes words of the user's message, one word per token
+        words = request.get("messages", [{}])[-1].get("content", "").split() or ["ok"]
+        return [f" {words[index % len(words)]}" for index in range(self.tokens_per_reply)]
+
+    async def _send_completion(self, request: dict, writer: asyncio.StreamWriter) -> None:
+        await asyncio.sleep(self.token_delay_seconds * self.tokens_per_reply)
+        body = json.dumps({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(self._reply_tokens(request)).strip()},
+                "finish_reason": "stop",
+            }],
+        }).encode("utf-8")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    async def _stream_completion(self, request: dict, writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        for text in self._reply_tokens(request):
+            await asyncio.sleep(self.token_delay_seconds)
+            event = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+            }
+            self._write_chunk(writer, f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            await writer.drain()
+
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        self._write_chunk(writer, b"")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n")
+
+
+# -----------------------------------------------------------------------------
+# Load generator
+# -----------------------------------------------------------------------------
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+async def _post_chat(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, payload: dict) -> tuple:
+    """
+    Send one POST /chat on a keep-alive connection and read the full reply.
+
+    Returns (status, seconds to first body chunk, total seconds).
+    """
+    body = json.dumps(payload).encode("utf-8")
+    start = time.perf_counter()
+    writer.write(
+        b"POST /chat HTTP/1.1\r\nHost: chatbot\r\nContent-Type: application/json\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        return status, None, time.perf_counter() - start
+
+    first_chunk = None
+    while size := int(await reader.readline(), 16):
+        await reader.readexactly(size + 2)
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - start
+    await reader.readline()  # CRLF after the terminating chunk
+    return status, first_chunk, time.perf_counter() - start
+
+
+async def _run_session(address: tuple, session_id: str, turns: int, results: dict) -> None:
+    questions = [
+        "I forgot my password and can't log in",
+        "How can I update my billing information?",
+        "Do you ship to Canada?",
+    ]
+    reader, writer = await asyncio.open_connection(*address)
+    try:
+        for turn in range(turns):
+            payload = {"session_id": session_id, "message": questions[turn % len(questions)]}
+            status, first_chunk, seconds = await _post_chat(reader, writer, payload)
+            if status == 503:
+                # Rejected by backpressure: count it and move on after a short pause
+                results["rejected"] += 1
+                await asyncio.sleep(0.1)
+                continue
+            results["latencies"].append(seconds)
+            results["first_chunk"].append(first_chunk or seconds)
+    finally:
+        writer.close()
+
+
+async def run_load_test(
+    num_sessions: int = 200,
+    turns_per_session: int = 3,
+    concurrency: int = 100,
+    max_in_flight: int = 32,
+    max_queue: int = 128,
+    tokens_per_reply: int = 20,
+    token_delay_seconds: float = 0.01,
+) -> dict:
+    """
+    Run simulated users against a ChatbotServer backed by the fake endpoint.
+
+    Parameters
+    ----------
+    num_sessions : int
+        Number of simulated users (sessions)
+    turns_per_session : int
+        Messages each user sends, one after another
+    concurrency : int
+        Users active at the same time
+    max_in_flight : int
+        Server limit on concurrent API calls
+    max_queue : int
+        Server limit on requests waiting for a slot
+    tokens_per_reply : int
+        Tokens streamed by the fake endpoint per reply
+    token_delay_seconds : float
+        Delay between two streamed tokens
+
+    Returns
+    -------
+    dict
+        Throughput, latency percentiles (ms) and rejection count
+    """
+    endpoint = FakeCompletionEndpoint(tokens_per_reply, token_delay_seconds)
+    os.environ["OPENAI_BASE_URL"] = await endpoint.start()
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+
+    bot = Chatbot(system_instructions="You are a professional customer support assistant.")
+    server = ChatbotServer(bot, port=0, max_in_flight=max_in_flight, max_queue=max_queue)
+    await server.start()
+    host, port = server.address
+
+    results = {"latencies": [], "first_chunk": [], "rejected": 0}
+    users = asyncio.Semaphore(concurrency)
+
+    async def user(index: int) -> None:
+        async with users:
+            await _run_session((host, port), f"session-{index}", turns_per_session, results)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(index) for index in range(num_sessions)))
+    seconds = time.perf_counter() - start
+
+    await server.stop()
+    await bot.aclose()
+    await endpoint.stop()
+
+    completed = len(results["latencies"])
+    return {
+        "completed": completed,
+        "rejected": results["rejected"],
+        "upstream_calls": endpoint.requests,
+        "seconds": seconds,
+        "requests_per_sec": completed / seconds,
+        "p50_first_chunk_ms": percentile(results["first_chunk"], 50) * 1000,
+        "p99_first_chunk_ms": percentile(results["first_chunk"], 99) * 1000,
+        "p50_latency_ms": percentile(results["latencies"], 50) * 1000,
+        "p99_latency_ms": percentile(results["latencies"], 99) * 1000,
+        "sessions_kept": len(server.sessions),
+    }
+
+
+if __name__ == "__main__":
+    report = asyncio.run(run_load_test())
+
+    print("\nChatbot server load test\n" + "-" * 60)
+    print(f"Completed requests : {report['completed']} in {report['seconds']:.2f}s "
+          f"({report['requests_per_sec']:.1f} req/s)")
+    print(f"Rejected (503)     : {report['rejected']}")
+    print(f"First chunk        : p50 {report['p50_first_chunk_ms']:.1f} ms | p99 {report['p99_first_chunk_ms']:.1f} ms")
+    print(f"Total latency      : p50 {report['p50_latency_ms']:.1f} ms | p99 {report['p99_latency_ms']:.1f} ms")
+    print(f"Sessions in memory : {report['sessions_kept']}")
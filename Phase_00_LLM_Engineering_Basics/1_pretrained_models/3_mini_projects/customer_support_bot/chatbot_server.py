@@ -0,0 +1,350 @@
+"""
+=====================================================
+   Customer Support Chatbot - Async Server Mode
+=====================================================
+
+Serves many concurrent support conversations from ONE `Chatbot` instance.
+
+`chatbot.py` runs a blocking `input()` loop: one user, one request at a time,
+and the whole process waits while the API answers. This server runs on asyncio
+instead, so while one conversation waits on the OpenAI API the event loop keeps
+serving all the others.
+
+What it does:
+-------------
+- Speaks a minimal HTTP/1.1 (keep-alive) on top of `asyncio.start_server`.
+- Keeps per-session state: every session has its own history and lock, so
+  turns of one conversation run in order while different sessions run in
+  parallel.
+- Bounds the work in flight: at most `max_in_flight` API calls run at once,
+  at most `max_queue` more requests may wait, everything beyond that is
+  rejected immediately with `503 Service Unavailable` (backpressure).
+- Streams responses back with chunked transfer encoding as the model
+  produces them.
+
+Endpoints:
+----------
+POST   /chat              {"session_id": "...", "message": "..."} → streamed text
+DELETE /sessions/<id>     forget a conversation
+GET    /stats             server counters as JSON
+
+Requirements:
+-------------
+1. pip install openai
+2. export OPENAI_API_KEY="your_api_key_here"
+   (optional: OPENAI_BASE_URL to point at another endpoint, e.g. the fake one
+   in `chatbot_load_test.py`)
+
+Usage:
+------
+    python chatbot_server.py
+
+    curl -N -X POST http://127.0.0.1:8080/chat \\
+         -d '{"session_id": "alice", "message": "I forgot my password"}'
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from chatbot import Chatbot
+from query_classifier import QueryClassifier
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    503: "Service Unavailable",
+}
+
+
+@dataclass
+class ChatSession:
+    """
+    State of one conversation.
+
+    Attributes
+    ----------
+    history : list
+        Earlier user/assistant messages, oldest first
+    lock : asyncio.Lock
+        Serializes the turns of this session
+    last_active : float
+        Monotonic time of the last request
+    """
+    history: list = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_active: float = field(default_factory=time.monotonic)
+
+
+class ChatbotServer:
+    """
+    Asyncio HTTP server that shares one Chatbot between many sessions.
+
+    Parameters
+    ----------
+    bot : Chatbot
+        The chatbot answering every session
+    host : str
+        Interface to bind
+    port : int
+        Port to bind; 0 picks a free port (see `address` after `start()`)
+    max_in_flight : int
+        Maximum number of API calls running at the same time
+    max_queue : int
+        Maximum number of admitted requests waiting for a free slot
+    max_history_messages : int
+        Messages of history sent with every request (older ones are dropped)
+    max_sessions : int
+        Sessions kept in memory; the least recently active is evicted first
+    session_ttl_seconds : float
+        Sessions idle for longer than this are forgotten
+    """
+
+    def __init__(
+        self,
+        bot: Chatbot,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        *,
+        max_in_flight: int = 32,
+        max_queue: int = 128,
+        max_history_messages: int = 20,
+        max_sessions: int = 10_000,
+        session_ttl_seconds: float = 1800.0,
+    ):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_history_messages = max_history_messages
+        self.max_sessions = max_sessions
+        self.session_ttl_seconds = session_ttl_seconds
+
+        self.sessions: OrderedDict[str, ChatSession] = OrderedDict()
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._admitted = 0  # requests running or waiting for a slot
+        self._server = None
+        self.stats = {"completed": 0, "rejected": 0, "failed": 0, "in_flight": 0}
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    async def start(self) -> None:
+        """
+        Start listening for connections.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+
+    async def stop(self) -> None:
+        """
+        Stop accepting connections and close the listening socket.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def address(self) -> tuple:
+        """
+        (host, port) the server is actually bound to.
+        """
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        """
+        Start the server and run until cancelled.
+        """
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    # -------------------------------------------------------------------------
+    # Sessions
+    # -------------------------------------------------------------------------
+    def get_session(self, session_id: str) -> ChatSession:
+        """
+        Return the session for an id, creating it on first use.
+
+        Idle and surplus sessions are evicted here, oldest first. Sessions
+        with a turn in progress are never evicted.
+        """
+        now = time.monotonic()
+        session = self.sessions.pop(session_id, None) or ChatSession()
+        session.last_active = now
+        self.sessions[session_id] = session
+
+        # The dict is ordered by activity, so only the oldest entries need checking.
+        # One pass at most: if every candidate is busy, the pool stays over its limit for now.
+        for old_id, old in list(self.sessions.items()):
+            if old_id == session_id:
+                continue
+            if now - old.last_active <= self.session_ttl_seconds and len(self.sessions) <= self.max_sessions:
+                break
+            if old.lock.locked():
+                # Busy right now, so not idle: treat it as recently active
+                old.last_active = now
+                self.sessions.move_to_end(old_id)
+            else:
+                del self.sessions[old_id]
+        self.sessions.move_to_end(session_id)
+        return session
+
+    # -------------------------------------------------------------------------
+    # HTTP handling
+    # -------------------------------------------------------------------------
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                await self._dispatch(method, path, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # client went away or sent garbage; nothing left to answer
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader):
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return method, path, headers, body
+
+    async def _dispatch(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        if path == "/chat":
+            if method != "POST":
+                return await self._send_json(writer, 405, {"error": "use POST"})
+            return await self._handle_chat(body, writer)
+
+        if path == "/stats" and method == "GET":
+            return await self._send_json(writer, 200, {
+                **self.stats,
+                "queued": self._admitted - self.stats["in_flight"],
+                "sessions": len(self.sessions),
+                "routes": dict(self.bot.route_counts),
+            })
+
+        if path.startswith("/sessions/") and method == "DELETE":
+            self.sessions.pop(path.removeprefix("/sessions/"), None)
+            return await self._send_json(writer, 200, {"deleted": True})
+
+        await self._send_json(writer, 404, {"error": f"no route for {method} {path}"})
+
+    async def _handle_chat(self, body: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            payload = json.loads(body)
+            session_id, message = str(payload["session_id"]), str(payload["message"])
+        except (ValueError, KeyError, TypeError):
+            return await self._send_json(writer, 400, {"error": "expected {'session_id': ..., 'message': ...}"})
+
+        # Backpressure: refuse at once instead of letting the queue grow without bound
+        if self._admitted >= self.max_in_flight + self.max_queue:
+            self.stats["rejected"] += 1
+            return await self._send_json(writer, 503, {"error": "server busy, retry later"}, {"Retry-After": "1"})
+
+        self._admitted += 1
+        try:
+            session = self.get_session(session_id)
+            # Lock the session first, so a second turn of the same session waits
+            # without holding one of the shared API slots
+            async with session.lock, self._slots:
+                self.stats["in_flight"] += 1
+                try:
+                    await self._stream_reply(session, message, writer)
+                finally:
+                    self.stats["in_flight"] -= 1
+        finally:
+            self._admitted -= 1
+
+    async def _stream_reply(self, session: ChatSession, message: str, writer: asyncio.StreamWriter) -> None:
+        history = session.history[-self.max_history_messages:]
+        await self._send_head(writer, 200, {"Content-Type": "text/plain; charset=utf-8", "Transfer-Encoding": "chunked"})
+
+        parts = []
+        try:
+            # aclosing() releases the upstream HTTP stream even if the client disconnects
+            async with contextlib.aclosing(self.bot.stream_ai_response(message, history)) as pieces:
+                async for piece in pieces:
+                    parts.append(piece)
+                    await self._send_chunk(writer, piece.encode("utf-8"))
+        except ConnectionError:
+            raise
+        except Exception as error:
+            # Headers are already sent, so report the failure inside the stream
+            self.stats["failed"] += 1
+            await self._send_chunk(writer, f"\n[error: {error}]".encode("utf-8"))
+            await self._send_chunk(writer, b"")
+            return
+
+        await self._send_chunk(writer, b"")
+        session.history += [
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": "".join(parts)},
+        ]
+        del session.history[:-self.max_history_messages]
+        self.stats["completed"] += 1
+
+    @staticmethod
+    async def _send_head(writer: asyncio.StreamWriter, status: int, headers: dict) -> None:
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}"] + [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    @staticmethod
+    async def _send_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        # An empty chunk terminates the chunked body
+        writer.write(f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n")
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, data: dict, headers: dict | None = None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        await self._send_head(writer, status, {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            **(headers or {}),
+        })
+        writer.write(body)
+        await writer.drain()
+
+
+def main():
+    system_instructions = """
+    You are a professional customer support assistant.
+    Analyze the user's query and categorize it as 'billing', 'technical',
+    or 'general'. Provide a concise and helpful response.
+    """
+    bot = Chatbot(
+        model_name="gpt-4o-mini",
+        system_instructions=system_instructions,
+        classifier=QueryClassifier.from_jsonl(),
+    )
+    server = ChatbotServer(bot, host="127.0.0.1", port=8080)
+
+    print("Customer Support Chatbot server listening on http://127.0.0.1:8080")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
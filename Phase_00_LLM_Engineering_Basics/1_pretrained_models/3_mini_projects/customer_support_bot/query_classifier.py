@@ -0,0 +1,319 @@
+"""
+=====================================================
+   Local Fast-Path Query Classifier
+=====================================================
+
+The Chatbot's system prompt asks the LLM to categorize every query as
+'billing', 'technical' or 'general', so every message pays a full remote round
+trip just to be put in a bucket. This module classifies queries locally, in
+microseconds, before any API call is made.
+
+How it works:
+-------------
+1. Logged queries (JSONL, one {"query": ..., "label": ...} per line) are turned
+   into TF-IDF vectors over word unigrams and bigrams.
+2. Each label gets a centroid: the normalized mean of its query vectors.
+3. A new query is scored against every centroid (cosine similarity) through an
+   inverted index, so only the query's own terms are looked at.
+4. The prediction is confident when the best score is high enough AND clearly
+   ahead of the runner-up. Otherwise the Chatbot defers to the LLM.
+
+Labels are either one of the three broad categories, or an FAQ intent such as
+'password_reset'. FAQ intents have a canned answer in `FAQ_ANSWERS` that the
+Chatbot serves without calling the API at all.
+
+Requirements:
+-------------
+No extra packages (pure Python).
+
+Usage:
+------
+    >>> classifier = QueryClassifier.from_jsonl("support_queries.jsonl")
+    >>> classifier.predict("I forgot my password and can't log in")
+    Prediction(label='password_reset', category='technical', score=0.53, margin=0.47)
+"""
+
+import json
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+CATEGORIES = ("billing", "technical", "general")
+
+# FAQ intent → (category, canned answer)
+FAQ_ANSWERS = {
+    "password_reset": (
+        "technical",
+        "You can reset your password with the 'Forgot Password' link on the login page. "
+        "The reset email arrives within a few minutes; please also check your spam folder.",
+    ),
+    "update_billing_info": (
+        "billing",
+        "To update your billing information, log in and open Settings → Billing. "
+        "There you can change your card, billing address and invoice details.",
+    ),
+    "refund_status": (
+        "billing",
+        "Refunds are processed within 5-7 business days of approval and go back to the "
+        "original payment method. You will receive an email once it has been issued.",
+    ),
+    "business_hours": (
+        "general",
+        "Our support team is available Monday to Friday, 9:00-18:00 (UTC). "
+        "Messages sent outside these hours are answered on the next business day.",
+    ),
+    "contact_support": (
+        "general",
+        "You can reach a human agent at support@example.com or by replying 'agent' "
+        "in this chat during business hours.",
+    ),
+}
+
+DEFAULT_DATASET = Path(__file__).with_name("support_queries.jsonl")
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+@dataclass
+class Prediction:
+    """
+    Result of classifying one query.
+
+    Attributes
+    ----------
+    label : str
+        Best matching label (a category or an FAQ intent)
+    category : str
+        Broad category of that label
+    score : float
+        Cosine similarity to the label's centroid (0..1)
+    margin : float
+        Lead of the best score over the second best
+    """
+    label: str
+    category: str
+    score: float
+    margin: float
+
+    @property
+    def canned_answer(self) -> str | None:
+        """
+        Canned answer if the label is an FAQ intent, else None.
+        """
+        faq = FAQ_ANSWERS.get(self.label)
+        return faq[1] if faq else None
+
+
+def category_of(label: str) -> str:
+    """
+    Broad category of a label (FAQ intents map to their parent category).
+    """
+    return FAQ_ANSWERS[label][0] if label in FAQ_ANSWERS else label
+
+
+def _terms(text: str) -> list[str]:
+    """
+    Lower-cased word unigrams and bigrams.
+    """
+    words = _WORD.findall(text.lower())
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def load_examples(path: str | Path) -> list[tuple[str, str]]:
+    """
+    Read logged (query, label) pairs from a JSONL file.
+    """
+    with open(path, encoding="utf-8") as file:
+        rows = (json.loads(line) for line in file if line.strip())
+        return [(row["query"], row["label"]) for row in rows]
+
+
+class QueryClassifier:
+    """
+    TF-IDF nearest-centroid classifier for support queries.
+
+    Parameters
+    ----------
+    min_score : float
+        Minimum cosine similarity for a confident prediction
+    min_margin : float
+        Minimum lead over the second-best label for a confident prediction
+    min_faq_score : float
+        Stricter minimum score before a canned FAQ answer is served
+    """
+
+    def __init__(self, min_score: float = 0.25, min_margin: float = 0.08, min_faq_score: float = 0.35):
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.min_faq_score = min_faq_score
+        self.labels: list[str] = []
+        self.idf: dict[str, float] = {}
+        self._index: dict[str, list[tuple[int, float]]] = {}
+
+    @classmethod
+    def from_jsonl(cls, path: str | Path = DEFAULT_DATASET, **kwargs) -> "QueryClassifier":
+        """
+        Build and train a classifier from a JSONL log of labelled queries.
+        """
+        return cls(**kwargs).fit(load_examples(path))
+
+    def fit(self, examples: list[tuple[str, str]]) -> "QueryClassifier":
+        """
+        Train on (query, label) pairs.
+
+        Parameters
+        ----------
+        examples : list[tuple[str, str]]
+            Logged queries with their label
+
+        Returns
+        -------
+        QueryClassifier
+            self, for chaining
+        """
+        documents = [Counter(_terms(query)) for query, _ in examples]
+
+        # Step 1: inverse document frequency of every term
+        document_frequency = Counter(term for document in documents for term in document)
+        total = len(documents)
+        self.idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+        # Step 2: centroid per label = normalized sum of normalized query vectors
+        centroids = defaultdict(Counter)
+        for document, (_, label) in zip(documents, examples):
+            for term, weight in self._normalize(self._weigh(document)).items():
+                centroids[label][term] += weight
+
+        # Step 3: inverted index term → [(label index, centroid weight)]
+        self.labels = sorted(centroids)
+        self._index = defaultdict(list)
+        for label_index, label in enumerate(self.labels):
+            for term, weight in self._normalize(centroids[label]).items():
+                self._index[term].append((label_index, weight))
+        self._index = dict(self._index)
+        return self
+
+    def _weigh(self, counts: Counter) -> dict[str, float]:
+        return {term: (1 + math.log(count)) * self.idf[term] for term, count in counts.items() if term in self.idf}
+
+    @staticmethod
+    def _normalize(vector: dict[str, float]) -> dict[str, float]:
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+    def scores(self, query: str) -> list[float]:
+        """
+        Cosine similarity of a query to every label centroid (order of `labels`).
+        """
+        scores = [0.0] * len(self.labels)
+        for term, weight in self._normalize(self._weigh(Counter(_terms(query)))).items():
+            for label_index, centroid_weight in self._index.get(term, ()):
+                scores[label_index] += weight * centroid_weight
+        return scores
+
+    def predict(self, query: str) -> Prediction:
+        """
+        Classify a query.
+
+        Parameters
+        ----------
+        query : str
+            The user's query
+
+        Returns
+        -------
+        Prediction
+            Best label, its category, score and margin
+        """
+        if not self.labels:
+            raise ValueError("QueryClassifier is not trained; call fit() or from_jsonl() first.")
+
+        best_index, best, second = 0, -1.0, 0.0
+        for label_index, score in enumerate(self.scores(query)):
+            if score > best:
+                best_index, best, second = label_index, score, max(best, 0.0)
+            elif score > second:
+                second = score
+        label = self.labels[best_index]
+        return Prediction(label, category_of(label), best, best - second)
+
+    def is_confident(self, prediction: Prediction) -> bool:
+        """
+        True if a prediction is safe to act on without asking the LLM.
+        """
+        return prediction.score >= self.min_score and prediction.margin >= self.min_margin
+
+    def faq_answer(self, prediction: Prediction) -> str | None:
+        """
+        Canned answer for a high-confidence FAQ prediction, else None.
+        """
+        if prediction.canned_answer and self.is_confident(prediction) and prediction.score >= self.min_faq_score:
+            return prediction.canned_answer
+        return None
+
+
+def evaluate(examples: list[tuple[str, str]], **kwargs) -> dict:
+    """
+    Leave-one-out evaluation on logged queries.
+
+    Parameters
+    ----------
+    examples : list[tuple[str, str]]
+        Logged queries with their label
+    **kwargs
+        QueryClassifier thresholds
+
+    Returns
+    -------
+    dict
+        Share of queries answered locally, category accuracy on those, and
+        the mean prediction time in microseconds
+    """
+    confident = correct = 0
+    seconds = 0.0
+    for held_out in range(len(examples)):
+        classifier = QueryClassifier(**kwargs).fit(examples[:held_out] + examples[held_out + 1:])
+        query, label = examples[held_out]
+
+        start = time.perf_counter()
+        prediction = classifier.predict(query)
+        seconds += time.perf_counter() - start
+
+        if classifier.is_confident(prediction):
+            confident += 1
+            correct += prediction.category == category_of(label)
+
+    return {
+        "local_rate": confident / len(examples),
+        "local_category_accuracy": correct / confident if confident else float("nan"),
+        "predict_us": seconds / len(examples) * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    examples = load_examples(DEFAULT_DATASET)
+    classifier = QueryClassifier().fit(examples)
+
+    for query in [
+        "I forgot my password and can't log in",
+        "How can I update my billing information?",
+        "I was charged twice",
+        "Tell me a joke",
+    ]:
+        prediction = classifier.predict(query)
+        if classifier.faq_answer(prediction):
+            route = "canned answer"
+        elif classifier.is_confident(prediction):
+            route = "local category"
+        else:
+            route = "LLM"
+        print(f"{query!r:45} → {prediction.label:20} score={prediction.score:.2f} "
+              f"margin={prediction.margin:.2f} [{route}]")
+
+    report = evaluate(examples)
+    print(f"\nLeave-one-out: {report['local_rate']:.0%} resolved locally, "
+          f"{report['local_category_accuracy']:.0%} category accuracy, "
+          f"{report['predict_us']:.1f} µs per prediction")
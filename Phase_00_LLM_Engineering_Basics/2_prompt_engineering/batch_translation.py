@@ -0,0 +1,449 @@
+"""
+Packed Batch Translation with a Persistent Translation Memory
+
+`translation_chain` in `zero_shot_example.py` translates ONE sentence per LLM
+call. For a catalog of thousands of strings that means thousands of requests,
+each paying full network latency and repeating the same instructions. This
+script translates catalogs efficiently:
+
+1. Translation memory first: every sentence is looked up in a SQLite database
+   of earlier translations, by exact text and then by a normalized key (case,
+   Unicode form and whitespace ignored). Repeated strings never hit the model.
+2. Duplicates inside the input (including case/spacing variants) are
+   translated only once.
+3. The remaining sentences are packed into numbered requests:
+       1. First sentence
+       2. Second sentence
+   The model answers with the same numbers, and the response is split back
+   into one translation per sentence.
+4. Items missing from a response (or unparseable) are re-issued in smaller
+   packs, and finally one by one, instead of repeating the whole request.
+5. New translations are written back to the memory.
+
+Requirements:
+- Python 3.10+
+- langchain_google_genai
+- langchain_core
+- A valid Google Gemini API key stored in the environment variable "Gemini_APIKEY"
+  (only for real translations; the benchmark below runs offline)
+
+Example:
+--------
+>>> memory = TranslationMemory("translation_memory.sqlite")
+>>> translator = BatchTranslator(llm_model, memory, source_language="English", target_language="Japanese")
+>>> translator.translate(["Hi, my name is Himanshu Singh!", "Thank you!"])
+['こんにちは、私の名前はヒマンシュ・シンです！', 'ありがとうございます！']
+"""
+
+# ---------------------------
+# Import required modules
+# ---------------------------
+import random
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable, RunnableLambda
+
+# ---------------------------
+# Packed translation prompt
+# ---------------------------
+packed_translation_prompt = PromptTemplate(
+    input_variables=["from", "to", "count", "sentences"],
+    template="""
+You are the world's best translator who translates sentences from {from} to {to}.
+Translate each of the {count} numbered sentences below.
+Reply with exactly {count} lines, one per sentence, in the form "<number>. <translation>".
+Keep the numbering, do not merge or skip sentences, and do not add any other text.
+
+{sentences}
+"""
+)
+
+NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[.):]\s*(.*?)\s*$")
+
+
+def build_batch_translation_chain(llm) -> Runnable:
+    """
+    Packed prompt → LLM → string pipeline.
+    """
+    return packed_translation_prompt | llm | StrOutputParser()
+
+
+def normalize_key(text: str) -> str:
+    """
+    Key that ignores case, Unicode form and whitespace differences.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def pack(sentences: list[str]) -> str:
+    """
+    Number the sentences one per line (inner newlines become spaces).
+    """
+    return "\n".join(f"{number}. {' '.join(sentence.split())}" for number, sentence in enumerate(sentences, 1))
+
+
+def unpack(response: str, count: int) -> dict[int, str]:
+    """
+    Split a numbered response into {index: translation} (0-based).
+
+    An item runs from its number to the next numbered line, so a translation the
+    model wrapped over several lines is kept whole. Lines numbered outside
+    1..count are treated as continuation text. Empty translations and numbers
+    that appear more than once are dropped, so those items get re-issued.
+    """
+    found, repeated = {}, set()
+    index, lines = None, []
+
+    def flush():
+        text = "\n".join(lines).strip()
+        if index is not None and text:
+            if index in found:
+                repeated.add(index)
+            found[index] = text
+
+    for line in response.splitlines():
+        match = NUMBERED_LINE.match(line)
+        if match and 0 < int(match.group(1)) <= count:
+            flush()
+            index, lines = int(match.group(1)) - 1, [match.group(2)]
+        elif index is not None:
+            lines.append(line.strip())
+    flush()
+    return {index: text for index, text in found.items() if index not in repeated}
+
+
+# ---------------------------
+# Translation memory (SQLite)
+# ---------------------------
+class TranslationMemory:
+    """
+    Persistent store of earlier translations, keyed per language pair.
+
+    Args:
+        path (str): SQLite database file (":memory:" for a throwaway memory).
+    """
+
+    _SQLITE_MAX_PARAMS = 900
+
+    def __init__(self, path: str = "translation_memory.sqlite"):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS memory (
+                source_language TEXT NOT NULL,
+                target_language TEXT NOT NULL,
+                source TEXT NOT NULL,
+                normalized TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                PRIMARY KEY (source_language, target_language, source)
+            )
+        """)
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS memory_normalized ON memory (source_language, target_language, normalized)"
+        )
+        self._connection.commit()
+
+    def _lookup(self, column: str, keys: list[str], source_language: str, target_language: str) -> dict[str, str]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self._SQLITE_MAX_PARAMS):
+                chunk = keys[start:start + self._SQLITE_MAX_PARAMS]
+                rows = self._connection.execute(
+                    f"SELECT {column}, translation FROM memory "
+                    f"WHERE source_language = ? AND target_language = ? "
+                    f"AND {column} IN ({','.join('?' * len(chunk))})",
+                    [source_language, target_language, *chunk],
+                )
+                found.update(rows)
+        return found
+
+    def get_many(self, sentences: list[str], source_language: str, target_language: str) -> tuple[dict, int, int]:
+        """
+        Look sentences up by exact text, then by normalized key.
+
+        Returns:
+            tuple: ({sentence: translation}, exact hits, normalized hits)
+        """
+        unique = list(dict.fromkeys(sentences))
+        found = self._lookup("source", unique, source_language, target_language)
+        exact_hits = len(found)
+
+        missing = [sentence for sentence in unique if sentence not in found]
+        by_key = self._lookup("normalized", list({normalize_key(s) for s in missing}), source_language, target_language)
+        normalized_hits = 0
+        for sentence in missing:
+            translation = by_key.get(normalize_key(sentence))
+            if translation is not None:
+                found[sentence] = translation
+                normalized_hits += 1
+        return found, exact_hits, normalized_hits
+
+    def put_many(self, translations: dict[str, str], source_language: str, target_language: str) -> None:
+        """
+        Store new translations in one transaction.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?)",
+                [(source_language, target_language, source, normalize_key(source), translation)
+                 for source, translation in translations.items()],
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+# ---------------------------
+# Batch translator
+# ---------------------------
+@dataclass
+class TranslationStats:
+    """
+    Counters of one `translate` call.
+    """
+    sentences: int = 0
+    unique: int = 0
+    sent_to_model: int = 0
+    exact_hits: int = 0
+    normalized_hits: int = 0
+    translated: int = 0
+    requests: int = 0
+    reissued_items: int = 0
+    seconds: float = 0.0
+
+
+class BatchTranslator:
+    """
+    Translate many sentences with few LLM requests, behind a translation memory.
+
+    Args:
+        llm: Any LangChain LLM (or a ready chain, see `chain`).
+        memory (TranslationMemory): Persistent translation memory.
+        source_language (str): Language of the input sentences.
+        target_language (str): Language to translate into.
+        batch_size (int): Maximum sentences per request.
+        max_chars (int): Maximum characters of packed sentences per request.
+        max_concurrency (int): Requests in flight at the same time.
+        max_attempts (int): Attempts per item before giving up on it.
+        chain (Runnable | None): Use this chain instead of building one from `llm`.
+    """
+
+    def __init__(
+        self,
+        llm,
+        memory: TranslationMemory,
+        source_language: str = "English",
+        target_language: str = "French",
+        batch_size: int = 50,
+        max_chars: int = 6000,
+        max_concurrency: int = 4,
+        max_attempts: int = 3,
+        chain: Runnable | None = None,
+    ):
+        self.chain = chain or build_batch_translation_chain(llm)
+        self.memory = memory
+        self.source_language = source_language
+        self.target_language = target_language
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.stats = TranslationStats()
+
+    def _packs(self, sentences: list[str], batch_size: int) -> list[list[str]]:
+        packs, current, chars = [], [], 0
+        for sentence in sentences:
+            if current and (len(current) >= batch_size or chars + len(sentence) > self.max_chars):
+                packs.append(current)
+                current, chars = [], 0
+            current.append(sentence)
+            chars += len(sentence)
+        return packs + [current] if current else packs
+
+    def _invoke_all(self, inputs: list[dict]) -> list:
+        """
+        Invoke the chain once per input on `max_concurrency` threads.
+
+        `chain.batch()` is not used on purpose: a LangChain LLM's batch (including
+        GoogleGenerativeAI's) sends its prompts one after another, and a single
+        failure fails the whole chunk. Here each failure stays with its own pack.
+        """
+        def invoke(payload: dict):
+            try:
+                return self.chain.invoke(payload)
+            except Exception as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(invoke, inputs))
+
+    def _translate_packs(self, packs: list[list[str]]) -> tuple[dict[str, str], list[str]]:
+        """
+        Send packs concurrently; return translations and the items that failed.
+        """
+        inputs = [
+            {"from": self.source_language, "to": self.target_language, "count": len(items), "sentences": pack(items)}
+            for items in packs
+        ]
+        responses = self._invoke_all(inputs)
+        self.stats.requests += len(packs)
+
+        translated, failed = {}, []
+        for items, response in zip(packs, responses):
+            parsed = {} if isinstance(response, Exception) else unpack(response, len(items))
+            for index, sentence in enumerate(items):
+                if index in parsed:
+                    translated[sentence] = parsed[index]
+                else:
+                    failed.append(sentence)
+        return translated, failed
+
+    def translate(self, sentences: list[str]) -> list[str | None]:
+        """
+        Translate sentences, using the memory first and packed requests for the rest.
+
+        Args:
+            sentences (list[str]): Sentences to translate (duplicates allowed).
+
+        Returns:
+            list[str | None]: One translation per input sentence, in input order
+                              (None for items that failed every attempt).
+        """
+        start = time.perf_counter()
+        self.stats = TranslationStats(sentences=len(sentences))
+
+        # Step 1: translation memory (exact, then normalized key)
+        known, self.stats.exact_hits, self.stats.normalized_hits = self.memory.get_many(
+            sentences, self.source_language, self.target_language
+        )
+        unique = list(dict.fromkeys(sentences))
+        self.stats.unique = len(unique)
+
+        # Step 2: case/spacing variants of one sentence are sent only once
+        variants = {}
+        for sentence in unique:
+            if sentence not in known:
+                variants.setdefault(normalize_key(sentence), []).append(sentence)
+        todo = [group[0] for group in variants.values()]
+        self.stats.sent_to_model = len(todo)
+
+        # Step 3: packed requests; failed items are re-issued in smaller packs
+        batch_size = self.batch_size
+        for attempt in range(self.max_attempts):
+            if not todo:
+                break
+            if attempt:
+                self.stats.reissued_items += len(todo)
+                batch_size = 1 if attempt == self.max_attempts - 1 else max(1, batch_size // 4)
+            translated, todo = self._translate_packs(self._packs(todo, batch_size))
+            for group in variants.values():
+                if group[0] in translated:
+                    translated.update(dict.fromkeys(group[1:], translated[group[0]]))
+            self.memory.put_many(translated, self.source_language, self.target_language)
+            known.update(translated)
+            self.stats.translated += len(translated)
+
+        self.stats.seconds = time.perf_counter() - start
+        return [known.get(sentence) for sentence in sentences]
+
+
+# ---------------------------
+# Offline benchmark
+# ---------------------------
+def simulated_llm(base_latency: float = 0.05, per_item_latency: float = 0.002, drop_rate: float = 0.02,
+                  seed: int = 0) -> Runnable:
+    """
+    Stand-in for the LLM: "translates" every numbered line after a delay that
+    grows with the number of items, and occasionally drops a line.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def respond(prompt_value) -> str:
+        lines = [match for line in prompt_value.to_string().splitlines() if (match := NUMBERED_LINE.match(line))]
+        time.sleep(base_latency + per_item_latency * len(lines))
+        with lock:
+            kept = [match for match in lines if rng.random() >= drop_rate]
+        return "\n".join(f"{match.group(1)}. [fr] {match.group(2)}" for match in kept)
+
+    return RunnableLambda(respond)
+
+
+def synthetic_catalog(size: int, unique_ratio: float = 0.6, seed: int = 0) -> list[str]:
+    """
+    Product-catalog-like strings with repeats and case/spacing variants.
+    """
+    rng = random.Random(seed)
+    adjectives = ["Red", "Blue", "Large", "Small", "Wireless", "Leather", "Organic", "Vintage", "Compact", "Heavy-duty"]
+    products = ["backpack", "coffee mug", "desk lamp", "running shoes", "phone case", "water bottle", "notebook",
+                "kitchen knife", "yoga mat", "travel pillow"]
+    unique = [f"{rng.choice(adjectives)} {rng.choice(products)}, model {index}" for index in range(int(size * unique_ratio))]
+    catalog = []
+    for _ in range(size):
+        sentence = rng.choice(unique)
+        variant = rng.random()
+        if variant < 0.1:
+            sentence = sentence.upper()
+        elif variant < 0.2:
+            sentence = "  " + sentence.replace(" ", "  ")
+        catalog.append(sentence)
+    return catalog
+
+
+def benchmark(size: int = 10_000, base_latency: float = 0.05, per_item_latency: float = 0.002) -> dict:
+    """
+    Requests and wall time per `size` sentences: single-sentence calls vs. packed
+    batches (cold memory) vs. a second run (warm memory).
+    """
+    catalog = synthetic_catalog(size)
+    llm = simulated_llm(base_latency, per_item_latency)
+
+    # Baseline: one request per sentence (like `translation_chain`), measured on a
+    # sample at the same concurrency and extrapolated to the full catalog
+    sample = catalog[:200]
+    single = BatchTranslator(None, TranslationMemory(":memory:"), batch_size=1, chain=build_batch_translation_chain(llm))
+    start = time.perf_counter()
+    single._translate_packs([[sentence] for sentence in sample])
+    single_seconds = (time.perf_counter() - start) * len(catalog) / len(sample)
+
+    memory = TranslationMemory(":memory:")
+    translator = BatchTranslator(llm, memory)
+    translator.translate(catalog)
+    cold = translator.stats
+    translator.translate(catalog)
+    warm = translator.stats
+
+    return {
+        "sentences": len(catalog),
+        "single_requests": len(catalog),
+        "single_seconds": single_seconds,
+        "cold": cold,
+        "warm": warm,
+    }
+
+
+if __name__ == "__main__":
+    report = benchmark()
+    cold, warm = report["cold"], report["warm"]
+
+    print(f"Translating {report['sentences']} catalog sentences (simulated LLM, 4 concurrent requests)")
+    print("-" * 72)
+    print(f"One sentence per call : {report['single_requests']:6d} requests, {report['single_seconds']:7.1f}s (extrapolated)")
+    print(f"Packed, cold memory   : {cold.requests:6d} requests, {cold.seconds:7.1f}s "
+          f"| {cold.unique} unique, {cold.sent_to_model} sent to the model, "
+          f"{cold.reissued_items} items re-issued")
+    print(f"Packed, warm memory   : {warm.requests:6d} requests, {warm.seconds:7.1f}s "
+          f"| {warm.exact_hits} exact + {warm.normalized_hits} normalized hits")
@@ -43,6 +43,8 @@ Theory:
    - **Self-consistency prompting**: Running multiple CoT outputs and selecting 
      the most common answer to improve reliability.
      Example: Generate several reasoning paths for a math problem and pick the majority answer.
+     See `self_consistency_sampler.py`, which samples concurrently and stops as
+     soon as the majority answer is decided.
 
    - **Decomposition / Prompt chaining**: Breaking a complex task into multiple 
      prompts where each prompt’s output feeds into the next.
@@ -56,24 +58,30 @@ Step 1: Calculate total distance = 60 + 90 = 150 km
 Step 2: Calculate total time = 1 + 1.5 = 2.5 hours
 Step 3: Average speed = Total distance / Total time = 150 / 2.5 = 60 km/h
 Answer: 60 km/h
+
+`self_consistency_sampler.py` reuses this prompt style; build the chain with
+`build_problem_solving_chain()`.
 """
 
 # ---------------------------
 # Import required modules
 # ---------------------------
 import os
+from functools import lru_cache
 from langchain_google_genai import GoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
 from langchain.prompts import PromptTemplate
 
 # ---------------------------
-# Initialize the LLM
+# Initialize the LLM (on first use)
 # ---------------------------
-llm_model = GoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=os.getenv("Gemini_APIKEY"),
-    max_output_tokens = 200
-)
+@lru_cache(maxsize=None)
+def get_llm_model() -> GoogleGenerativeAI:
+    return GoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        api_key=os.getenv("Gemini_APIKEY"),
+        max_output_tokens = 200
+    )
 
 # ---------------------------
 # Define the Chain-of-Thought Prompt Template
@@ -145,16 +153,22 @@ problem_text = "If a train travels 60 km in 1 hour and 90 km in 1.5 hours, what
 #
 # Essentially, the pipe operator allows you to define a **linear, step-by-step
 # processing sequence** similar to Unix pipelines or functional composition.
-problem_solving_chain = chain_of_thought_prompt | llm_model | output_parser
-
-
-# ---------------------------
-# Solve the problem
-# ---------------------------
-solution = problem_solving_chain.invoke({"problem": problem_text})
-
-# ---------------------------
-# Print the solution
-# ---------------------------
-print("Problem:\n", problem_text)
-print("\nSolution (step-by-step reasoning):\n", solution)
\ No newline at end of file
+def build_problem_solving_chain(llm=None):
+    """
+    Build the CoT pipeline (default LLM: the shared `get_llm_model()` instance).
+    """
+    llm = llm if llm is not None else get_llm_model()
+    return chain_of_thought_prompt | llm | output_parser
+
+
+if __name__ == "__main__":
+    # ---------------------------
+    # Solve the problem
+    # ---------------------------
+    solution = build_problem_solving_chain().invoke({"problem": problem_text})
+
+    # ---------------------------
+    # Print the solution
+    # ---------------------------
+    print("Problem:\n", problem_text)
+    print("\nSolution (step-by-step reasoning):\n", solution)
\ No newline at end of file
@@ -19,12 +19,20 @@ Example Output:
 ----------------
 Input sentence: "Thanks"
 Output: "Merci"
+
+Note:
+For large example banks, `few_shot_selector.py` picks the most similar examples
+per sentence from an on-disk vector index instead of hard-coding them.
+
+Running the file translates `sentence_to_translate`; other scripts can call
+`build_translation_chain()` instead.
 """
 
 # ---------------------------
 # Import required modules
 # ---------------------------
 import os
+from functools import lru_cache
 from langchain_google_genai import GoogleGenerativeAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -34,11 +42,14 @@ from langchain_core.output_parsers import StrOutputParser
 # ---------------------------
 # The 'max_output_tokens' parameter controls the maximum number of tokens
 # the model can generate. Set it according to expected output length.
-llm_model = GoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=os.getenv("Gemini_APIKEY"),
-    max_output_tokens=200
-)
+# The model is created on first use and then reused.
+@lru_cache(maxsize=None)
+def get_llm_model() -> GoogleGenerativeAI:
+    return GoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        api_key=os.getenv("Gemini_APIKEY"),
+        max_output_tokens=200
+    )
 
 # ---------------------------
 # Define the Few-Shot Prompt Template
@@ -72,15 +83,22 @@ sentence_to_translate = "Thanks"
 # 1. The prompt formats the input with the example sentence.
 # 2. The LLM generates the translation.
 # 3. The output parser converts the LLM response into a clean string.
-translation_chain = (translation_prompt_template | llm_model | StrOutputParser())
+def build_translation_chain(llm=None):
+    """
+    Build the few-shot pipeline (default LLM: the shared `get_llm_model()` instance).
+    """
+    llm = llm if llm is not None else get_llm_model()
+    return (translation_prompt_template | llm | StrOutputParser())
 
-# ---------------------------
-# Execute the translation
-# ---------------------------
-translated_sentence = translation_chain.invoke({"sentence": sentence_to_translate})
 
-# ---------------------------
-# Display the result
-# ---------------------------
-print(f"Original Sentence: {sentence_to_translate}")
-print(f"Translated Sentence: {translated_sentence}")
\ No newline at end of file
+if __name__ == "__main__":
+    # ---------------------------
+    # Execute the translation
+    # ---------------------------
+    translated_sentence = build_translation_chain().invoke({"sentence": sentence_to_translate})
+
+    # ---------------------------
+    # Display the result
+    # ---------------------------
+    print(f"Original Sentence: {sentence_to_translate}")
+    print(f"Translated Sentence: {translated_sentence}")
\ No newline at end of file
@@ -0,0 +1,322 @@
+"""
+Concurrent Self-Consistency Sampler with Early-Stopping Majority Vote
+
+`chain_of_thought_demo.py` describes self-consistency prompting (sample several
+reasoning paths, keep the majority answer) but runs the chain only once. This
+script implements it efficiently:
+
+1. All N chain-of-thought samples are launched concurrently.
+2. As each sample finishes, its final "Answer:" line is parsed and counted as a vote.
+3. As soon as the leading answer can no longer be overtaken, even if every
+   remaining sample disagreed, the vote is decided and the samples still in
+   flight are cancelled.
+
+Easy problems, where the samples agree, return after the fastest majority of
+the samples instead of the slowest of all N. The cancelled requests were
+already sent, so this saves latency, not billed calls.
+
+`budget_calls=True` trades latency for calls: only the samples that could
+still decide the vote are in flight (a majority of N at first, then the
+agreeing votes the leader still needs), so on easy problems the remaining
+calls are never sent. Hard problems then take longer than a fixed-N vote,
+because the extra samples start only when they are needed.
+
+Requirements:
+- Python 3.10+
+- langchain_google_genai
+- langchain_core
+- A valid Google Gemini API key stored in the environment variable "Gemini_APIKEY"
+  (only for `build_self_consistency_chain`; the benchmark below runs offline)
+
+Example:
+--------
+>>> chain = build_self_consistency_chain(GoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.7))
+>>> result = run_self_consistency(chain, "What is 23 × 17?", n_samples=5)
+>>> result.answer, result.calls_started, result.calls_cancelled
+('391', 5, 2)
+"""
+
+# ---------------------------
+# Import required modules
+# ---------------------------
+import asyncio
+import random
+import re
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable, RunnableLambda
+
+# ---------------------------
+# Chain-of-Thought prompt with a parseable final line
+# ---------------------------
+# Same idea as `chain_of_thought_prompt` in chain_of_thought_demo.py, but the
+# model must end with a single "Answer:" line so the samples can be compared.
+self_consistency_prompt = PromptTemplate(
+    input_variables=["problem"],
+    template="""
+Solve the following problem step by step.
+Show your reasoning before giving the final answer.
+End with exactly one line of the form "Answer: <final answer>".
+
+Problem: {problem}
+"""
+)
+
+ANSWER_LINE = re.compile(r"^\W*answer\W*:\s*(.+?)\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def build_self_consistency_chain(llm) -> Runnable:
+    """
+    Build the CoT sampling chain: prompt → LLM → string.
+
+    Args:
+        llm: A LangChain LLM sampled with temperature > 0, otherwise every
+             sample follows the same reasoning path and voting is pointless.
+    """
+    return self_consistency_prompt | llm | StrOutputParser()
+
+
+def parse_answer(text: str) -> str | None:
+    """
+    Extract and normalize the final "Answer:" line of one sample.
+
+    Normalization removes markdown emphasis, surrounding quotes, trailing
+    punctuation, case and spacing differences, so "**60 km/h.**" and
+    "60 km/h" count as the same vote.
+
+    Returns:
+        str | None: The normalized answer, or None if the sample has no answer line.
+    """
+    matches = ANSWER_LINE.findall(text)
+    if not matches:
+        return None
+    answer = matches[-1].strip("*_`\"' ").rstrip(".! ")
+    answer = re.sub(r"\s+", " ", answer).lower()
+    answer = re.sub(r"(?<=\d),(?=\d{3}\b)", "", answer)  # 1,000 -> 1000
+    return answer or None
+
+
+# ---------------------------
+# Early-stopping majority vote
+# ---------------------------
+@dataclass
+class SelfConsistencyResult:
+    """
+    Outcome of one self-consistency vote.
+
+    Attributes:
+        answer (str | None): Majority answer (None if no sample produced one).
+        votes (Counter): Number of samples per normalized answer.
+        samples (list[str]): Full reasoning text of every completed sample.
+        n_samples (int): Sample budget N of the fixed-N baseline.
+        calls_started (int): Samples actually sent to the model.
+        calls_completed (int): Samples that finished.
+        calls_cancelled (int): In-flight samples cancelled after the decision.
+        failures (int): Samples that raised an error.
+        early_stopped (bool): True if the vote was decided before all N samples.
+        seconds (float): Wall time of the whole vote.
+    """
+    answer: str | None
+    votes: Counter
+    samples: list[str] = field(default_factory=list)
+    n_samples: int = 0
+    calls_started: int = 0
+    calls_completed: int = 0
+    calls_cancelled: int = 0
+    failures: int = 0
+    early_stopped: bool = False
+    seconds: float = 0.0
+
+    @property
+    def calls_saved(self) -> int:
+        """
+        Samples never sent, compared to a fixed-N vote.
+
+        Cancelled in-flight samples do not count: their requests were already sent.
+        """
+        return self.n_samples - self.calls_started
+
+
+def votes_needed(votes: Counter, remaining: int) -> int:
+    """
+    Agreeing votes the leading answer still needs to be decided (<= 0 if it already is).
+    """
+    ranked = votes.most_common(2)
+    leader = ranked[0][1] if ranked else 0
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0
+    # Smallest k with leader + k > runner_up + (remaining - k)
+    return (runner_up + remaining - leader) // 2 + 1
+
+
+def is_decided(votes: Counter, remaining: int) -> bool:
+    """
+    True if the leading answer wins even if all `remaining` samples vote against it.
+    """
+    ranked = votes.most_common(2)
+    if not ranked:
+        return False
+    leader = ranked[0][1]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0
+    return leader > runner_up + remaining
+
+
+async def self_consistency(
+    chain: Runnable,
+    problem: str,
+    n_samples: int = 5,
+    max_concurrency: int | None = None,
+    early_stop: bool = True,
+    budget_calls: bool = False,
+) -> SelfConsistencyResult:
+    """
+    Sample CoT answers concurrently and stop once the majority is unassailable.
+
+    Args:
+        chain (Runnable): Chain mapping {"problem": ...} to reasoning text.
+        problem (str): Problem to solve.
+        n_samples (int): Maximum number of samples (N of the fixed-N baseline).
+        max_concurrency (int | None): Samples in flight at once (default: all N).
+        early_stop (bool): Set to False to always wait for all N samples.
+        budget_calls (bool): Keep only the samples that could still decide the
+                             vote in flight, so early stopping also saves calls
+                             (at the cost of latency on hard problems).
+
+    Returns:
+        SelfConsistencyResult: The majority answer plus call accounting.
+    """
+    result = SelfConsistencyResult(answer=None, votes=Counter(), n_samples=n_samples)
+    start = time.perf_counter()
+    pending = set()
+
+    def in_flight_limit() -> int:
+        limit = max_concurrency or n_samples
+        if budget_calls and early_stop:
+            return min(limit, votes_needed(result.votes, n_samples - result.calls_completed))
+        return limit
+
+    def launch():
+        pending.add(asyncio.create_task(chain.ainvoke({"problem": problem})))
+        result.calls_started += 1
+
+    try:
+        while result.calls_started < n_samples and len(pending) < in_flight_limit():
+            launch()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result.calls_completed += 1
+                if task.exception() is not None:
+                    result.failures += 1
+                    continue
+                result.samples.append(task.result())
+                answer = parse_answer(task.result())
+                if answer is not None:
+                    result.votes[answer] += 1
+
+            if early_stop and is_decided(result.votes, n_samples - result.calls_completed):
+                result.early_stopped = result.calls_completed < n_samples
+                break
+
+            while result.calls_started < n_samples and len(pending) < in_flight_limit():
+                launch()
+    finally:
+        # Decided (or interrupted): stop paying for samples that cannot change the outcome
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        result.calls_cancelled = len(pending)
+
+    if result.votes:
+        result.answer = result.votes.most_common(1)[0][0]
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def run_self_consistency(chain: Runnable, problem: str, n_samples: int = 5, **kwargs) -> SelfConsistencyResult:
+    """
+    Synchronous wrapper around `self_consistency` for scripts.
+    """
+    return asyncio.run(self_consistency(chain, problem, n_samples=n_samples, **kwargs))
+
+
+# ---------------------------
+# Offline benchmark
+# ---------------------------
+def simulated_cot_chain(p_correct: float, correct: str, wrong: list[str],
+                        latency: tuple[float, float] = (0.4, 1.2), seed: int | None = None) -> Runnable:
+    """
+    Stand-in for the LLM chain: random latency, correct answer with probability `p_correct`.
+    """
+    rng = random.Random(seed)
+
+    async def sample(_inputs: dict) -> str:
+        await asyncio.sleep(rng.uniform(*latency))
+        answer = correct if rng.random() < p_correct else rng.choice(wrong)
+        return f"Step 1: ...\nStep 2: ...\nAnswer: {answer}"
+
+    return RunnableLambda(sample)
+
+
+async def benchmark(n_samples: int = 5, problems: int = 50, latency: tuple[float, float] = (0.4, 1.2)) -> dict:
+    """
+    Compare early stopping with a fixed-N vote on simulated easy and hard problems.
+
+    Early stopping runs twice: with all N samples in flight (the default) and
+    with `budget_calls=True`.
+
+    Returns:
+        dict: Per difficulty, mean latency, mean calls sent and accuracy of
+              every strategy.
+    """
+    wrong = ["50 km/h", "75 km/h", "65 km/h"]
+    report = {}
+    for difficulty, p_correct in (("easy", 0.95), ("hard", 0.5)):
+        # Same seed for both strategies: identical sample latencies and answers.
+        # Problems run concurrently, each vote is timed on its own.
+        fixed = await asyncio.gather(*(
+            self_consistency(simulated_cot_chain(p_correct, "60 km/h", wrong, latency, seed),
+                             "train problem", n_samples, early_stop=False)
+            for seed in range(problems)
+        ))
+        early = await asyncio.gather(*(
+            self_consistency(simulated_cot_chain(p_correct, "60 km/h", wrong, latency, seed),
+                             "train problem", n_samples)
+            for seed in range(problems)
+        ))
+        budgeted = await asyncio.gather(*(
+            self_consistency(simulated_cot_chain(p_correct, "60 km/h", wrong, latency, seed),
+                             "train problem", n_samples, budget_calls=True)
+            for seed in range(problems)
+        ))
+
+        report[difficulty] = {"fixed_calls": n_samples}
+        for name, results in (("fixed", fixed), ("early", early), ("budgeted", budgeted)):
+            report[difficulty].update({
+                f"{name}_latency_s": statistics.mean(result.seconds for result in results),
+                f"{name}_started": sum(result.calls_started for result in results) / problems,
+                f"{name}_saved_pct": sum(result.calls_saved for result in results) / (problems * n_samples),
+                f"{name}_accuracy": sum(result.answer == "60 km/h" for result in results) / problems,
+            })
+    report["single_call_latency_s"] = sum(latency) / 2
+    return report
+
+
+if __name__ == "__main__":
+    report = asyncio.run(benchmark(n_samples=5))
+
+    print(f"Self-consistency with N=5 (mean single call ≈ {report['single_call_latency_s']:.2f}s)")
+    print("calls = requests sent (cancelled in-flight requests are billed and count as sent)")
+    print("-" * 72)
+    for difficulty in ("easy", "hard"):
+        stats = report[difficulty]
+        print(f"{difficulty}:")
+        for name, label in (("fixed", "fixed-N"), ("early", "early stop"),
+                            ("budgeted", "early stop, budget_calls=True")):
+            print(f"  {label:30} {stats[f'{name}_latency_s']:.2f}s, {stats[f'{name}_started']:.1f} calls "
+                  f"({stats[f'{name}_saved_pct']:.0%} saved), accuracy {stats[f'{name}_accuracy']:.0%}")
@@ -19,12 +19,20 @@ Translate from English to Japanese
 Expected Output:
 Original Language English: Hi, my name is Himanshu Singh!
 Translated Language Japanese: こんにちは、私の名前はヒマンスです！
+
+Note:
+To translate whole catalogs, see `batch_translation.py`. It packs many sentences
+into one request and keeps a translation memory, so repeated strings are free.
+
+Use `build_translation_chain()` to get the chain; the translation below runs
+only when this file is executed as a script.
 """
 
 # ---------------------------
 # Import required modules
 # ---------------------------
 import os
+from functools import lru_cache
 from langchain_google_genai import GoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -35,11 +43,14 @@ from langchain_core.output_parsers import StrOutputParser
 # GoogleGenerativeAI connects to the Gemini model.
 # - `model="gemini-2.5-flash"` specifies the model version.
 # - `api_key` is retrieved securely from environment variables.
-llm_model = GoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=os.getenv("Gemini_APIKEY"),
-    max_output_tokens = 200
-)
+# The model is created on first use and then reused.
+@lru_cache(maxsize=None)
+def get_llm_model() -> GoogleGenerativeAI:
+    return GoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        api_key=os.getenv("Gemini_APIKEY"),
+        max_output_tokens = 200
+    )
 
 # ---------------------------
 # Define the Zero-Shot Prompt Template
@@ -75,27 +86,34 @@ output_parser = StrOutputParser()
 #   1. zero_shot_translation_prompt generates the prompt
 #   2. llm_model produces the translation
 #   3. output_parser cleans the output
-translation_chain = zero_shot_translation_prompt | llm_model | output_parser
+def build_translation_chain(llm=None):
+    """
+    Build the zero-shot pipeline (default LLM: the shared `get_llm_model()` instance).
+    """
+    llm = llm if llm is not None else get_llm_model()
+    return zero_shot_translation_prompt | llm | output_parser
+
 
 # ---------------------------
 # Input Sentence
 # ---------------------------
 input_sentence = "Hi, my name is Himanshu Singh!"
 
-# ---------------------------
-# Run the translation pipeline
-# ---------------------------
-# The input dictionary maps template variables to actual values.
-translated_sentence = translation_chain.invoke({
-    "from": "English",
-    "to": "Japanese",
-    "sentence": input_sentence
-})
-
-# ---------------------------
-# Print the Result
-# ---------------------------
-print(translated_sentence)
+if __name__ == "__main__":
+    # ---------------------------
+    # Run the translation pipeline
+    # ---------------------------
+    # The input dictionary maps template variables to actual values.
+    translated_sentence = build_translation_chain().invoke({
+        "from": "English",
+        "to": "Japanese",
+        "sentence": input_sentence
+    })
+
+    # ---------------------------
+    # Print the Result
+    # ---------------------------
+    print(translated_sentence)
 
 """
 Zero-Shot Prompting Explanation:
@@ -0,0 +1,348 @@
+"""
+Batch Restaurant Name Generation with Deduplication and an On-Disk Memo
+-----------------------------------------------------------------------
+
+`langchain_basics.py` asks the model for one restaurant name at a time. This
+script generates names for thousands of (cuisine, style) combinations:
+
+1. Every input is keyed by a hash of its formatted prompt plus the model
+   parameters (model name, temperature, ...). Changing the model therefore
+   never serves stale names.
+2. Keys already in the on-disk memo (SQLite) are answered without any call,
+   so re-running a partially completed job only pays for the missing items.
+3. Identical inputs are sent once: duplicates within a job, and concurrent
+   jobs asking for the same key, all wait for the same in-flight request.
+4. The remaining inputs are sent one `ainvoke` per item, with at most
+   `max_concurrency` in flight (an asyncio.Semaphore). Plain LLMs such as
+   GoogleGenerativeAI run an `abatch` group one prompt after another and
+   fail the whole group on one error, so the fan-out is done here instead.
+   Outputs are written to the memo every `chunk_size` items, so an
+   interrupted job loses at most one chunk.
+5. Failed items are not memoized. They come back as None and are retried on
+   the next run; one failure never affects another item.
+
+Concepts Covered:
+- Per-item fan-out with asyncio.Semaphore and Runnable.ainvoke
+- Memoization keyed by prompt hash and model parameters
+- Request deduplication with shared futures
+
+Requirements:
+- Python 3.10+
+- Packages:
+    pip install langchain-google-genai langchain-core
+
+Environment Variables:
+- GOOGLE_API_KEY: API key for Google Gemini AI (only for the real model; the
+  benchmark below runs offline).
+
+Example:
+    >>> generator = BatchNameGenerator(memo=NameMemo("names.sqlite"), max_concurrency=8)
+    >>> stats = BatchStats()
+    >>> generator.generate([{"cuisine": "Mexican", "style": "rooftop"}, {"cuisine": "Thai", "style": "street-food"}],
+    ...                    stats=stats)
+    ['Cielo Azul', 'Soi Sizzle']
+    >>> stats.generated, stats.memo_hits
+    (2, 0)
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from langchain.prompts import PromptTemplate
+from langchain_core.runnables import Runnable
+
+from langchain_basics import get_llm, output_parser
+
+# ---------------------------------------------------------------------
+# Prompt with a style as well as a cuisine
+# ---------------------------------------------------------------------
+styled_prompt_template = PromptTemplate(
+    input_variables=["cuisine", "style"],
+    template=(
+        "I want to open a {style} restaurant for {cuisine} Food. "
+        "Suggest me a fancy name. Do NOT give any explanation or meaning."
+    )
+)
+
+
+def build_name_chain(llm=None, prompt: PromptTemplate = styled_prompt_template) -> Runnable:
+    """
+    PromptTemplate -> LLM -> StrOutputParser, as in langchain_basics.py.
+    """
+    return prompt | (llm if llm is not None else get_llm()) | output_parser
+
+
+def model_parameters(llm) -> dict:
+    """
+    Parameters that change the model's answers (part of every memo key).
+    """
+    params = getattr(llm, "_identifying_params", None)
+    return {"type": type(llm).__name__, **(params or {})}
+
+
+def memo_key(prompt_text: str, params: dict) -> str:
+    """
+    SHA-256 of the formatted prompt plus the model parameters.
+    """
+    payload = json.dumps({"prompt": prompt_text, "model": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------
+# On-disk memo
+# ---------------------------------------------------------------------
+class NameMemo:
+    """
+    SQLite-backed memo of finished generations (key -> output).
+
+    Args:
+        path (str): Database file (":memory:" for a throwaway memo).
+    """
+
+    def __init__(self, path: str = "name_memo.sqlite"):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS memo (key TEXT PRIMARY KEY, output TEXT NOT NULL)")
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """
+        Memoized outputs for the keys that have one.
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):  # stay below SQLite's variable limit
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, output FROM memo WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, outputs: dict[str, str]) -> None:
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO memo VALUES (?, ?)", outputs.items())
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM memo").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+# ---------------------------------------------------------------------
+# Batch generator
+# ---------------------------------------------------------------------
+@dataclass
+class BatchStats:
+    """
+    Accounting of one `generate` call (pass it as `stats=` to fill it in).
+    """
+    items: int = 0
+    unique: int = 0
+    memo_hits: int = 0
+    joined_in_flight: int = 0
+    generated: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+
+class BatchNameGenerator:
+    """
+    Generate names for many inputs with bounded concurrency, dedup and a memo.
+
+    Args:
+        llm: LLM for the default chain (default: langchain_basics' `get_llm()`).
+        memo (NameMemo | None): On-disk memo (default: in-memory only).
+        max_concurrency (int): Requests in flight at the same time.
+        chunk_size (int): Outputs written to the memo at a time.
+        chain (Runnable | None): Use this chain instead of `build_name_chain(llm)`.
+        prompt (PromptTemplate): Prompt that formats each input (part of the key).
+        model_params (dict | None): Key parameters (default: from the LLM).
+    """
+
+    def __init__(self, llm=None, memo: NameMemo | None = None, max_concurrency: int = 8,
+                 chunk_size: int = 200, chain: Runnable | None = None,
+                 prompt: PromptTemplate = styled_prompt_template, model_params: dict | None = None):
+        if chain is None:
+            llm = llm if llm is not None else get_llm()
+            chain = build_name_chain(llm, prompt)
+        self.chain = chain
+        self.prompt = prompt
+        self.model_params = model_params if model_params is not None else model_parameters(llm)
+        self.memo = memo or NameMemo(":memory:")
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def key(self, inputs: dict) -> str:
+        return memo_key(self.prompt.format(**inputs), self.model_params)
+
+    async def agenerate(self, inputs: list[dict], stats: BatchStats | None = None) -> list[str | None]:
+        """
+        Generate one output per input, in input order.
+
+        Args:
+            inputs (list[dict]): Prompt variables per item (duplicates allowed).
+            stats (BatchStats | None): Filled in with this call's accounting. Every
+                                       call needs its own, so concurrent jobs on
+                                       one generator keep separate numbers.
+
+        Returns:
+            list[str | None]: Outputs (None for items that failed).
+        """
+        start = time.perf_counter()
+        stats = stats if stats is not None else BatchStats()
+        stats.items = len(inputs)
+        keys = [self.key(item) for item in inputs]
+
+        # Step 1: one entry per distinct key
+        unique = dict(zip(keys, inputs))
+        stats.unique = len(unique)
+
+        # Step 2: memo hits cost nothing
+        results = self.memo.get_many(list(unique))
+        stats.memo_hits = len(results)
+
+        # Step 3: keys another job is already generating are awaited, not re-sent
+        waiting = {key: self._in_flight[key] for key in unique if key not in results and key in self._in_flight}
+        stats.joined_in_flight = len(waiting)
+
+        # Step 4: the rest is ours to generate
+        loop = asyncio.get_running_loop()
+        missing = [key for key in unique if key not in results and key not in waiting]
+        for key in missing:
+            self._in_flight[key] = loop.create_future()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def generate_one(key: str) -> tuple[str, str | Exception]:
+            async with semaphore:
+                try:
+                    return key, await self.chain.ainvoke(unique[key])
+                except Exception as error:  # only this item fails
+                    return key, error
+
+        tasks = [asyncio.ensure_future(generate_one(key)) for key in missing]
+        finished = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, output = await next_done
+                if isinstance(output, Exception):
+                    stats.failed += 1
+                    results[key] = None
+                else:
+                    results[key] = finished[key] = output.strip()
+                    stats.generated += 1
+                self._in_flight.pop(key).set_result(results[key])
+                if len(finished) >= self.chunk_size:
+                    self.memo.put_many(finished)
+                    finished = {}
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.memo.put_many(finished)
+            # Interrupted: release anyone still waiting on our keys
+            for key in missing:
+                future = self._in_flight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(None)
+
+        for key, future in waiting.items():
+            results[key] = await future
+
+        stats.seconds = time.perf_counter() - start
+        return [results.get(key) for key in keys]
+
+    def generate(self, inputs: list[dict], stats: BatchStats | None = None) -> list[str | None]:
+        """
+        Synchronous wrapper around `agenerate` for scripts.
+        """
+        return asyncio.run(self.agenerate(inputs, stats))
+
+
+# ---------------------------------------------------------------------
+# Offline benchmark
+# ---------------------------------------------------------------------
+def fancy_name(prompt: str) -> str:
+    """
+    Deterministic stand-in answer: one short "name" per prompt.
+    """
+    return "La " + hashlib.md5(prompt.encode("utf-8")).hexdigest()[:6].title()
+
+
+def synthetic_combinations(count: int, duplicate_share: float = 0.2, seed: int = 0) -> list[dict]:
+    """
+    (cuisine, style) inputs with a share of repeated combinations.
+    """
+    rng = random.Random(seed)
+    cuisines = ["Mexican", "Thai", "Italian", "Japanese", "Indian", "Greek", "Lebanese", "Peruvian",
+                "Korean", "Ethiopian", "French", "Vietnamese", "Spanish", "Turkish", "Moroccan"]
+    styles = ["rooftop", "street-food", "fine-dining", "family", "vegan", "fusion", "seaside", "late-night",
+              "brunch", "farm-to-table", "food-truck", "tapas", "buffet", "take-away", "speakeasy",
+              "retro diner", "garden", "bistro", "tasting-menu", "canteen"]
+    combinations = []
+    for index in range(count):
+        if combinations and rng.random() < duplicate_share:
+            combinations.append(rng.choice(combinations))
+        else:
+            combinations.append({"cuisine": cuisines[index % len(cuisines)],
+                                 "style": f"{styles[index // len(cuisines) % len(styles)]} #{index}"})
+    return combinations
+
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "benchmarks"))
+    from fake_llm import FakeLLM, LatencyModel
+
+    inputs = synthetic_combinations(1000)
+    # A plain LangChain LLM like GoogleGenerativeAI: 0.05-0.2s per call, 1% of calls get a 429
+    llm = FakeLLM(latency=LatencyModel("uniform", 0.125, 0.6, tokens_per_second=0),
+                  rules=[("Suggest me a fancy name", fancy_name)], rate_limit_probability=0.01, seed=0)
+    memo = NameMemo(":memory:")
+
+    print(f"Generating names for {len(inputs)} (cuisine, style) inputs (FakeLLM, 0.05-0.2s per call)")
+    print("-" * 80)
+    for max_concurrency in (8, 32):
+        llm.reset_stats()
+        generator = BatchNameGenerator(llm=llm, memo=NameMemo(":memory:"), max_concurrency=max_concurrency)
+        stats = BatchStats()
+        generator.generate(inputs, stats)
+        print(f"max_concurrency={max_concurrency:<3}: {stats.generated} calls for {stats.items} items "
+              f"({stats.unique} unique), {stats.failed} failed, peak {llm.stats.peak_in_flight} in flight, "
+              f"{stats.seconds:.1f}s")
+
+    generator = BatchNameGenerator(llm=llm, memo=memo, max_concurrency=32)
+    partial, resumed, rerun = BatchStats(), BatchStats(), BatchStats()
+    generator.generate(inputs[:600], partial)
+    print(f"Partial run   : {partial.generated} calls, {partial.seconds:.1f}s (first 600 items)")
+    generator.generate(inputs, resumed)
+    print(f"Resumed run   : {resumed.generated} calls, {resumed.memo_hits} memo hits, {resumed.seconds:.1f}s")
+    generator.generate(inputs, rerun)
+    print(f"Re-run        : {rerun.generated} calls (earlier failures only), "
+          f"{rerun.memo_hits} memo hits, {rerun.seconds:.2f}s")
+
+    async def two_jobs():
+        shared = BatchNameGenerator(llm=llm, memo=NameMemo(":memory:"), max_concurrency=32)
+        first_stats, second_stats = BatchStats(), BatchStats()
+        first = asyncio.create_task(shared.agenerate(inputs[:300], first_stats))
+        await asyncio.sleep(0)
+        await shared.agenerate(inputs[:300], second_stats)
+        await first
+        return first_stats, second_stats
+
+    first_stats, second_stats = asyncio.run(two_jobs())
+    print(f"Two concurrent jobs, same 300 items: first job made {first_stats.generated} calls, second job "
+          f"joined {second_stats.joined_in_flight} in-flight requests and made {second_stats.generated} calls")
@@ -18,9 +18,15 @@ Requirements:
 
 Environment Variables:
 - GOOGLE_API_KEY: API key for Google Gemini AI.
+
+`get_name_generation_chain()` returns the Prompt → LLM → Parser chain.
+
+For thousands of (cuisine, style) combinations, see `batch_name_generation.py`
+(batched, deduplicated and memoized on disk).
 """
 
 import os
+from functools import lru_cache
 from langchain_google_genai import ChatGoogleGenerativeAI 
 from langchain_core.messages import HumanMessage
 from langchain.prompts import PromptTemplate
@@ -33,11 +39,17 @@ from langchain_core.output_parsers import StrOutputParser
 # - model: specific Gemini version to use
 # - google_api_key: authenticate requests
 # - max_output_tokens: limit response length
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    google_api_key=os.getenv("GOOGLE_API_KEY"),
-    max_output_tokens=200
-)
+# The model is created on first use and then reused.
+@lru_cache(maxsize=None)
+def get_llm() -> ChatGoogleGenerativeAI:
+    """
+    Returns the Gemini chat model, created once and then reused.
+    """
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        max_output_tokens=200
+    )
 
 # ---------------------------------------------------------------------
 # Step 2: Initialize the Output Parser
@@ -66,18 +78,25 @@ prompt_template = PromptTemplate(
 # Combine the prompt, LLM, and output parser into a single workflow.
 # This is the "pipeline" where the output of one step flows into the next.
 # Chain flow: PromptTemplate -> LLM -> StrOutputParser
-name_generation_chain = prompt_template | llm | output_parser
+@lru_cache(maxsize=None)
+def get_name_generation_chain():
+    """
+    Returns the restaurant-name chain: prompt_template → get_llm() → output_parser.
+    """
+    return prompt_template | get_llm() | output_parser
 
-# ---------------------------------------------------------------------
-# Step 5: Generate Restaurant Name
-# ---------------------------------------------------------------------
-# Invoke the chain with specific input for the placeholder {cuisine}.
-# - Input: dictionary with keys matching input_variables
-# - Output: clean text generated by the LLM
-restaurant_name = name_generation_chain.invoke({"cuisine": "Mexican"})
 
-# ---------------------------------------------------------------------
-# Step 6: Display the Result
-# ---------------------------------------------------------------------
-# Prints the generated restaurant name
-print(f"Suggested Restaurant Name for Mexican Cuisine: {restaurant_name}")
\ No newline at end of file
+if __name__ == "__main__":
+    # ---------------------------------------------------------------------
+    # Step 5: Generate Restaurant Name
+    # ---------------------------------------------------------------------
+    # Invoke the chain with specific input for the placeholder {cuisine}.
+    # - Input: dictionary with keys matching input_variables
+    # - Output: clean text generated by the LLM
+    restaurant_name = get_name_generation_chain().invoke({"cuisine": "Mexican"})
+
+    # ---------------------------------------------------------------------
+    # Step 6: Display the Result
+    # ---------------------------------------------------------------------
+    # Prints the generated restaurant name
+    print(f"Suggested Restaurant Name for Mexican Cuisine: {restaurant_name}")
\ No newline at end of file
@@ -9,6 +9,21 @@ Workflow:
 1. Extracts technical specifications (CPU, RAM, Storage) from unstructured text.  
 2. Transforms the extracted specifications into a structured JSON object.  
 
+Extraction modes (`build_chain(mode)`), for bulk catalog runs:
+- "two_step"    : the prompt chain above, 2 LLM calls per document (returns the JSON text).
+- "single_call" : one call that returns the validated JSON directly (`LaptopSpecs`).
+                  Chat models use native structured output; plain LLMs get the
+                  schema in the prompt and the answer is validated with Pydantic.
+- "fast_path"   : local regexes parse common phrasings ("16GB of RAM",
+                  "1TB NVMe SSD") with no LLM call. Only documents with unparsed
+                  fields go to the single call, and the regex values win.
+
+Streaming (`build_streaming_chain()`), for long documents:
+- `IncrementalJsonParser` yields each top-level JSON field as soon as its value
+  is complete, instead of waiting for the whole answer.
+- The transform stage starts as soon as the streamed extraction text mentions
+  CPU, RAM and storage, without waiting for the rest of the answer.
+
 Requirements:
 - Python 3.9+
 - Install the following packages:
@@ -32,21 +47,33 @@ Educational Notes:
 - **Prompt chaining** is used here to break down a complex task 
   (extracting + structuring specifications) into smaller steps.  
 - This improves reliability, modularity, and easier debugging.
+- `build_full_chain(llm)` accepts any LLM (e.g. a fake one in benchmarks).
 """
 
+import json
 import os
+import re
+from functools import lru_cache
+from typing import Iterator
 from langchain_google_genai import GoogleGenerativeAI
-from langchain_core.output_parsers import StrOutputParser
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnableGenerator, RunnableLambda
+from langchain_core.runnables.utils import AddableDict
+from pydantic import BaseModel, Field
 
 
 # -----------------------------------------------------------------------------
-# Step 1: Initialize the LLM (Google Gemini)
+# Step 1: Initialize the LLM (Google Gemini) on first use
 # -----------------------------------------------------------------------------
-llm_model = GoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=os.getenv("Gemini_APIKEY")  # Make sure your environment variable is set
-)
+@lru_cache(maxsize=None)
+def get_llm_model() -> GoogleGenerativeAI:
+    return GoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        api_key=os.getenv("Gemini_APIKEY")  # Make sure your environment variable is set
+    )
 
 
 # -----------------------------------------------------------------------------
@@ -72,20 +99,323 @@ prompt_transform = ChatPromptTemplate.from_template(
 )
 
 
+# Single-call mode - Extraction and formatting in one prompt, validated against a schema
+class LaptopSpecs(BaseModel):
+    """
+    The structured output of every mode.
+    """
+    CPU: str = Field(description="Processor (clock speed, cores, model), or 'unknown' if not mentioned")
+    RAM: str = Field(description="Memory size, or 'unknown' if not mentioned")
+    storage: str = Field(description="Storage size and type, or 'unknown' if not mentioned")
+
+
+specs_parser = PydanticOutputParser(pydantic_object=LaptopSpecs)
+
+prompt_single_call = ChatPromptTemplate.from_template(
+    """
+    Extract the technical specifications from the following text as a JSON
+    object with 'CPU', 'RAM', and 'storage' as keys.
+
+    {format_instructions}
+
+    Text: {text}
+    """
+).partial(format_instructions=specs_parser.get_format_instructions())
+
+
 # -----------------------------------------------------------------------------
 # Step 3: Build the chains using LCEL (LangChain Expression Language)
 # -----------------------------------------------------------------------------
 
-# Chain 1: Extract specs → LLM → plain text output
-extraction_chain = prompt_extract | llm_model | StrOutputParser()
+def build_extraction_chain(llm=None):
+    """
+    Chain 1: Extract specs → LLM → plain text output.
+
+    Args:
+        llm: LLM to use (default: the shared `get_llm_model()` instance).
+    """
+    llm = llm if llm is not None else get_llm_model()
+    return prompt_extract | llm | StrOutputParser()
+
+
+def build_full_chain(llm=None):
+    """
+    Chain 2: Transform extracted specs → JSON → LLM → plain text output.
+
+    Args:
+        llm: LLM to use for both steps (default: the shared `get_llm_model()` instance).
+    """
+    llm = llm if llm is not None else get_llm_model()
+    return (
+        {"specifications": build_extraction_chain(llm)}
+        | prompt_transform
+        | llm
+        | StrOutputParser()
+    )
+
+
+def build_single_call_chain(llm=None):
+    """
+    One LLM call: text → validated specs dict (CPU / RAM / storage).
+
+    Args:
+        llm: LLM to use (default: the shared `get_llm_model()` instance).
+    """
+    llm = llm if llm is not None else get_llm_model()
+    if isinstance(llm, BaseChatModel):
+        structured = prompt_single_call | llm.with_structured_output(LaptopSpecs)
+    else:
+        structured = prompt_single_call | llm | specs_parser
+    return structured | RunnableLambda(lambda specs: specs.model_dump())
+
+
+# -----------------------------------------------------------------------------
+# Fast path: deterministic regexes for common spec phrasings
+# -----------------------------------------------------------------------------
+_SIZE = r"\d+(?:\.\d+)?\s*[GT]B"
+SPEC_PATTERNS = {
+    "CPU": [
+        re.compile(r"(\d+(?:\.\d+)?\s*GHz\b[^,;\n]*?(?:processor|CPU))", re.I),  # 3.5 GHz octa-core processor
+        re.compile(r"\b((?:\d+|dual|quad|hexa|octa)-core\s+(?:processor|CPU))", re.I),  # quad-core processor
+        re.compile(r"\b(Intel Core (?:Ultra )?[3579i][-\w]*|AMD Ryzen \d+ \w+)"),  # Intel Core i7-1360P
+    ],
+    "RAM": [
+        re.compile(rf"({_SIZE})(?:\s+of)?(?:\s+(?:LP)?DDR\d\w*)?(?:\s+unified)?\s+(?:RAM|memory)\b",
+                   re.I),  # 16GB of RAM, 8GB unified memory
+        re.compile(rf"\b(?:RAM|memory)\s*[:=]\s*({_SIZE})", re.I),  # RAM: 16GB
+    ],
+    "storage": [
+        re.compile(rf"({_SIZE}\s+(?:(?:NVMe|PCIe|M\.2)\s+)*(?:SSD|HDD|eMMC))", re.I),  # 1TB NVMe SSD
+        re.compile(rf"\b(?:storage|SSD)\s*[:=]\s*({_SIZE}(?:\s+(?:NVMe\s+)?(?:SSD|HDD))?)", re.I),  # storage: 512GB
+    ],
+}
+
+
+def extract_specs_locally(text: str) -> dict:
+    """
+    Parse CPU / RAM / storage with regexes only (no LLM call).
+
+    Every mention of a field is collected. Matches that overlap an earlier one
+    are the same mention ("octa-core processor" inside "3.5 GHz octa-core
+    processor"). If the mentions disagree ("upgradeable to 64GB of RAM, ships
+    with 8GB of RAM"), the field is left to the LLM.
+
+    Args:
+        text (str): Product description.
+
+    Returns:
+        dict: Matched value per key, None for fields no pattern recognised or
+              with conflicting mentions.
+    """
+    specs = {}
+    for key, patterns in SPEC_PATTERNS.items():
+        spans, values = [], {}
+        for pattern in patterns:
+            for match in pattern.finditer(text):
+                if any(match.start() < end and start < match.end() for start, end in spans):
+                    continue
+                spans.append(match.span())
+                value = re.sub(r"(\d)\s+([GT]B)", r"\1\2", match.group(1).strip())
+                values.setdefault(value.casefold(), value)
+        specs[key] = next(iter(values.values())) if len(values) == 1 else None
+    return specs
+
+
+def build_fast_path_chain(llm=None):
+    """
+    Regex fast path; the single-call chain runs only for documents with unparsed fields.
+
+    Args:
+        llm: LLM for the fallback (default: the shared `get_llm_model()` instance).
+    """
+    fallback = build_single_call_chain(llm)
+
+    def extract(inputs: dict) -> dict:
+        local = extract_specs_locally(inputs["text"])
+        if None not in local.values():
+            return local
+        from_llm = fallback.invoke(inputs)
+        return {key: value if value is not None else from_llm[key] for key, value in local.items()}
+
+    return RunnableLambda(extract)
 
-# Chain 2: Transform extracted specs → JSON → LLM → plain text output
-full_chain = (
-    {"specifications": extraction_chain}
-    | prompt_transform
-    | llm_model
-    | StrOutputParser()
-)
+
+EXTRACTION_MODES = {
+    "two_step": build_full_chain,
+    "single_call": build_single_call_chain,
+    "fast_path": build_fast_path_chain,
+}
+
+
+def build_chain(mode: str = "fast_path", llm=None):
+    """
+    Chain for one of the EXTRACTION_MODES; every mode takes {"text": ...}.
+
+    Args:
+        mode (str): "two_step", "single_call" or "fast_path".
+        llm: LLM to use (default: the shared `get_llm_model()` instance).
+    """
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown mode {mode!r}; use one of {', '.join(EXTRACTION_MODES)}")
+    return EXTRACTION_MODES[mode](llm)
+
+
+# -----------------------------------------------------------------------------
+# Streaming: JSON fields as soon as they are complete
+# -----------------------------------------------------------------------------
+class IncrementalJsonParser:
+    """
+    Incremental parser for a JSON object that arrives in chunks.
+
+    `feed()` returns the top-level fields whose values were completed by the
+    chunk. Text before the opening brace (such as a ```json fence) is skipped.
+
+    Example:
+        >>> parser = IncrementalJsonParser()
+        >>> parser.feed('{"CPU": "3.5 GHz octa-core processor", "RA')
+        [('CPU', '3.5 GHz octa-core processor')]
+        >>> parser.feed('M": "16GB"}')
+        [('RAM', '16GB')]
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0  # where the next unparsed field starts
+        self.started = False
+        self.finished = False
+
+    def feed(self, chunk: str) -> list[tuple[str, object]]:
+        self.buffer += chunk
+        return self._parse(final=False)
+
+    def close(self) -> list[tuple[str, object]]:
+        """
+        Fields still pending when the stream ends (e.g. a trailing number).
+        """
+        return self._parse(final=True)
+
+    def _skip(self, position: int, characters: str = " \t\r\n") -> int:
+        while position < len(self.buffer) and self.buffer[position] in characters:
+            position += 1
+        return position
+
+    def _parse(self, final: bool) -> list[tuple[str, object]]:
+        fields = []
+        if not self.started:
+            start = self.buffer.find("{")
+            if start < 0:
+                return fields
+            self.started, self.position = True, start + 1
+
+        while not self.finished:
+            position = self._skip(self.position, " \t\r\n,")
+            if position >= len(self.buffer):
+                break
+            if self.buffer[position] == "}":
+                self.finished = True
+                break
+            if self.buffer[position] != '"':
+                raise OutputParserException(f"Expected a JSON key at: {self.buffer[position:position + 30]!r}")
+            try:
+                key, position = self._decoder.raw_decode(self.buffer, position)
+                position = self._skip(position)
+                if position >= len(self.buffer):
+                    break
+                if self.buffer[position] != ":":
+                    raise OutputParserException(f"Expected ':' after key {key!r}")
+                value, end = self._decoder.raw_decode(self.buffer, self._skip(position + 1))
+            except json.JSONDecodeError:
+                break  # value still incomplete: wait for more text
+            # A number is complete only once a delimiter follows it: "3" may still
+            # become "3.5" or "30", and raw_decode stops at a dangling "3." or "1e"
+            if (isinstance(value, (int, float)) and not isinstance(value, bool) and not final
+                    and (end >= len(self.buffer) or self.buffer[end] not in ",} \t\r\n")):
+                break
+            fields.append((key, value))
+            self.position = end
+        return fields
+
+
+def _json_fields(chunks: Iterator[str]) -> Iterator[AddableDict]:
+    parser = IncrementalJsonParser()
+    for chunk in chunks:
+        for key, value in parser.feed(chunk):
+            yield AddableDict({key: value})
+    for key, value in parser.close():
+        yield AddableDict({key: value})
+
+
+# Runnable stage: streamed JSON text → one {field: value} chunk per completed field.
+# `invoke` returns the merged dict.
+json_field_stream = RunnableGenerator(_json_fields)
+
+
+def mentions_all_specs(partial_text: str) -> bool:
+    """
+    Default start signal for the transform stage: CPU, RAM and storage all seen
+    on complete lines (a line still streaming may hold "1TB" of "1TB NVMe SSD").
+    """
+    return None not in extract_specs_locally(partial_text[:partial_text.rfind("\n") + 1]).values()
+
+
+def build_streaming_chain(llm=None, start_transform=mentions_all_specs):
+    """
+    Two-step chain that streams: JSON fields are yielded as soon as they complete.
+
+    The transform stage starts on the partial extraction text as soon as
+    `start_transform(partial_text)` is true (or when the extraction ends).
+    The rest of the extraction answer is not waited for.
+
+    Args:
+        llm: LLM to use for both steps (default: the shared `get_llm_model()` instance).
+        start_transform: Predicate on the partial extraction text.
+
+    Returns:
+        Runnable: {"text": ...} → stream of {field: value}; `invoke` returns the full dict.
+    """
+    llm = llm if llm is not None else get_llm_model()
+    # No output parser after the LLM here: closing a stream that ends in a parser
+    # makes LangChain read the rest of the LLM stream first.
+    extraction = prompt_extract | llm
+    transform = prompt_transform | llm | StrOutputParser() | json_field_stream
+
+    def pipeline(requests: Iterator[dict]) -> Iterator[AddableDict]:
+        for request in requests:
+            specifications = ""
+            stream = extraction.stream(request)
+            for chunk in stream:
+                specifications += chunk if isinstance(chunk, str) else chunk.content
+                if start_transform(specifications):
+                    stream.close()  # stop reading the rest of the extraction answer
+                    break
+            yield from transform.stream({"specifications": specifications})
+
+    return RunnableGenerator(pipeline)
+
+
+@lru_cache(maxsize=None)
+def get_full_chain():
+    """
+    The full chain on the shared LLM, built once on first use.
+    """
+    return build_full_chain()
+
+
+def __getattr__(name: str):
+    """
+    Keeps `from prompt_chaining import full_chain` working (also `llm_model`, `extraction_chain`).
+    """
+    builders = {
+        "llm_model": get_llm_model,
+        "extraction_chain": lambda: build_extraction_chain(get_llm_model()),
+        "full_chain": get_full_chain,
+    }
+    if name not in builders:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = builders[name]()
+    return value
 
 
 # -----------------------------------------------------------------------------
@@ -97,6 +427,9 @@ if __name__ == "__main__":
         "16GB of RAM, and a 1TB NVMe SSD."
     )
 
-    final_result = full_chain.invoke({"text": input_text})
+    final_result = get_full_chain().invoke({"text": input_text})
+
+    print("\nFinal Structured Output:\n", final_result)
 
-    print("\nFinal Structured Output:\n", final_result)
\ No newline at end of file
+    # The same document without any LLM call
+    print("\nFast path (regex only):\n", extract_specs_locally(input_text))
\ No newline at end of file
@@ -0,0 +1,345 @@
+"""
+Local Router for the Coordinator Agent with LLM Fallback
+========================================================
+
+`routing_pattern.py` spends a full Gemini call on every request only to get
+back one word: 'booker', 'info' or 'unclear'. This script classifies requests
+in-process and only escalates to the LLM router when it is unsure.
+
+How it works:
+-------------
+1. Every request is turned into a feature vector. By default these are hashed
+   word, word-bigram and character n-gram counts: no model download and no
+   API call. Any LangChain `Embeddings` (for example
+   HuggingFaceEmbeddings("sentence-transformers/all-MiniLM-L6-v2")) can be
+   passed instead to use sentence embeddings.
+2. A linear softmax classifier is trained on labeled exemplars per route
+   (ROUTE_EXEMPLARS), in a few milliseconds with NumPy.
+3. `HybridRouter` keeps the local label when the classifier's probability is
+   at least `threshold`. Below it, the request goes to the LLM router chain
+   from routing_pattern.py.
+
+`benchmarks/router_evaluation.py` measures, on held-out requests, the accuracy
+of the local, LLM and hybrid routers and the share of requests that skip the
+remote call.
+
+Requirements:
+-------------
+- Python 3.10+
+- numpy, langchain-core, langchain-google-genai (for the LLM fallback)
+- Gemini_APIKEY environment variable (only when a request is escalated)
+
+Example:
+--------
+>>> router = HybridRouter(get_local_router(), threshold=0.6)
+>>> agent = build_coordinator_agent(router=router.as_runnable())
+>>> agent.invoke({"request": "Book me a flight to London."})
+"Booking Handler processed request: 'Book me a flight to London.' | Result: Simulated booking action"
+>>> router.skip_rate
+1.0
+"""
+
+import re
+import threading
+import zlib
+from functools import lru_cache
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import RunnableLambda
+
+from routing_pattern import build_coordinator_agent, build_router_chain
+
+# ---------------------------------------------------------------------------
+# Labeled exemplars per route
+# ---------------------------------------------------------------------------
+ROUTE_EXEMPLARS = {
+    "booker": [
+        "Book me a flight to London.",
+        "I need a hotel room in Paris for two nights.",
+        "Reserve a table for four at 8pm tonight.",
+        "Can you book a train ticket to Berlin for Friday?",
+        "Please get me a flight from Delhi to Mumbai tomorrow morning.",
+        "Find and book a cheap hotel near the airport.",
+        "I want to reserve a double room at the Hilton.",
+        "Book two economy seats to New York next Monday.",
+        "Make a reservation at an Italian restaurant for Saturday.",
+        "Get me a return ticket to Tokyo in March.",
+        "Schedule a flight to Rome for the 12th.",
+        "Book an Airbnb in Lisbon for the weekend.",
+        "I'd like to book a rental car in Dublin.",
+        "Please reserve a hotel in Chicago from June 3 to June 6.",
+        "Change my flight booking to an earlier departure.",
+        "Cancel my hotel reservation for next week.",
+        "Buy me a bus ticket to Boston.",
+        "Book a business class flight to Singapore.",
+        "Can you arrange a hotel stay in Barcelona?",
+        "Reserve me a seat on the 6pm train to Manchester.",
+        "Book concert tickets for Friday night.",
+        "I need to fly to Sydney on the 20th, please book it.",
+        "Secure a room with a sea view in Nice.",
+        "Book a table for two at a sushi place.",
+        "Get me on the next available flight to Madrid.",
+        "Please book accommodation for my conference in Vienna.",
+        "Reserve a family suite for three nights in Orlando.",
+        "I want tickets for the ferry to Dover.",
+        "Book a one-way flight to Cape Town.",
+        "Find me a hostel bed in Amsterdam and book it.",
+    ],
+    "info": [
+        "What is the capital of Italy?",
+        "Who wrote Pride and Prejudice?",
+        "How tall is Mount Everest?",
+        "When did World War II end?",
+        "What is the population of Canada?",
+        "Explain how photosynthesis works.",
+        "What time zone is Tokyo in?",
+        "Which planet is the largest in the solar system?",
+        "How many kilometers are in a mile?",
+        "What does DNA stand for?",
+        "Who is the CEO of Google?",
+        "Why is the sky blue?",
+        "What is the boiling point of water at sea level?",
+        "Tell me the history of the Roman Empire.",
+        "What currency is used in Japan?",
+        "How does a jet engine work?",
+        "What is the weather usually like in Lisbon in May?",
+        "Where is the Eiffel Tower located?",
+        "What language is spoken in Brazil?",
+        "Describe the plot of Hamlet.",
+        "What are the baggage rules for carry-on luggage?",
+        "How long is a flight from London to New York usually?",
+        "What is the speed of light?",
+        "Who painted the Mona Lisa?",
+        "What is machine learning?",
+        "Give me some facts about the Great Wall of China.",
+        "How do vaccines work?",
+        "What is the tallest building in the world?",
+        "Which countries border Germany?",
+        "What does the term inflation mean?",
+    ],
+    "unclear": [
+        "Hmm.",
+        "Help.",
+        "I don't know.",
+        "Do the thing.",
+        "Can you do that again?",
+        "asdf qwerty",
+        "Something please.",
+        "Whatever works.",
+        "Ok.",
+        "Yes.",
+        "No, the other one.",
+        "Fix it.",
+        "I need something.",
+        "Maybe later.",
+        "You know what I mean.",
+        "Same as last time.",
+        "Thing.",
+        "Go.",
+        "Hello?",
+        "Just handle it.",
+        "Not sure what I want.",
+        "That one.",
+        "Do it like before.",
+        "Uh, the stuff.",
+        "Anything.",
+        "Hi there.",
+        "Surprise me.",
+        "lol",
+        "Whatever you think.",
+        "Can you help?",
+    ],
+}
+
+
+# ---------------------------------------------------------------------------
+# Features
+# ---------------------------------------------------------------------------
+def hashed_features(texts: list[str], dimension: int = 4096) -> np.ndarray:
+    """
+    Hashed word, word-bigram and character 3-gram counts, L2-normalized.
+
+    Args:
+        texts (list[str]): Requests to featurize.
+        dimension (int): Number of hash buckets.
+
+    Returns:
+        np.ndarray: float32 matrix of shape (len(texts), dimension).
+    """
+    matrix = np.zeros((len(texts), dimension), dtype=np.float32)
+    for row, text in enumerate(texts):
+        text = text.lower()
+        words = re.findall(r"\w+", text)
+        padded = f" {text} "
+        features = (
+            [f"w:{word}" for word in words]
+            + [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+            + [f"c:{padded[index:index + 3]}" for index in range(len(padded) - 2)]
+            + [f"n:{min(len(words), 6)}"]  # very short requests are usually unclear
+        )
+        for feature in features:
+            matrix[row, zlib.crc32(feature.encode("utf-8")) % dimension] += 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+# ---------------------------------------------------------------------------
+# Local classifier
+# ---------------------------------------------------------------------------
+class LocalRouter:
+    """
+    Linear softmax classifier over hashed features or sentence embeddings.
+
+    Args:
+        labels (list[str]): Route names, in output order.
+        embeddings (Embeddings | None): Sentence embeddings (default: hashed features).
+        dimension (int): Hash buckets when no embeddings are given.
+    """
+
+    def __init__(self, labels: list[str], embeddings: Embeddings | None = None, dimension: int = 4096):
+        self.labels = labels
+        self.embeddings = embeddings
+        self.dimension = dimension
+        self.weights = None
+        self.bias = None
+
+    def featurize(self, texts: list[str]) -> np.ndarray:
+        if self.embeddings is None:
+            return hashed_features(texts, self.dimension)
+        matrix = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def fit(self, texts: list[str], labels: list[str], epochs: int = 300,
+            learning_rate: float = 2.0, l2: float = 1e-3) -> "LocalRouter":
+        """
+        Train with full-batch gradient descent on the cross-entropy loss.
+
+        Args:
+            texts (list[str]): Training requests.
+            labels (list[str]): Route of each request.
+            epochs (int): Gradient steps.
+            learning_rate (float): Step size.
+            l2 (float): Weight decay; keeps the probabilities from saturating.
+
+        Returns:
+            LocalRouter: self, trained.
+        """
+        features = self.featurize(texts)
+        targets = np.eye(len(self.labels), dtype=np.float32)[[self.labels.index(label) for label in labels]]
+        self.weights = np.zeros((features.shape[1], len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+        for _ in range(epochs):
+            error = (self._probabilities(features) - targets) / len(texts)
+            self.weights -= learning_rate * (features.T @ error + l2 * self.weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+        return self
+
+    @classmethod
+    def from_exemplars(cls, exemplars: dict[str, list[str]] = ROUTE_EXEMPLARS,
+                       embeddings: Embeddings | None = None) -> "LocalRouter":
+        """
+        Train a router on {route: [example requests]}.
+        """
+        texts = [text for examples in exemplars.values() for text in examples]
+        labels = [label for label, examples in exemplars.items() for _ in examples]
+        return cls(list(exemplars), embeddings).fit(texts, labels)
+
+    def _probabilities(self, features: np.ndarray) -> np.ndarray:
+        logits = features @ self.weights + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        exponentials = np.exp(logits)
+        return exponentials / exponentials.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: list[str]) -> list[tuple[str, float]]:
+        """
+        (route, probability) for each request.
+        """
+        probabilities = self._probabilities(self.featurize(texts))
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[index], float(probabilities[row, index])) for row, index in enumerate(best)]
+
+    def route(self, request: str) -> tuple[str, float]:
+        return self.predict([request])[0]
+
+
+@lru_cache(maxsize=None)
+def get_local_router() -> LocalRouter:
+    """
+    The router trained on ROUTE_EXEMPLARS, built once on first use.
+    """
+    return LocalRouter.from_exemplars()
+
+
+# ---------------------------------------------------------------------------
+# Local router with LLM fallback
+# ---------------------------------------------------------------------------
+class HybridRouter:
+    """
+    Local decision when confident, the LLM router chain otherwise.
+
+    Args:
+        local_router (LocalRouter): Trained local classifier.
+        llm: LLM for the fallback router chain (default: routing_pattern's shared LLM).
+        threshold (float): Minimum local probability to skip the LLM call.
+    """
+
+    def __init__(self, local_router: LocalRouter, llm=None, threshold: float = 0.6):
+        self.local_router = local_router
+        self.llm = llm
+        self.threshold = threshold
+        self.local_decisions = 0
+        self.escalations = 0
+        self._llm_router = None
+        self._lock = threading.Lock()
+
+    def decide(self, inputs: dict) -> str:
+        """
+        Route one {"request": ...} to 'booker', 'info' or 'unclear'.
+        """
+        label, confidence = self.local_router.route(inputs["request"])
+        if confidence >= self.threshold:
+            with self._lock:
+                self.local_decisions += 1
+            return label
+        with self._lock:
+            self.escalations += 1
+            if self._llm_router is None:
+                self._llm_router = build_router_chain(self.llm)
+        return self._llm_router.invoke(inputs).strip()
+
+    @property
+    def skip_rate(self) -> float:
+        """
+        Share of requests decided without the LLM.
+        """
+        total = self.local_decisions + self.escalations
+        return self.local_decisions / total if total else 0.0
+
+    def as_runnable(self) -> RunnableLambda:
+        return RunnableLambda(self.decide, name="HybridRouter")
+
+
+def build_local_coordinator_agent(llm=None, threshold: float = 0.6, local_router: LocalRouter | None = None):
+    """
+    routing_pattern's coordinator agent with the hybrid router in front.
+
+    Args:
+        llm: LLM for escalated requests (default: the shared `get_llm_model()` instance).
+        threshold (float): Minimum local probability to skip the LLM call.
+        local_router (LocalRouter | None): Classifier (default: `get_local_router()`).
+
+    Returns:
+        tuple: (agent runnable, HybridRouter with the skip counters)
+    """
+    router = HybridRouter(local_router or get_local_router(), llm, threshold)
+    return build_coordinator_agent(llm, router=router.as_runnable()), router
+
+
+if __name__ == "__main__":
+    router = get_local_router()
+    for request in ["Book me a flight to London.", "What is the capital of Italy?",
+                    "Tell me about quantum physics.", "Do the thing."]:
+        label, confidence = router.route(request)
+        print(f"{request:35} → {label:8} (p={confidence:.2f})")
@@ -0,0 +1,308 @@
+"""
+Micro-Batching Router for High-QPS Classification
+=================================================
+
+Under load, `coordinator_router_chain` in `routing_pattern.py` sends one
+classification prompt per request, although the system prompt is the same
+every time. This router packs concurrent requests into one call:
+
+1. Callers (any number of threads) submit a request and get a Future.
+2. A dispatcher thread collects requests for up to `max_wait_ms` after the
+   first one arrives, or until `max_batch` requests are waiting. When all
+   `max_in_flight` calls are busy, the batch keeps filling until a call
+   finishes, so batches grow with the load instead of queueing up.
+3. The batch is sent as ONE numbered prompt; the model answers
+   "<number>. <decision>" per line. A batch of one uses the normal router prompt.
+4. Every line is parsed back to the Future of the caller that sent it.
+   Requests whose line is missing, repeated or not a valid decision (or
+   whose whole batch failed) are re-sent on their own with the normal router
+   chain, all at the same time, so one bad batch costs one extra call latency.
+
+The price is the queueing delay: at most `max_wait_ms` plus, under heavy
+load, the time until one of the `max_in_flight` packed calls finishes.
+`stats.summary()` reports the routing calls per request and the queueing delay.
+`benchmarks/micro_batch_router_benchmark.py` measures both under load.
+
+Requirements:
+-------------
+- Python 3.10+
+- langchain-core, langchain-google-genai
+- Gemini_APIKEY environment variable
+
+Example:
+--------
+>>> with MicroBatchRouter(max_wait_ms=10, max_batch=16) as router:
+...     agent = build_coordinator_agent(router=router.as_runnable())
+...     with ThreadPoolExecutor(64) as pool:
+...         results = list(pool.map(lambda r: agent.invoke({"request": r}), requests))
+...     print(router.stats.summary())
+{'requests': 1000, 'llm_calls': 71, 'calls_per_request': 0.071, ...}
+"""
+
+import queue
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from routing_pattern import build_coordinator_agent, build_router_chain, get_llm_model, output_parser
+
+DECISIONS = ("booker", "info", "unclear")
+
+# ---------------------------------------------------------------------------
+# Packed router prompt
+# ---------------------------------------------------------------------------
+packed_router_prompt = ChatPromptTemplate.from_messages([
+    (
+        "system",
+        """Analyze each numbered user request and determine which specialist handler should process it.
+        - If the request is related to booking flights or hotels, the decision is 'booker'.
+        - For all other general information questions, the decision is 'info'.
+        - If the request is unclear or doesn't fit either category, the decision is 'unclear'.
+        Reply with exactly {count} lines in the form "<number>. <decision>", one per request,
+        where every decision is ONLY one word: 'booker', 'info', or 'unclear'."""
+    ),
+    ("user", "{requests}")
+])
+
+DECISION_LINE = re.compile(rf"^\s*(\d+)\s*[.):]\s*['\"]?({'|'.join(DECISIONS)})\b", re.I)
+
+
+def build_packed_router_chain(llm=None):
+    """
+    Packed Router Chain = Packed Prompt → LLM → Output Parser
+    """
+    llm = llm if llm is not None else get_llm_model()
+    return packed_router_prompt | llm | output_parser
+
+
+def pack(requests: list[str]) -> str:
+    """
+    Number the requests one per line (inner newlines become spaces).
+    """
+    return "\n".join(f"{number}. {' '.join(request.split())}" for number, request in enumerate(requests, 1))
+
+
+def unpack(response: str, count: int) -> dict[int, str]:
+    """
+    Split a numbered response into {index: decision} (0-based).
+
+    Lines without a valid decision, numbers outside 1..count and numbers that
+    appear more than once are dropped, so those requests fall back.
+    """
+    found, repeated = {}, set()
+    for line in response.splitlines():
+        match = DECISION_LINE.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        if 0 <= index < count:
+            if index in found:
+                repeated.add(index)
+            found[index] = match.group(2).lower()
+    return {index: decision for index, decision in found.items() if index not in repeated}
+
+
+# ---------------------------------------------------------------------------
+# Accounting
+# ---------------------------------------------------------------------------
+@dataclass
+class MicroBatchStats:
+    """
+    Calls and queueing delay of a MicroBatchRouter.
+    """
+    requests: int = 0
+    packed_calls: int = 0
+    single_calls: int = 0
+    fallback_calls: int = 0
+    batch_sizes: list = field(default_factory=list)
+    queue_delays: list = field(default_factory=list)  # seconds from submit to dispatch
+
+    @property
+    def llm_calls(self) -> int:
+        return self.packed_calls + self.single_calls + self.fallback_calls
+
+    def summary(self) -> dict:
+        delays = sorted(self.queue_delays) or [0.0]
+        return {
+            "requests": self.requests,
+            "llm_calls": self.llm_calls,
+            "calls_per_request": self.llm_calls / self.requests if self.requests else 0.0,
+            "mean_batch_size": statistics.fmean(self.batch_sizes) if self.batch_sizes else 0.0,
+            "fallback_calls": self.fallback_calls,
+            "queue_delay_p50_ms": 1000 * delays[len(delays) // 2],
+            "queue_delay_p95_ms": 1000 * delays[min(int(len(delays) * 0.95), len(delays) - 1)],
+        }
+
+
+# ---------------------------------------------------------------------------
+# Micro-batching router
+# ---------------------------------------------------------------------------
+class MicroBatchRouter:
+    """
+    Collects concurrent routing requests into packed LLM calls.
+
+    Args:
+        llm: LLM for the router chains (default: routing_pattern's shared LLM).
+        max_wait_ms (float): How long a batch stays open after its first request.
+        max_batch (int): Requests per packed call.
+        max_in_flight (int): Packed calls running at the same time.
+    """
+
+    def __init__(self, llm=None, max_wait_ms: float = 10.0, max_batch: int = 16, max_in_flight: int = 8):
+        self.llm = llm
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self.stats = MicroBatchStats()
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._dispatcher = None
+        self._pool = None
+        self._fallback_pool = None
+        self._packed_chain = None
+        self._single_chain = None
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._dispatcher is not None:
+                return
+            self._packed_chain = build_packed_router_chain(self.llm)
+            self._single_chain = build_router_chain(self.llm)
+            self._pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="router-batch")
+            # Enough threads to re-send every request of every in-flight batch at once
+            self._fallback_pool = ThreadPoolExecutor(max_workers=self.max_in_flight * self.max_batch,
+                                                     thread_name_prefix="router-fallback")
+            self._dispatcher = threading.Thread(target=self._dispatch, name="router-dispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def submit(self, request: str) -> Future:
+        """
+        Queue one request; the Future resolves to 'booker', 'info' or 'unclear'.
+        """
+        if self._dispatcher is None:
+            self._start()
+        future = Future()
+        self._queue.put((request, future, time.perf_counter()))
+        return future
+
+    def route(self, request: str) -> str:
+        return self.submit(request).result()
+
+    def as_runnable(self) -> RunnableLambda:
+        """
+        Drop-in router for `build_coordinator_agent(router=...)`.
+        """
+        return RunnableLambda(lambda inputs: self.route(inputs["request"]), name="MicroBatchRouter")
+
+    def _dispatch(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, deadline = [first], time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            # All workers busy: keep filling this batch instead of queueing another one
+            self._slots.acquire()
+            while len(batch) < self.max_batch and not stopping:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+            self._pool.submit(self._classify, batch)
+
+    def _classify(self, batch: list[tuple]) -> None:
+        try:
+            self._classify_batch(batch)
+        finally:
+            self._slots.release()
+
+    def _classify_batch(self, batch: list[tuple]) -> None:
+        dispatched = time.perf_counter()
+        requests = [request for request, _, _ in batch]
+        with self._lock:
+            self.stats.requests += len(batch)
+            self.stats.batch_sizes.append(len(batch))
+            self.stats.queue_delays.extend(dispatched - submitted for _, _, submitted in batch)
+            if len(batch) == 1:
+                self.stats.single_calls += 1
+            else:
+                self.stats.packed_calls += 1
+
+        if len(batch) == 1:
+            self._resolve(batch[0][1], requests[0])
+            return
+
+        try:
+            decisions = unpack(self._packed_chain.invoke({"count": len(batch), "requests": pack(requests)}), len(batch))
+        except Exception:
+            decisions = {}  # the whole batch falls back
+        fallbacks = []
+        for index, (request, future, _) in enumerate(batch):
+            if index in decisions:
+                future.set_result(decisions[index])
+                continue
+            with self._lock:
+                self.stats.fallback_calls += 1
+            fallbacks.append(self._fallback_pool.submit(self._resolve, future, request))
+        # Hold the in-flight slot until the fallbacks finish, so they count against max_in_flight
+        wait(fallbacks)
+
+    def _resolve(self, future: Future, request: str) -> None:
+        """
+        Route one request with the normal router chain and settle its Future.
+        """
+        try:
+            future.set_result(self._single_chain.invoke({"request": request}).strip())
+        except Exception as exc:
+            future.set_exception(exc)
+
+    def close(self) -> None:
+        """
+        Finish the queued requests and stop the dispatcher.
+        """
+        if self._dispatcher is None:
+            return
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
+        self._fallback_pool.shutdown(wait=True)
+        self._dispatcher = None
+
+    def __enter__(self) -> "MicroBatchRouter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    requests = ["Book me a flight to London.", "What is the capital of Italy?", "Tell me about quantum physics."] * 4
+    with MicroBatchRouter(max_wait_ms=20) as router:
+        agent = build_coordinator_agent(router=router.as_runnable())
+        with ThreadPoolExecutor(len(requests)) as pool:
+            for request, result in zip(requests, pool.map(lambda r: agent.invoke({"request": r}), requests)):
+                print(f"{request:32} → {result}")
+    print(router.stats.summary())
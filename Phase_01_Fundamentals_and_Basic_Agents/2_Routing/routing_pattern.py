@@ -40,9 +40,16 @@ Example Outputs:
     Final Result B: Info Handler processed request: 'What is the capital of Italy?' | Result: Simulated Information retrieval
 - Unclear request:
     Final Result C: Handler could not delegate request: 'Tell me about quantum physics.'. Please clarify.
+
+`local_router.py` classifies most requests in-process and only asks this LLM
+router when it is unsure.
+
+Other modules reuse the agent through `build_coordinator_agent(llm)` or the
+shared `get_coordinator_agent()`.
 """
 
 import os
+from functools import lru_cache
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_google_genai import GoogleGenerativeAI
@@ -50,12 +57,14 @@ from langchain_core.runnables import RunnablePassthrough, RunnableBranch
 
 
 # ---------------------------------------------------------------------------
-# Step 1: Configure the LLM
+# Step 1: Configure the LLM (built on first use)
 # ---------------------------------------------------------------------------
-llm_model = GoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=os.getenv("Gemini_APIKEY")
-)
+@lru_cache(maxsize=None)
+def get_llm_model() -> GoogleGenerativeAI:
+    return GoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        api_key=os.getenv("Gemini_APIKEY")
+    )
 
 # Output parser ensures LLM response is a clean string
 output_parser = StrOutputParser()
@@ -123,8 +132,16 @@ coordinator_router_prompt = ChatPromptTemplate.from_messages([
     ("user", "{request}")
 ])
 
-# Router Chain = Prompt → LLM → Output Parser
-coordinator_router_chain = coordinator_router_prompt | llm_model | output_parser
+
+def build_router_chain(llm=None):
+    """
+    Router Chain = Prompt → LLM → Output Parser
+
+    Args:
+        llm: LLM that classifies the request (default: the shared `get_llm_model()` instance).
+    """
+    llm = llm if llm is not None else get_llm_model()
+    return coordinator_router_prompt | llm | output_parser
 
 
 # ---------------------------------------------------------------------------
@@ -153,18 +170,49 @@ delegation_branch = RunnableBranch(
 # ---------------------------------------------------------------------------
 # Step 5: Assemble the Coordinator Agent
 # ---------------------------------------------------------------------------
-# The coordinator agent passes both:
-# - The router decision
-# - The original request
-# Then routes to the proper handler
-coordinator_agent = (
-    {
-        "decision": coordinator_router_chain,
-        "request": RunnablePassthrough()
+def build_coordinator_agent(llm=None, router=None):
+    """
+    The coordinator agent passes both:
+    - The router decision
+    - The original request
+    Then routes to the proper handler.
+
+    Args:
+        llm: LLM used by the router (default: the shared `get_llm_model()` instance).
+        router: Runnable {"request": ...} → 'booker' / 'info' / 'unclear' to use
+            instead of the LLM router chain (e.g. the local router in local_router.py).
+    """
+    return (
+        {
+            "decision": router if router is not None else build_router_chain(llm),
+            "request": RunnablePassthrough()
+        }
+        | delegation_branch
+        | (lambda x: x["output"])  # Extract the handler's final output
+    )
+
+
+@lru_cache(maxsize=None)
+def get_coordinator_agent():
+    """
+    The coordinator agent on the shared LLM, built once on first use.
+    """
+    return build_coordinator_agent()
+
+
+def __getattr__(name: str):
+    """
+    `coordinator_agent` and friends used to be module globals; build them when first read.
+    """
+    builders = {
+        "llm_model": get_llm_model,
+        "coordinator_router_chain": lambda: build_router_chain(get_llm_model()),
+        "coordinator_agent": get_coordinator_agent,
     }
-    | delegation_branch
-    | (lambda x: x["output"])  # Extract the handler's final output
-)
+    if name not in builders:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = builders[name]()
+    return value
 
 
 # ---------------------------------------------------------------------------
@@ -177,10 +225,12 @@ def main():
     - An information request
     - An unclear request
     """
-    if not llm_model:
+    if not get_llm_model():
         print("\nSkipping execution due to LLM initialization failure.")
         return
 
+    coordinator_agent = get_coordinator_agent()
+
     print("--- Running with a booking request ---")
     request_a = "Book me a flight to London."
     result_a = coordinator_agent.invoke({"request": request_a})
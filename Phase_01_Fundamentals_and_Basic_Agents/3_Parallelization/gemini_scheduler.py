@@ -0,0 +1,403 @@
+"""
+Process-Wide Rate-Limit-Aware Scheduler for Gemini Calls
+========================================================
+
+`RunnableParallel` fires every branch at once. With several fan-outs running
+(`full_parallel_chain`, the language guide, the 4.1 research agent) the
+provider quota is exceeded, calls fail with 429, and every client retries
+after the same delay, in lockstep. This module puts ONE scheduler in front
+of the Gemini calls of those fan-outs:
+
+1. Requests/min and tokens/min are counted over a sliding one-minute window,
+   the way the provider counts its quota. A call starts only when neither
+   window would go over its limit. A whole minute of quota can be spent at
+   once, so all branches of a fan-out start together, but no 60 s window
+   ever holds more than the quota. Tokens are estimated before the call and
+   corrected with the real size afterwards.
+2. Priority classes: "interactive" calls always go before "batch" calls
+   that are still waiting.
+3. AIMD concurrency limit: +1/limit after every success (about +1 per
+   round), halved on a 429 (at most once per `cooldown` seconds). A 429 also
+   pauses all dispatching for its retry-after delay, so the retries are
+   spread out instead of hitting the quota again together.
+4. `metrics()` reports the queue depth per priority, the in-flight count,
+   the current limit, throttles and the wait-time percentiles.
+
+The scheduler state lives on its own event loop in a daemon thread. Sync
+callers (the threads of `RunnableParallel`) and async callers (`ainvoke`,
+`abatch`) both queue on it. `ScheduledLLM` wraps any LangChain LLM so that
+chains do not change: `scheduled(GoogleGenerativeAI(...), priority="batch")`.
+
+The wrapped Gemini client is created with `max_retries=1`. The scheduler
+retries throttled calls itself (`ScheduledLLM.max_retries`), so the client's
+own retries cannot bypass the limits.
+
+Only the three fan-out builders use it: `parallelization _example.get_llm_model`,
+`programming_language_guide_parallel.build_llm_model` and
+`4.1_mini_project/solution.build_llm_model`. The other pattern scripts make one
+call at a time and keep a plain client. Wrap theirs with `scheduled()` to
+share the quota when they run in the same process.
+
+Requirements:
+-------------
+- Python 3.10+
+- langchain-core
+
+Environment Variables:
+----------------------
+- GEMINI_RPM: requests per minute for the process (default 10, the free tier of gemini-2.5-flash)
+- GEMINI_TPM: tokens per minute for the process (default 250000)
+
+Example:
+--------
+>>> llm = scheduled(GoogleGenerativeAI(model="gemini-2.5-flash", max_retries=1), priority="batch")
+>>> build_full_parallel_chain(llm).invoke({"topic": "Quantum Computing"})
+>>> get_scheduler().metrics()
+{'queue_depth': {'interactive': 0, 'batch': 0}, 'in_flight': 0, 'concurrency_limit': 4.9, ...}
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.llms import LLM
+
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+
+def approximate_token_count(text: str) -> int:
+    """
+    Rough token estimate (~4 characters per token for English text).
+    """
+    return max(1, len(text) // 4)
+
+
+def throttle_info(error: Exception) -> tuple[bool, Optional[float]]:
+    """
+    (is this a 429 / quota error?, suggested retry-after seconds or None)
+    """
+    throttled = (
+        type(error).__name__ in ("ResourceExhausted", "RateLimitError", "TooManyRequests")
+        or getattr(error, "code", None) == 429
+        or "429" in str(error)
+    )
+    return throttled, getattr(error, "retry_after", None)
+
+
+# ---------------------------
+# Quota window
+# ---------------------------
+class QuotaWindow:
+    """
+    Amount spent during the last `window_seconds`, checked against a limit.
+
+    Args:
+        limit (float | None): Quota per window (None: unlimited).
+        window_seconds (float): Window length (60 for a per-minute quota).
+    """
+
+    def __init__(self, limit: Optional[float], window_seconds: float = 60.0):
+        self.limit = limit if limit else math.inf
+        self.window_seconds = window_seconds
+        self.used = 0.0
+        self._entries: deque = deque()  # [start time, amount, still in the window]
+
+    def expire(self, now: float) -> None:
+        while self._entries and now - self._entries[0][0] >= self.window_seconds:
+            entry = self._entries.popleft()
+            self.used -= entry[1]
+            entry[2] = False
+
+    def seconds_until(self, amount: float, now: float) -> float:
+        """
+        Wait until `amount` fits in the window (amounts above the limit count as the limit).
+        """
+        excess = self.used + min(amount, self.limit) - self.limit
+        for start, spent, _ in self._entries:
+            if excess <= 0:
+                break
+            excess -= spent
+            if excess <= 0:
+                return start + self.window_seconds - now
+        return 0.0
+
+    def take(self, amount: float, now: float) -> Optional[list]:
+        """
+        Record `amount` at `now`; returns the entry, for `correct`.
+        """
+        if self.limit == math.inf:
+            return None
+        entry = [now, min(amount, self.limit), True]
+        self._entries.append(entry)
+        self.used += entry[1]
+        return entry
+
+    def correct(self, entry: Optional[list], amount: float) -> None:
+        """
+        Replace the amount of an entry that is still in the window.
+        """
+        if entry is not None and entry[2]:
+            self.used += amount - entry[1]
+            entry[1] = amount
+
+
+@dataclass
+class Admission:
+    """
+    An admitted call: how long it waited and what it was charged.
+    """
+    waited_s: float
+    tokens: int
+    token_entry: Optional[list] = None
+
+
+# ---------------------------
+# Scheduler
+# ---------------------------
+class GeminiScheduler:
+    """
+    Admission control for LLM calls: quota windows, priorities and AIMD concurrency.
+
+    Args:
+        requests_per_minute (float | None): Request quota (None: unlimited).
+        tokens_per_minute (float | None): Token quota (None: unlimited).
+        initial_concurrency (int): Starting concurrency limit.
+        min_concurrency (int): Lower bound of the AIMD limit.
+        max_concurrency (int): Upper bound of the AIMD limit.
+        window_seconds (float): Quota window (60; shorten it only to simulate a
+                                quota in compressed time).
+        decrease_factor (float): Multiplier applied to the limit on a 429.
+        cooldown (float): Minimum seconds between two decreases.
+        default_retry_after (float): Pause after a 429 without a retry-after hint.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = 10, tokens_per_minute: Optional[float] = 250_000,
+                 initial_concurrency: int = 4, min_concurrency: int = 1, max_concurrency: int = 32,
+                 window_seconds: float = 60.0, decrease_factor: float = 0.5, cooldown: float = 2.0,
+                 default_retry_after: float = 1.0):
+        self.requests = QuotaWindow(requests_per_minute, window_seconds)
+        self.tokens = QuotaWindow(tokens_per_minute, window_seconds)
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.default_retry_after = default_retry_after
+
+        self.in_flight = 0
+        self.completed = 0
+        self.throttled = 0
+        self._heap: list = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._last_decrease = -math.inf
+        self._wake = None
+        self._waits = {name: deque(maxlen=10_000) for name in PRIORITIES}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock = threading.Lock()
+
+    # -- event loop thread ----------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="gemini-scheduler", daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    def _pump(self) -> None:
+        """
+        Admit waiting calls in priority order while the limits allow.
+        """
+        if self._wake is not None:
+            self._wake.cancel()
+            self._wake = None
+        now = time.monotonic()
+        self.requests.expire(now)
+        self.tokens.expire(now)
+        while self._heap and self.in_flight < max(int(self.limit), self.min_concurrency):
+            _, _, priority, tokens, enqueued, future = self._heap[0]
+            if future.done():  # caller gave up
+                heapq.heappop(self._heap)
+                continue
+            delay = max(self._paused_until - now, self.requests.seconds_until(1, now),
+                        self.tokens.seconds_until(tokens, now))
+            if delay > 0:
+                self._wake = self._loop.call_later(delay, self._pump)
+                return
+            heapq.heappop(self._heap)
+            self.requests.take(1, now)
+            entry = self.tokens.take(tokens, now)
+            self.in_flight += 1
+            self._waits[priority].append(now - enqueued)
+            future.set_result(Admission(now - enqueued, tokens, entry))
+
+    def _release(self, admission: Admission, actual: int, throttled: bool, retry_after: Optional[float]) -> None:
+        self.in_flight -= 1
+        self.tokens.correct(admission.token_entry, actual)  # replace the estimate with the real size
+        now = time.monotonic()
+        if throttled:
+            self.throttled += 1
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+                self._last_decrease = now
+            self._paused_until = max(self._paused_until, now + (retry_after or self.default_retry_after))
+        else:
+            self.completed += 1
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        self._pump()
+
+    async def _acquire(self, priority: str, tokens: int) -> Admission:
+        future = self._loop.create_future()
+        heapq.heappush(self._heap, (PRIORITIES[priority], next(self._sequence), priority, tokens, time.monotonic(), future))
+        self._pump()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():  # admitted, but the caller is gone
+                self._release(future.result(), 0, False, None)
+            raise
+
+    # -- public API (any thread or event loop) ----------------------------------
+    def acquire(self, priority: str = "interactive", tokens: int = 1) -> Admission:
+        """
+        Block until the call may start; pass the returned Admission to `release`.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}; use one of {', '.join(PRIORITIES)}")
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._acquire(priority, tokens), loop).result()
+
+    async def aacquire(self, priority: str = "interactive", tokens: int = 1) -> Admission:
+        """
+        Async version of `acquire` (usable from any event loop).
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}; use one of {', '.join(PRIORITIES)}")
+        loop = self._ensure_loop()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._acquire(priority, tokens), loop))
+
+    def release(self, admission: Admission, actual: int, throttled: bool = False,
+                retry_after: Optional[float] = None) -> None:
+        """
+        Report the end of an admitted call (with its real token count).
+        """
+        self._ensure_loop().call_soon_threadsafe(self._release, admission, actual, throttled, retry_after)
+
+    def metrics(self) -> dict:
+        """
+        Queue depth, in-flight calls, concurrency limit, throttles and waits per priority.
+        """
+        waiting = [entry for entry in list(self._heap) if not entry[5].done()]
+        metrics = {
+            "queue_depth": {name: sum(entry[2] == name for entry in waiting) for name in PRIORITIES},
+            "in_flight": self.in_flight,
+            "concurrency_limit": round(self.limit, 2),
+            "completed": self.completed,
+            "throttled": self.throttled,
+        }
+        for name, waits in self._waits.items():
+            ordered = sorted(waits)
+            metrics[f"{name}_wait_p50_s"] = statistics.median(ordered) if ordered else 0.0
+            metrics[f"{name}_wait_p95_s"] = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] if ordered else 0.0
+        return metrics
+
+
+@lru_cache(maxsize=None)
+def get_scheduler() -> GeminiScheduler:
+    """
+    The process-wide scheduler (limits from GEMINI_RPM / GEMINI_TPM).
+    """
+    return GeminiScheduler(
+        requests_per_minute=float(os.getenv("GEMINI_RPM", "10")),
+        tokens_per_minute=float(os.getenv("GEMINI_TPM", "250000")),
+    )
+
+
+# ---------------------------
+# LLM wrapper
+# ---------------------------
+class ScheduledLLM(LLM):
+    """
+    LLM wrapper whose every call is admitted by a GeminiScheduler.
+
+    Attributes:
+        llm: The wrapped LLM (e.g. GoogleGenerativeAI with max_retries=1).
+        scheduler: Scheduler to go through (default: `get_scheduler()`).
+        priority (str): "interactive" or "batch".
+        expected_output_tokens (int): Output size assumed before the call.
+        max_retries (int): Retries of throttled calls, each through the scheduler again.
+    """
+
+    llm: Any
+    scheduler: Any = None
+    priority: str = "interactive"
+    expected_output_tokens: int = 256
+    max_retries: int = 3
+
+    @property
+    def _llm_type(self) -> str:
+        return f"scheduled-{self.llm._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {**self.llm._identifying_params, "priority": self.priority}
+
+    def _get_scheduler(self) -> GeminiScheduler:
+        return self.scheduler if self.scheduler is not None else get_scheduler()
+
+    def _call(self, prompt: str, stop: Optional[list[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        scheduler = self._get_scheduler()
+        estimated = approximate_token_count(prompt) + self.expected_output_tokens
+        for attempt in range(self.max_retries + 1):
+            admission = scheduler.acquire(self.priority, estimated)
+            try:
+                text = self.llm.invoke(prompt, stop=stop, **kwargs)
+            except Exception as error:
+                throttled, retry_after = throttle_info(error)
+                scheduler.release(admission, estimated, throttled, retry_after)
+                if not throttled or attempt == self.max_retries:
+                    raise
+                continue
+            scheduler.release(admission, approximate_token_count(prompt) + approximate_token_count(text))
+            return text
+
+    async def _acall(self, prompt: str, stop: Optional[list[str]] = None,
+                     run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        scheduler = self._get_scheduler()
+        estimated = approximate_token_count(prompt) + self.expected_output_tokens
+        for attempt in range(self.max_retries + 1):
+            admission = await scheduler.aacquire(self.priority, estimated)
+            try:
+                text = await self.llm.ainvoke(prompt, stop=stop, **kwargs)
+            except asyncio.CancelledError:  # e.g. a discarded speculative branch: free the slot
+                scheduler.release(admission, estimated)
+                raise
+            except Exception as error:
+                throttled, retry_after = throttle_info(error)
+                scheduler.release(admission, estimated, throttled, retry_after)
+                if not throttled or attempt == self.max_retries:
+                    raise
+                continue
+            scheduler.release(admission, approximate_token_count(prompt) + approximate_token_count(text))
+            return text
+
+
+def scheduled(llm, priority: str = "interactive", scheduler: Optional[GeminiScheduler] = None) -> ScheduledLLM:
+    """
+    Route every call of `llm` through the scheduler (default: the process-wide one).
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r}; use one of {', '.join(PRIORITIES)}")
+    return ScheduledLLM(llm=llm, scheduler=scheduler, priority=priority)
@@ -27,58 +27,81 @@ Expected output:
     A structured, synthesized text that summarizes the topic, 
     highlights key terms, and proposes related questions.
 
+Each chain has a `build_*_chain(llm)` factory; `get_full_parallel_chain()` is the
+shared instance used by `run_parallel`. Every Gemini call goes through the
+process-wide scheduler of `gemini_scheduler.py`
+(quota-aware admission, priorities, adaptive concurrency).
 """
 
 import os
+from functools import lru_cache
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_google_genai import GoogleGenerativeAI
 from langchain_core.runnables import RunnablePassthrough, RunnableParallel
 
+from gemini_scheduler import ScheduledLLM, scheduled
+
 
 # -------------------------------------------------------------------
 # 1. Configure the Large Language Model (LLM)
 # -------------------------------------------------------------------
 # We use Google's Gemini model. The API key must be set as an environment variable.
-llm_model = GoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=os.getenv("Gemini_APIKEY")
-)
+# The model is created on first use, not at import time. The client retries
+# only once itself; the scheduler retries throttled calls, spread out in time.
+@lru_cache(maxsize=None)
+def get_llm_model() -> ScheduledLLM:
+    return scheduled(GoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        api_key=os.getenv("Gemini_APIKEY"),
+        max_retries=1,
+    ))
 
 
 # -------------------------------------------------------------------
 # 2. Define individual chains (independent tasks)
 # -------------------------------------------------------------------
 
-# Chain A: Summarization
-summarize_chain = (
-    ChatPromptTemplate.from_messages([
-        ("system", "Summarize the following topic concisely: "),
-        ("user", "{topic}")
-    ])
-    | llm_model
-    | StrOutputParser()
-)
-
-# Chain B: Question Generation
-questions_chain = (
-    ChatPromptTemplate.from_messages([
-        ("system", "Generate three interesting questions about the following topic: "),
-        ("user", "{topic}")
-    ])
-    | llm_model
-    | StrOutputParser()
-)
-
-# Chain C: Key Term Extraction
-terms_chain = (
-    ChatPromptTemplate.from_messages([
-        ("system", "Identify 5-10 key terms from the following topic, separated by commas: "),
-        ("user", "{topic}")
-    ])
-    | llm_model
-    | StrOutputParser()
-)
+def build_summarize_chain(llm):
+    """
+    Chain A: Summarization
+    """
+    return (
+        ChatPromptTemplate.from_messages([
+            ("system", "Summarize the following topic concisely: "),
+            ("user", "{topic}")
+        ])
+        | llm
+        | StrOutputParser()
+    )
+
+
+def build_questions_chain(llm):
+    """
+    Chain B: Question Generation
+    """
+    return (
+        ChatPromptTemplate.from_messages([
+            ("system", "Generate three interesting questions about the following topic: "),
+            ("user", "{topic}")
+        ])
+        | llm
+        | StrOutputParser()
+    )
+
+
+def build_terms_chain(llm):
+    """
+    Chain C: Key Term Extraction
+    """
+    return (
+        ChatPromptTemplate.from_messages([
+            ("system", "Identify 5-10 key terms from the following topic, separated by commas: "),
+            ("user", "{topic}")
+        ])
+        | llm
+        | StrOutputParser()
+    )
 
 
 # -------------------------------------------------------------------
@@ -101,33 +124,42 @@ Here, we run: summarize_chain, questions_chain, and terms_chain
 all at once, along with a passthrough for the original topic.
 """
 
-map_chain = RunnableParallel(
-    {
-        "summary": summarize_chain,
-        "questions": questions_chain,
-        "key_terms": terms_chain,
-        "topic": RunnablePassthrough(),  # forwards input topic unchanged
-    }
-)
+
+def build_map_chain(llm):
+    """
+    Run the three task chains side by side on the same input.
+    """
+    return RunnableParallel(
+        {
+            "summary": build_summarize_chain(llm),
+            "questions": build_questions_chain(llm),
+            "key_terms": build_terms_chain(llm),
+            "topic": RunnablePassthrough(),  # forwards input topic unchanged
+        }
+    )
 
 
 # -------------------------------------------------------------------
 # 4. Final synthesis step
 # -------------------------------------------------------------------
 # This chain takes the results of map_chain and produces a polished answer.
-synthesis_chain = (
-    ChatPromptTemplate.from_messages([
-        ("system", """Based on the following information: 
-        Summary: {summary}
-        Related Questions: {questions}
-        Key Terms: {key_terms}
-        Synthesize a comprehensive, educational response."""),
+def build_synthesis_chain(llm):
+    """
+    Combine the parallel results into one educational response.
+    """
+    return (
+        ChatPromptTemplate.from_messages([
+            ("system", """Based on the following information: 
+            Summary: {summary}
+            Related Questions: {questions}
+            Key Terms: {key_terms}
+            Synthesize a comprehensive, educational response."""),
 
-        ("user", "Original topic: {topic}")
-    ])
-    | llm_model
-    | StrOutputParser()
-)
+            ("user", "Original topic: {topic}")
+        ])
+        | llm
+        | StrOutputParser()
+    )
 
 
 # -------------------------------------------------------------------
@@ -135,7 +167,42 @@ synthesis_chain = (
 # -------------------------------------------------------------------
 # Execution order:
 #   map_chain (parallel step) → synthesis_chain (final step)
-full_parallel_chain = map_chain | synthesis_chain
+def build_full_parallel_chain(llm=None):
+    """
+    Build the complete map → synthesis pipeline.
+
+    Args:
+        llm: LLM for every step (default: the shared `get_llm_model()` instance).
+    """
+    llm = llm if llm is not None else get_llm_model()
+    return build_map_chain(llm) | build_synthesis_chain(llm)
+
+
+@lru_cache(maxsize=None)
+def get_full_parallel_chain():
+    """
+    The full pipeline on the shared LLM, built once on first use.
+    """
+    return build_full_parallel_chain()
+
+
+def __getattr__(name: str):
+    """
+    Module attributes `llm_model`, `summarize_chain`, ..., `full_parallel_chain`, built on first read.
+    """
+    builders = {
+        "llm_model": get_llm_model,
+        "summarize_chain": lambda: build_summarize_chain(get_llm_model()),
+        "questions_chain": lambda: build_questions_chain(get_llm_model()),
+        "terms_chain": lambda: build_terms_chain(get_llm_model()),
+        "map_chain": lambda: build_map_chain(get_llm_model()),
+        "synthesis_chain": lambda: build_synthesis_chain(get_llm_model()),
+        "full_parallel_chain": get_full_parallel_chain,
+    }
+    if name not in builders:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = builders[name]()
+    return value
 
 
 # -------------------------------------------------------------------
@@ -153,7 +220,7 @@ def run_parallel(topic: str) -> None:
         key terms, and related questions.
     """
     # Invoke the full pipeline with just the topic
-    response = full_parallel_chain.invoke({"topic": topic})
+    response = get_full_parallel_chain().invoke({"topic": topic})
 
     print("\n--- Final Response ---")
     print(response)
@@ -24,29 +24,60 @@ This script is structured to show how to:
 - Use `RunnableParallel` to run multiple chains in parallel.
 - Combine chain outputs into a final synthesis chain.
 - Build modular, composable pipelines in LangChain.
+- Build the pipeline once (`get_guide_chain()`) and reuse it for every call.
+
+📚 Batch mode:
+`generate_guides()` writes guides for hundreds of languages:
+- At most `max_concurrency` languages are generated at the same time (each one
+  makes 3 parallel calls plus the synthesis). Below that, the shared Gemini
+  scheduler keeps every call within the quota.
+- Every finished guide is written at once to `<output_dir>/<slug>-<hash>.md`
+  (`guide_filename`).
+- `progress.jsonl` in the same folder records every finished language. A
+  re-run after an interruption skips those languages and only generates the rest.
+
+Environment Variables:
+- GUIDE_LANGUAGES_FILE: file with one language per line; switches to batch mode
+- GUIDE_OUTPUT_DIR: output folder of batch mode (default "language_guides")
+- GUIDE_MAX_CONCURRENCY: languages generated at the same time (default 8)
 
 Example:
     python parallel_llm_pipeline.py
+    GUIDE_LANGUAGES_FILE=languages.txt python parallel_llm_pipeline.py
 """
 
+import asyncio
+import hashlib
+import json
 import os
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_google_genai import GoogleGenerativeAI
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnableParallel, RunnablePassthrough
 
+from gemini_scheduler import ScheduledLLM, scheduled
 
-def build_llm_model():
+
+def build_llm_model(priority: str = "interactive") -> ScheduledLLM:
     """
-    Initialize the Google Generative AI model.
+    Initialize the Google Generative AI model behind the shared Gemini scheduler.
+
+    Args:
+        priority (str): Scheduler class of its calls, "interactive" or "batch".
 
     Returns:
-        GoogleGenerativeAI: Configured LLM model.
+        ScheduledLLM: Configured LLM model.
     """
-    return GoogleGenerativeAI(
+    return scheduled(GoogleGenerativeAI(
         model="gemini-2.5-flash",
         api_key=os.getenv("Gemini_APIKEY"),
-    )
+        max_retries=1,
+    ), priority=priority)
 
 
 def build_explanation_chain(llm):
@@ -132,18 +163,18 @@ def build_synthesis_chain(llm):
     )
 
 
-def run_pipeline(language: str = "Python"):
+def build_guide_chain(llm=None):
     """
-    Run the full pipeline for a given programming language.
+    Compose the full pipeline: parallel sub-chains → synthesis.
 
     Args:
-        language (str): The programming language to analyze. Default is "Python".
+        llm: LLM for every step (default: `build_llm_model()`).
 
     Returns:
-        str: Synthesized beginner-friendly guide.
+        Runnable: `parallel_chain | synthesis_chain`, reusable for any number of calls.
     """
     # Initialize LLM model
-    llm = build_llm_model()
+    llm = llm if llm is not None else build_llm_model()
 
     # Build sub-chains
     explain_chain = build_explanation_chain(llm)
@@ -157,14 +188,167 @@ def run_pipeline(language: str = "Python"):
     synthesis_chain = build_synthesis_chain(llm)
 
     # Full pipeline
-    full_chain = parallel_chain | synthesis_chain
+    return parallel_chain | synthesis_chain
+
+
+@lru_cache(maxsize=None)
+def get_guide_chain(priority: str = "interactive"):
+    """
+    Build the pipeline once per scheduler priority and reuse it for every later call.
+    """
+    return build_guide_chain(build_llm_model(priority))
+
+
+def run_pipeline(language: str = "Python"):
+    """
+    Run the full pipeline for a given programming language.
+
+    Args:
+        language (str): The programming language to analyze. Default is "Python".
+
+    Returns:
+        str: Synthesized beginner-friendly guide.
+    """
+    return get_guide_chain().invoke({"programming_language": language})
+
+
+# ---------------------------
+# Batch mode
+# ---------------------------
+def guide_filename(language: str) -> str:
+    """
+    File name of a language's guide: a readable slug plus a short hash of the name.
+
+    The hash keeps names that slug alike apart ("Go" / "go", symbol-only names),
+    e.g. "Visual Basic" → "visual_basic-<8 hex digits>.md".
+    """
+    name = language.strip()
+    slug = re.sub(r"[^\w+#.-]+", "_", name.lower()).strip("_.") or "language"
+    return f"{slug}-{hashlib.sha256(name.encode('utf-8')).hexdigest()[:8]}.md"
+
+
+class GuideCheckpoint:
+    """
+    Append-only record of finished languages (`progress.jsonl`).
+
+    A language counts as finished when its line is in the file AND its guide
+    still exists. A line cut off by a crash is ignored.
+
+    Args:
+        path (Path): The checkpoint file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.finished = {}
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.finished[entry["language"]] = entry["file"]
+
+    def is_finished(self, language: str) -> bool:
+        file = self.finished.get(language)
+        return file is not None and (self.path.parent / file).exists()
+
+    def mark_finished(self, language: str, file: str, seconds: float) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"language": language, "file": file, "seconds": round(seconds, 3)}) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.finished[language] = file
+
+
+def write_guide(output_dir: Path, language: str, guide: str) -> Path:
+    """
+    Write a guide atomically (temporary file + rename), so no half-written guide is left behind.
+    """
+    path = output_dir / guide_filename(language)
+    temporary = path.with_suffix(".md.tmp")
+    temporary.write_text(f"# {language}\n\n{guide}\n", encoding="utf-8")
+    os.replace(temporary, path)
+    return path
 
-    # Execute pipeline
-    return full_chain.invoke({"programming_language": language})
+
+@dataclass
+class GuideBatchStats:
+    """
+    Accounting of one `generate_guides` run.
+    """
+    requested: int = 0
+    skipped: int = 0  # finished in an earlier run
+    generated: int = 0
+    failed: dict = field(default_factory=dict)  # language -> error message
+    seconds: float = 0.0
+
+
+async def agenerate_guides(languages: list[str], output_dir: str = "language_guides", max_concurrency: int = 8,
+                           chain=None) -> GuideBatchStats:
+    """
+    Generate a guide per language, writing each one to disk as soon as it is ready.
+
+    Args:
+        languages (list[str]): Languages to write guides for (duplicates are ignored).
+        output_dir (str): Folder for the guides and `progress.jsonl`.
+        max_concurrency (int): Languages in progress at the same time.
+        chain: Pipeline to use (default: `get_guide_chain("batch")`).
+
+    Returns:
+        GuideBatchStats: Counts of skipped, generated and failed languages.
+    """
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint = GuideCheckpoint(output_dir / "progress.jsonl")
+    chain = chain if chain is not None else get_guide_chain("batch")
+    languages = list(dict.fromkeys(language.strip() for language in languages if language.strip()))
+    stats = GuideBatchStats(requested=len(languages))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def generate(language: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                guide = await chain.ainvoke({"programming_language": language})
+            except Exception as error:  # retried on the next run
+                stats.failed[language] = f"{type(error).__name__}: {error}"
+                return
+            path = write_guide(output_dir, language, guide)
+            checkpoint.mark_finished(language, path.name, time.perf_counter() - started)
+            stats.generated += 1
+
+    pending = [language for language in languages if not checkpoint.is_finished(language)]
+    stats.skipped = len(languages) - len(pending)
+    await asyncio.gather(*(generate(language) for language in pending))
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def generate_guides(languages: list[str], output_dir: str = "language_guides", max_concurrency: int = 8,
+                    chain=None) -> GuideBatchStats:
+    """
+    Synchronous entry point of `agenerate_guides`.
+    """
+    return asyncio.run(agenerate_guides(languages, output_dir, max_concurrency, chain))
 
 
 if __name__ == "__main__":
-    # Example: Generate a guide for Python
-    guide = run_pipeline("Python")
-    print("=== Beginner-Friendly Guide ===\n")
-    print(guide)
\ No newline at end of file
+    languages_file = os.getenv("GUIDE_LANGUAGES_FILE")
+    if languages_file:
+        # Batch mode: one guide per line of the file, resumable
+        stats = generate_guides(
+            Path(languages_file).read_text(encoding="utf-8").splitlines(),
+            output_dir=os.getenv("GUIDE_OUTPUT_DIR", "language_guides"),
+            max_concurrency=int(os.getenv("GUIDE_MAX_CONCURRENCY", "8")),
+        )
+        print(f"{stats.generated} generated, {stats.skipped} already done, "
+              f"{len(stats.failed)} failed in {stats.seconds:.1f}s")
+        for language, error in stats.failed.items():
+            print(f"  {language}: {error}")
+    else:
+        # Example: Generate a guide for Python
+        guide = run_pipeline("Python")
+        print("=== Beginner-Friendly Guide ===\n")
+        print(guide)
\ No newline at end of file
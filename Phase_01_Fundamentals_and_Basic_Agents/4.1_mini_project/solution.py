@@ -12,6 +12,13 @@ Key Features:
 3. Parallelization: Runs Research and Summarization agents concurrently if needed.
 4. Reflection: Critic agent evaluates the output and provides an improved version.
 
+Speculative routing (`speculative_routing.py`) starts the most likely branch
+while the Router Agent is still deciding. Environment variables for `main()`:
+- SPECULATIVE_ROUTING=1 turns it on.
+- ROUTING_HISTORY_FILE keeps the decision counts between runs (default "routing_history.json").
+- SPECULATION_MIN_CONFIDENCE (default 0.5) and SPECULATION_MAX_WASTE_RATE (default 0.2)
+  set the speculation budget.
+
 Requirements:
 - Python 3.10+
 - langchain-core
@@ -23,24 +30,33 @@ $ python ai_research_summarization_agent.py
 """
 
 import os
+import sys
 from langchain_google_genai import GoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableBranch, RunnableParallel
 
+# Share the process-wide Gemini scheduler with the Parallelization examples
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "3_Parallelization"))
+from gemini_scheduler import ScheduledLLM, scheduled  # noqa: E402
+
 
-def build_llm_model() -> GoogleGenerativeAI:
+def build_llm_model() -> ScheduledLLM:
     """
     Initialize and return the Google Generative AI model.
 
+    Calls go through the shared Gemini scheduler (`3_Parallelization/gemini_scheduler.py`),
+    so the parallel Research + Summarization branches respect the quota.
+
     Returns:
-        GoogleGenerativeAI: Configured LLM model with Gemini API key.
+        ScheduledLLM: Configured LLM model with Gemini API key.
     """
-    return GoogleGenerativeAI(
+    return scheduled(GoogleGenerativeAI(
         model="gemini-2.5-flash",
         api_key=os.getenv("Gemini_APIKEY"),
-    )
+        max_retries=1,
+    ))
 
 def build_research_template() -> ChatPromptTemplate:
     """
@@ -156,10 +172,17 @@ def get_both_chain(research_chain, summarization_chain) -> RunnableParallel:
     })
 
 
-def main():
-    """Main execution function for the AI Research & Summarization Agent."""
-    user_query = "Explain and summarize the applications of blockchain in supply chains"
+def build_agent_chains(llm=None) -> dict:
+    """
+    Build every agent chain of the pipeline.
 
+    Args:
+        llm: LLM for every agent (default: `build_llm_model()`).
+
+    Returns:
+        dict: "research", "summarization", "both", "router", "critic" and
+        "router_branch" (the RunnableBranch over the first three).
+    """
     # Build agent templates
     research_agent_template = build_research_template()
     summarization_agent_template = build_summarization_template()
@@ -167,7 +190,7 @@ def main():
     critic_agent_template = build_reflection_template()
 
     # Initialize LLM
-    llm = build_llm_model()
+    llm = llm if llm is not None else build_llm_model()
 
     # Create agent chains
     research_chain = (research_agent_template | llm | StrOutputParser())
@@ -179,16 +202,49 @@ def main():
     both_chain = get_both_chain(research_chain, summarization_chain)
     router_branch = create_routing_branches(research_chain, summarization_chain, both_chain)
 
-    # Step 1: Route user query
-    router_agent_response = router_chain.invoke({'query': user_query})
-    print(f"User Query: {user_query}")
-    print(f"Router Agent's Decision: {router_agent_response}")
-    print(f"\nRouting to {router_agent_response.lower()}_branch")
+    return {
+        "research": research_chain,
+        "summarization": summarization_chain,
+        "both": both_chain,
+        "router": router_chain,
+        "critic": critic_chain,
+        "router_branch": router_branch,
+    }
 
-    # Step 2: Execute routed chain
-    router_branch_input = {'decision': router_agent_response, 'query': user_query}
-    agent_response = router_branch.invoke(router_branch_input)
-    print(f"\nOriginal response: {agent_response}")
+
+def main():
+    """Main execution function for the AI Research & Summarization Agent."""
+    user_query = "Explain and summarize the applications of blockchain in supply chains"
+    chains = build_agent_chains()
+    critic_chain = chains["critic"]
+
+    if os.getenv("SPECULATIVE_ROUTING") == "1":
+        # Steps 1 + 2 overlapped: the likely branch starts while the router decides
+        from speculative_routing import RoutingHistory, SpeculativeRouter
+        history_file = os.getenv("ROUTING_HISTORY_FILE", "routing_history.json")
+        router = SpeculativeRouter(
+            chains,
+            history=RoutingHistory.load(history_file),
+            min_confidence=float(os.getenv("SPECULATION_MIN_CONFIDENCE", "0.5")),
+            max_waste_rate=float(os.getenv("SPECULATION_MAX_WASTE_RATE", "0.2")),
+        )
+        result = router.invoke(user_query)
+        router.history.save(history_file)
+        router_agent_response, agent_response = result["decision"], result["output"]
+        print(f"User Query: {user_query}")
+        print(f"Router Agent's Decision: {router_agent_response} (speculation: {result['speculation']})")
+        print(f"\nOriginal response: {agent_response}")
+    else:
+        # Step 1: Route user query
+        router_agent_response = chains["router"].invoke({'query': user_query})
+        print(f"User Query: {user_query}")
+        print(f"Router Agent's Decision: {router_agent_response}")
+        print(f"\nRouting to {router_agent_response.lower()}_branch")
+
+        # Step 2: Execute routed chain
+        router_branch_input = {'decision': router_agent_response, 'query': user_query}
+        agent_response = chains["router_branch"].invoke(router_branch_input)
+        print(f"\nOriginal response: {agent_response}")
 
     # Step 3: Reflection / Critique
     critic_agent_response = critic_chain.invoke({"agent_output": agent_response})
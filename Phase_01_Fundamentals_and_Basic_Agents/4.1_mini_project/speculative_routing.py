@@ -0,0 +1,232 @@
+"""
+Speculative Branch Execution for the Research & Summarization Router
+====================================================================
+
+`main()` in `solution.py` waits for the Router Agent before the chosen
+Research / Summarization / BOTH chain starts, so every query pays for two
+LLM round trips in sequence. `SpeculativeRouter` overlaps them:
+
+1. A predictor estimates the probability of each decision. By default this is
+   the historical routing frequency (`RoutingHistory`); any local predictor
+   `query -> {decision: probability}` can be plugged in instead.
+2. If the speculation budget allows it, the most likely branch starts at the
+   same time as the router.
+3. When the router's decision arrives:
+   - hit  : the speculative result is used; the router's latency is saved.
+   - miss : the speculative branch is cancelled, its calls count as wasted,
+            and the decided branch runs as usual.
+
+Speculation budget:
+-------------------
+- min_confidence: speculate only if the predicted branch is at least this likely.
+- max_waste_rate: no speculation while wasted calls / all calls is above this.
+- max_speculative_calls: speculate only on branches with at most this many
+  calls (Research and Summarization cost 1 call, BOTH costs 2).
+
+`stats.summary()` reports the hit rate, the wasted-call rate and the latency
+saved. For each query, the saving is the router time plus the branch time
+minus the measured total. A cancelled call counts as wasted even if the
+provider never finished it. `benchmarks/speculative_routing_benchmark.py`
+compares speculative and sequential routing.
+
+Requirements:
+-------------
+- Python 3.10+
+- langchain-core, langchain-google-genai
+- Gemini_APIKEY environment variable
+
+Example:
+--------
+>>> router = SpeculativeRouter(build_agent_chains(), max_waste_rate=0.2)
+>>> router.invoke("Explain the applications of blockchain in supply chains")
+{'decision': 'Research', 'output': '...', 'predicted': 'Research', 'speculation': 'hit'}
+>>> router.stats.summary()
+{'queries': 1, 'speculated': 1, 'hit_rate': 1.0, 'wasted_call_rate': 0.0, ...}
+"""
+
+import asyncio
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from solution import build_agent_chains
+
+BRANCHES = ("Research", "Summarization", "BOTH")
+BRANCH_CALLS = {"Research": 1, "Summarization": 1, "BOTH": 2}
+DEFAULT_BRANCH = "Research"  # the RunnableBranch default in solution.py
+
+
+def normalize_decision(decision: str) -> str:
+    """
+    Map the router's answer to a branch name (unknown answers use the default branch).
+    """
+    decision = decision.strip()
+    return decision if decision in BRANCHES else DEFAULT_BRANCH
+
+
+# ---------------------------------------------------------------------------
+# Predictor: historical routing frequency
+# ---------------------------------------------------------------------------
+class RoutingHistory:
+    """
+    Counts of past decisions, smoothed with one pseudo-count per branch.
+
+    Args:
+        counts (dict | None): Initial counts per branch.
+    """
+
+    def __init__(self, counts: dict | None = None):
+        self.counts = {branch: 0 for branch in BRANCHES}
+        self.counts.update(counts or {})
+        self._lock = threading.Lock()
+
+    def probabilities(self, query: str | None = None) -> dict[str, float]:
+        total = sum(self.counts.values()) + len(BRANCHES)
+        return {branch: (count + 1) / total for branch, count in self.counts.items()}
+
+    def record(self, decision: str) -> None:
+        with self._lock:
+            self.counts[decision] += 1
+
+    @classmethod
+    def load(cls, path: str) -> "RoutingHistory":
+        """
+        Counts saved by `save` (an empty history if the file does not exist).
+        """
+        path = Path(path)
+        return cls(json.loads(path.read_text(encoding="utf-8")) if path.exists() else None)
+
+    def save(self, path: str) -> None:
+        Path(path).write_text(json.dumps(self.counts), encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Accounting
+# ---------------------------------------------------------------------------
+@dataclass
+class SpeculationStats:
+    """
+    Hits, wasted calls and saved latency of a SpeculativeRouter.
+    """
+    queries: int = 0
+    speculated: int = 0
+    hits: int = 0
+    calls: int = 0  # router + branch calls, wasted ones included
+    wasted_calls: int = 0
+    latency_saved: list = field(default_factory=list)  # seconds, one per query
+
+    def summary(self) -> dict:
+        return {
+            "queries": self.queries,
+            "speculated": self.speculated,
+            "hit_rate": self.hits / self.speculated if self.speculated else 0.0,
+            "calls": self.calls,
+            "wasted_calls": self.wasted_calls,
+            "wasted_call_rate": self.wasted_calls / self.calls if self.calls else 0.0,
+            "latency_saved_total_s": sum(self.latency_saved),
+            "latency_saved_mean_ms": 1000 * sum(self.latency_saved) / self.queries if self.queries else 0.0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Speculative router
+# ---------------------------------------------------------------------------
+class SpeculativeRouter:
+    """
+    Runs the router and the most likely branch at the same time.
+
+    Args:
+        chains (dict): Output of `build_agent_chains()`.
+        history (RoutingHistory | None): Decision counts; every routed query is recorded.
+        predictor: `query -> {branch: probability}` (default: the history's frequencies).
+        min_confidence (float): Lowest predicted probability worth speculating on.
+        max_waste_rate (float): Highest wasted-call rate at which speculation continues.
+        max_speculative_calls (int): Most calls a speculative branch may cost.
+    """
+
+    def __init__(self, chains: dict | None = None, history: RoutingHistory | None = None, predictor=None,
+                 min_confidence: float = 0.5, max_waste_rate: float = 0.2, max_speculative_calls: int = 2):
+        chains = chains if chains is not None else build_agent_chains()
+        self.router_chain = chains["router"]
+        self.branches = {"Research": chains["research"], "Summarization": chains["summarization"],
+                         "BOTH": chains["both"]}
+        self.history = history if history is not None else RoutingHistory()
+        self.predictor = predictor if predictor is not None else self.history.probabilities
+        self.min_confidence = min_confidence
+        self.max_waste_rate = max_waste_rate
+        self.max_speculative_calls = max_speculative_calls
+        self.stats = SpeculationStats()
+        self._lock = threading.Lock()
+
+    def choose(self, query: str) -> str | None:
+        """
+        The branch to speculate on, or None when the budget does not allow it.
+        """
+        probabilities = self.predictor(query)
+        branch = max(probabilities, key=probabilities.get)
+        with self._lock:
+            waste_rate = self.stats.wasted_calls / self.stats.calls if self.stats.calls else 0.0
+        if (probabilities[branch] < self.min_confidence or waste_rate > self.max_waste_rate
+                or BRANCH_CALLS[branch] > self.max_speculative_calls):
+            return None
+        return branch
+
+    async def _timed(self, runnable, inputs: dict, start: float):
+        output = await runnable.ainvoke(inputs)
+        return output, time.perf_counter() - start
+
+    async def ainvoke(self, query: str) -> dict:
+        """
+        Route and answer one query.
+
+        Returns:
+            dict: "decision", "output", "predicted" and "speculation"
+            ("hit", "miss" or "skipped").
+        """
+        inputs = {"query": query}
+        predicted = self.choose(query)
+        start = time.perf_counter()
+        router_task = asyncio.ensure_future(self._timed(self.router_chain, inputs, start))
+        speculative_task = (asyncio.ensure_future(self._timed(self.branches[predicted], inputs, start))
+                            if predicted else None)
+
+        try:
+            raw_decision, router_seconds = await router_task
+        except BaseException:
+            if speculative_task:
+                speculative_task.cancel()
+            raise
+        decision = normalize_decision(raw_decision)
+
+        wasted = 0
+        if predicted == decision:
+            output, branch_seconds = await speculative_task
+        else:
+            if speculative_task:
+                speculative_task.cancel()
+                wasted = BRANCH_CALLS[predicted]
+            branch_start = time.perf_counter()
+            output = await self.branches[decision].ainvoke(inputs)
+            branch_seconds = time.perf_counter() - branch_start
+        total = time.perf_counter() - start
+
+        self.history.record(decision)
+        with self._lock:
+            self.stats.queries += 1
+            self.stats.speculated += predicted is not None
+            self.stats.hits += predicted == decision
+            self.stats.calls += 1 + BRANCH_CALLS[decision] + wasted
+            self.stats.wasted_calls += wasted
+            # Sequential routing would take router + branch; a miss saves nothing
+            self.stats.latency_saved.append(max(router_seconds + branch_seconds - total, 0.0)
+                                            if predicted == decision else 0.0)
+        speculation = "skipped" if predicted is None else "hit" if predicted == decision else "miss"
+        return {"decision": decision, "output": output, "predicted": predicted, "speculation": speculation}
+
+    def invoke(self, query: str) -> dict:
+        """
+        Synchronous version of `ainvoke` (not for use inside a running event loop).
+        """
+        return asyncio.run(self.ainvoke(query))
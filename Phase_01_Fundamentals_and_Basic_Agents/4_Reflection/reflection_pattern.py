@@ -89,17 +89,21 @@ def build_critic_template() -> ChatPromptTemplate:
     ])
 
 
-def run_reflection_loop(max_iterations: int = 3):
+def run_reflection_loop(max_iterations: int = 3, llm=None) -> str:
     """
     Run the iterative reflection loop for code generation and critique.
 
     Args:
         max_iterations (int): Maximum number of generate-refine cycles.
+        llm: LLM for both producer and critic (default: `build_llm_model()`).
+
+    Returns:
+        str: The final version of the generated code.
     """
     current_code = ""  # Stores the latest version of the generated code
     refinement_instructions = ""  # Stores the latest critique instructions
 
-    llm = build_llm_model()
+    llm = llm if llm is not None else build_llm_model()
     producer_template = build_producer_template()
     critic_template = build_critic_template()
 
@@ -137,6 +141,7 @@ def run_reflection_loop(max_iterations: int = 3):
     print("\n" + "="*30 + " FINAL RESULT " + "="*30)
     print("\nFinal refined code:\n")
     print(current_code)
+    return current_code
 
 
 if __name__ == "__main__":
@@ -20,9 +20,11 @@ Example:
     $ python planner_writer_agent.py
 
 The agent will output a ~200-word article on the specified topic.
+Both tools share the LLM returned by `get_llm()`.
 """
 
 import os
+from functools import lru_cache
 from langchain.prompts import StringPromptTemplate
 from langchain.agents import Tool, initialize_agent, AgentType
 from langchain_google_genai import GoogleGenerativeAI
@@ -46,8 +48,17 @@ def build_llm() -> GoogleGenerativeAI:
         api_key=os.getenv("GOOGLE_API_KEY"),
     )
 
-# Initialize the LLM
-llm_instance = build_llm()
+
+@lru_cache(maxsize=None)
+def get_llm() -> GoogleGenerativeAI:
+    """
+    Returns the shared LLM, built on first use.
+
+    Returns:
+        GoogleGenerativeAI: The cached LLM instance.
+    """
+    return build_llm()
+
 
 # -------------------------
 # 2. Define Tools
@@ -75,7 +86,7 @@ def researcher(topic: str) -> StrOutputParser:
         """),
         ("user", "{research_topic}")
     ])
-    return prompt | llm_instance | StrOutputParser()
+    return prompt | get_llm() | StrOutputParser()
 
 
 @tool
@@ -100,7 +111,7 @@ def write_article(research_notes: str) -> StrOutputParser:
         """),
         ("user", "{researched_topic}")
     ])
-    return prompt | llm_instance | StrOutputParser()
+    return prompt | get_llm() | StrOutputParser()
 
 
 # -------------------------
@@ -139,7 +150,7 @@ def main():
 
     # Initialize a LangChain agent
     agent_executor = initialize_agent(
-        llm=llm_instance,
+        llm=get_llm(),
         tools=tools,
         agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
         verbose=True
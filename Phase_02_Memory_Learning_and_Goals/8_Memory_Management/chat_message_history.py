@@ -37,6 +37,10 @@ Requirements:
     - `langchain_google_genai`
     - A valid Google Gemini API key stored in your environment as "GOOGLE_API_KEY".
 
+Note:
+    `get_llm_pipeline()` returns the Prompt → LLM → Parser pipeline used by
+    the chat loop.
+
 Usage:
     Run the script and interact with the chatbot in the terminal.
     Type 'quit' or 'Quit' to exit the conversation.
@@ -53,6 +57,7 @@ Example Output:
 # Imports
 # -----------------------------------------------------------------------------
 import os
+from functools import lru_cache
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain.prompts import ChatPromptTemplate
 from langchain_google_genai import GoogleGenerativeAI
@@ -99,27 +104,38 @@ history.add_ai_message("Hello, Himanshu!")
 history.add_user_message("What is my name?")
 history.add_ai_message("Your name is Himanshu Singh.")
 
-# Print stored messages (for reference)
-print("Initial Chat History:")
-print(history.messages)
-print("-" * 80)
-
 # -----------------------------------------------------------------------------
 # Section 2: Define Prompt Template and Response Pipeline
 # -----------------------------------------------------------------------------
-# The pipeline connects: Prompt → LLM → Output Parser
-llm_pipeline = (
-    ChatPromptTemplate([
-        (
-            "user",
-            "This is the conversation history between the AI and the user. "
-            "Use it only for context.\n\nPrevious Chat: {conversation}\n\n"
-            "Question for you: {user_query}"
-        )
-    ])
-    | initialize_llm()
-    | StrOutputParser()
-)
+def build_llm_pipeline(llm: GoogleGenerativeAI | None = None):
+    """
+    Builds the response pipeline: Prompt → LLM → Output Parser
+
+    Parameters:
+        llm (GoogleGenerativeAI | None): The LLM to use. Defaults to a new
+                                         `initialize_llm()` instance.
+    """
+    return (
+        ChatPromptTemplate([
+            (
+                "user",
+                "This is the conversation history between the AI and the user. "
+                "Use it only for context.\n\nPrevious Chat: {conversation}\n\n"
+                "Question for you: {user_query}"
+            )
+        ])
+        | (llm if llm is not None else initialize_llm())
+        | StrOutputParser()
+    )
+
+
+@lru_cache(maxsize=None)
+def get_llm_pipeline():
+    """
+    Returns the shared response pipeline, built on first use.
+    """
+    return build_llm_pipeline()
+
 
 # -----------------------------------------------------------------------------
 # Section 3: Start Chatbot Loop
@@ -131,6 +147,13 @@ def start_chatbot():
     The chatbot uses stored conversation history to maintain context manually.
     Each user query and AI response is added to `ChatMessageHistory`.
     """
+    # Print stored messages (for reference)
+    print("Initial Chat History:")
+    print(history.messages)
+    print("-" * 80)
+
+    llm_pipeline = get_llm_pipeline()
+
     print("\n----------------- AI Chatbot -----------------")
     print("Enter 'quit' or 'Quit' to exit the chatbot.\n")
 
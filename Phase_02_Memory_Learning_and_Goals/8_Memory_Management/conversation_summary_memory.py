@@ -20,6 +20,10 @@ Requirements:
     - langchain
     - langchain_google_genai
     - A valid Google Gemini API key in environment variable "GOOGLE_API_KEY".
+
+Note:
+    `build_conversation()` gives every caller its own summary memory;
+    `get_conversation()` is the one the chatbot loop uses.
 ===============================================================================
 """
 
@@ -27,6 +31,7 @@ Requirements:
 # Imports
 # -----------------------------------------------------------------------------
 import os
+from functools import lru_cache
 from langchain_google_genai import GoogleGenerativeAI
 from langchain.memory import ConversationSummaryMemory
 from langchain.chains import ConversationChain
@@ -49,16 +54,37 @@ def initialize_llm(api_key_env: str = "GOOGLE_API_KEY") -> GoogleGenerativeAI:
 # -----------------------------------------------------------------------------
 # Section 1: Initialize Memory and LLM Chain
 # -----------------------------------------------------------------------------
-# ConversationSummaryMemory automatically summarizes older messages.
-llm = initialize_llm()
-memory = ConversationSummaryMemory(llm=llm)
+@lru_cache(maxsize=None)
+def get_llm() -> GoogleGenerativeAI:
+    """
+    Returns the shared LLM, initialized on first use.
+    """
+    return initialize_llm()
+
+
+def build_conversation(llm: GoogleGenerativeAI | None = None, verbose: bool = True) -> ConversationChain:
+    """
+    Creates a ConversationChain with its own, empty summary memory.
+    """
+    llm = llm if llm is not None else get_llm()
+
+    # ConversationSummaryMemory automatically summarizes older messages.
+    memory = ConversationSummaryMemory(llm=llm)
+
+    # ConversationChain ties together LLM + Memory
+    return ConversationChain(
+        llm=llm,
+        memory=memory,
+        verbose=verbose   # Set to True to view internal prompt construction
+    )
 
-# ConversationChain ties together LLM + Memory
-conversation = ConversationChain(
-    llm=llm,
-    memory=memory,
-    verbose=True   # Set to True to view internal prompt construction
-)
+
+@lru_cache(maxsize=None)
+def get_conversation() -> ConversationChain:
+    """
+    Returns the shared conversation used by the chatbot, built on first use.
+    """
+    return build_conversation()
 
 
 # -----------------------------------------------------------------------------
@@ -71,6 +97,7 @@ def start_chatbot():
     """
     print("\n----------------- AI Chatbot with Summarized Memory -----------------")
     print("Type 'quit' or 'exit' to end the chat.\n")
+    conversation = get_conversation()
 
     while True:
         user_input = input("User: ").strip()
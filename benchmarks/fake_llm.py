@@ -0,0 +1,535 @@
+"""
+Offline Fake LLM for Benchmarking the Patterns
+==============================================
+
+Every pattern in Phase_01 / Phase_02 talks to `GoogleGenerativeAI`, so none of
+them can be measured without the network. `FakeLLM` is a drop-in stand-in: it
+is a LangChain `LLM`, so invoke / ainvoke / batch / abatch / stream / astream
+and the `prompt | llm | parser` pipe all work unchanged.
+
+What it simulates:
+------------------
+1. Answers: rule-based outputs that keep every pattern on its happy path
+   ('booker' / 'info' / 'unclear' for the coordinator router, 'Research' /
+   'Summarization' / 'BOTH' for the 4.1 router, CODE_IS_PERFECT for the
+   reflection critic, ReAct "Action:" / "Final Answer:" steps for the tool
+   agents, a spec list and JSON for prompt chaining), plus custom rules or a scripted
+   list of responses.
+2. Latency: time-to-first-token drawn from a fixed, uniform or lognormal
+   distribution, then tokens emitted at `tokens_per_second`. `stream()` really
+   yields token by token at that rate.
+3. Rate limits: a random 429 probability and/or a requests-per-minute quota.
+   Both raise `RateLimitError`.
+
+Each call is counted (calls, 429s, prompt / completion tokens, peak calls in
+flight), so a benchmark can report calls per request and token usage.
+
+Like GoogleGenerativeAI (and every LangChain `LLM`), `batch()` / `abatch()`
+send their prompts one after another, and a single failure fails the whole
+batch. Concurrency comes from RunnableParallel branches or from concurrent
+invoke / ainvoke calls.
+
+Requirements:
+-------------
+- langchain_core
+
+Usage:
+------
+    python benchmarks/fake_llm.py    # demo of answers, latency, streaming and 429s
+
+Example:
+--------
+>>> from routing_pattern import build_coordinator_agent
+>>> llm = FakeLLM(latency=LATENCY_PROFILES["gemini-flash"])
+>>> build_coordinator_agent(llm).invoke({"request": "Book me a flight to London."})
+"Booking Handler processed request: 'Book me a flight to London.' | Result: Simulated booking action"
+>>> llm.stats.calls, llm.stats.prompt_tokens
+(1, 107)
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+from pydantic import Field, PrivateAttr
+
+# The fake charges tokens with the same estimate the Gemini scheduler budgets with
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Phase_01_Fundamentals_and_Basic_Agents" / "3_Parallelization"))
+from gemini_scheduler import approximate_token_count  # noqa: E402
+
+
+# ---------------------------
+# Latency model
+# ---------------------------
+@dataclass(frozen=True)
+class LatencyModel:
+    """
+    Time-to-first-token distribution plus generation speed.
+
+    Attributes:
+        distribution (str): "fixed", "uniform" or "lognormal".
+        median_s (float): Median time to first token in seconds.
+        spread (float): Relative spread. Uniform draws from
+                        median * (1 ± spread); lognormal uses it as sigma,
+                        which gives the long tail real APIs have.
+        tokens_per_second (float): Generation speed after the first token
+                                   (0 = the whole answer arrives at once).
+        max_s (float): Cap on a single time-to-first-token draw.
+    """
+    distribution: str = "lognormal"
+    median_s: float = 0.4
+    spread: float = 0.4
+    tokens_per_second: float = 150.0
+    max_s: float = 30.0
+
+    def sample_first_token(self, rng: random.Random) -> float:
+        """
+        Draw one time to first token in seconds.
+        """
+        if self.distribution == "fixed":
+            seconds = self.median_s
+        elif self.distribution == "uniform":
+            seconds = rng.uniform(self.median_s * (1 - self.spread), self.median_s * (1 + self.spread))
+        elif self.distribution == "lognormal":
+            seconds = self.median_s * math.exp(rng.gauss(0.0, self.spread))
+        else:
+            raise ValueError(f"Unknown latency distribution {self.distribution!r}")
+        return min(max(seconds, 0.0), self.max_s)
+
+    def seconds_per_token(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+LATENCY_PROFILES = {
+    # Pure orchestration overhead: no simulated waiting at all
+    "instant": LatencyModel("fixed", 0.0, 0.0, tokens_per_second=0),
+    # Roughly a flash-class hosted model
+    "gemini-flash": LatencyModel("lognormal", 0.45, 0.35, tokens_per_second=180),
+    # A slow, heavily loaded endpoint with a long tail
+    "slow": LatencyModel("lognormal", 1.5, 0.7, tokens_per_second=40),
+}
+
+
+class RateLimitError(Exception):
+    """
+    Simulated HTTP 429 "Resource has been exhausted" from the provider.
+    """
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ---------------------------
+# Rule-based answers
+# ---------------------------
+_BOOKING_WORDS = re.compile(r"\b(book|booking|flight|flights|hotel|hotels|reserve|reservation|ticket)\b", re.I)
+_QUESTION_WORDS = re.compile(r"^\s*(what|who|where|when|which|how|why|is|are|does|do|can)\b", re.I)
+_TOOL_LINE = re.compile(r"^([A-Za-z_][\w\-]*)(?:\(.*?\))?:\s*(.+)$", re.M)
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"what", "when", "where", "which", "with", "from", "that", "this", "their", "about",
+              "tell", "give", "please", "could", "would", "into", "does", "based", "returns", "given"}
+
+
+def _keywords(text: str) -> set[str]:
+    return {word for word in _WORD.findall(text.lower()) if len(word) > 3 and word not in _STOPWORDS}
+
+
+def last_user_message(prompt: str) -> str:
+    """
+    Text of the last user turn in a prompt (chat prompts reach an LLM as
+    "System: ...\\nHuman: ..."), or the whole prompt if there is none.
+    """
+    for marker in ("Human:", "Question:", "Topic:"):
+        if marker in prompt:
+            return prompt.rsplit(marker, 1)[1].strip()
+    return prompt.strip()
+
+
+def _coordinator_decision(request: str) -> str:
+    if _BOOKING_WORDS.search(request):
+        return "booker"
+    if _QUESTION_WORDS.match(request) or request.endswith("?"):
+        return "info"
+    return "unclear"
+
+
+def route_coordinator(prompt: str) -> str:
+    """
+    'booker' / 'info' / 'unclear', like the router in routing_pattern.py.
+    """
+    return _coordinator_decision(last_user_message(prompt))
+
+
+def route_coordinator_numbered(prompt: str) -> str:
+    """
+    "<number>. <decision>" per numbered request, like micro_batch_router.py.
+    """
+    lines = re.findall(r"^\s*(\d+)\.\s*(.+)$", last_user_message(prompt), re.M)
+    return "\n".join(f"{number}. {_coordinator_decision(request.strip())}" for number, request in lines)
+
+
+def route_research(prompt: str) -> str:
+    """
+    'Research' / 'Summarization' / 'BOTH', like the router in 4.1_mini_project.
+    """
+    query = last_user_message(prompt).lower()
+    summarize = "summar" in query or "condense" in query
+    research = any(word in query for word in ("explain", "research", "analy", "detail"))
+    if summarize and research:
+        return "BOTH"
+    return "Summarization" if summarize else "Research"
+
+
+def react_step(prompt: str) -> str:
+    """
+    One ReAct step for the ZERO_SHOT_REACT_DESCRIPTION agents: call the best
+    matching tool first, then give the final answer once an observation exists.
+    """
+    question = prompt.rsplit("Question:", 1)[1].split("\nThought:", 1)[0].strip()
+    scratchpad = prompt.rsplit("Question:", 1)[1]
+    if "Observation:" in scratchpad:
+        observation = scratchpad.rsplit("Observation:", 1)[1].split("\nThought:", 1)[0].strip()
+        return f" I now know the final answer\nFinal Answer: {observation or question}"
+
+    names = re.search(r"should be one of \[(.*?)\]", prompt)
+    tool_names = [name.strip() for name in names.group(1).split(",")] if names else []
+    descriptions = {name: text for name, text in _TOOL_LINE.findall(prompt) if name in tool_names}
+    question_words = _keywords(question)
+
+    def overlap(name: str) -> int:
+        # A question word inside the tool name ("fact" in random_funfact_tool)
+        # counts twice as much as a word shared with the description
+        in_name = sum(word in name.lower() for word in question_words)
+        return 2 * in_name + len(question_words & _keywords(descriptions.get(name, "")))
+
+    tool = max(tool_names, key=overlap) if tool_names else "none"
+    return f" I should use a tool to answer this.\nAction: {tool}\nAction Input: {question}"
+
+
+_SPEC_PATTERNS = {
+    "CPU": re.compile(r"(\d+(?:\.\d+)?\s*GHz[^,\n]*?processor)", re.I),
+    "RAM": re.compile(r"(\d+\s*[GT]B)\s+(?:of\s+)?RAM|RAM:\s*(\d+\s*[GT]B)", re.I),
+    "storage": re.compile(r"(\d+\s*[GT]B\s+(?:NVMe\s+)?(?:SSD|HDD))", re.I),
+}
+
+
+def find_specs(text: str) -> dict[str, str]:
+    """
+    CPU / RAM / storage phrases found in a text ("unknown" when missing).
+    """
+    specs = {}
+    for key, pattern in _SPEC_PATTERNS.items():
+        match = pattern.search(text)
+        specs[key] = next((group for group in match.groups() if group), "").strip() if match else "unknown"
+    return specs
+
+
+def spec_list(prompt: str) -> str:
+    """
+    Bullet list of specs, like the extraction step in prompt_chaining.py.
+    """
+    return "\n".join(f"- {key}: {value}" for key, value in find_specs(prompt).items())
+
+
+def spec_json(prompt: str) -> str:
+    """
+    CPU / RAM / storage JSON, like the transform step in prompt_chaining.py.
+    """
+    return json.dumps(find_specs(prompt), indent=2)
+
+
+def filler_text(prompt: str, words: int) -> str:
+    """
+    Deterministic filler answer of `words` words derived from the prompt.
+    """
+    vocabulary = ("agents", "context", "model", "pipeline", "result", "step", "tool", "memory",
+                  "planning", "response", "summary", "insight", "data", "workflow", "quality")
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    body = " ".join(vocabulary[digest[i % len(digest)] % len(vocabulary)] for i in range(words))
+    return f"Simulated answer: {body}."
+
+
+# (marker found in the prompt, answer function) — first match wins
+DEFAULT_RULES: list[tuple[str, Callable[[str], str]]] = [
+    ("Action Input:", react_step),
+    ("CODE_IS_PERFECT", lambda prompt: "CODE_IS_PERFECT"),
+    ('"<number>. <decision>"', route_coordinator_numbered),
+    ("'booker', 'info', or 'unclear'", route_coordinator),
+    ("'Research', 'Summarization', or 'BOTH'", route_research),
+    ("'CPU', 'RAM', and 'storage'", spec_json),
+    ("Extract the technical specifications", spec_list),
+]
+
+
+# ---------------------------
+# Call accounting
+# ---------------------------
+@dataclass
+class FakeLLMStats:
+    """
+    Counters for every call made to one FakeLLM.
+
+    Attributes:
+        calls (int): Calls that produced an answer.
+        rate_limited (int): Calls rejected with RateLimitError.
+        prompt_tokens (int): Approximate tokens sent.
+        completion_tokens (int): Approximate tokens returned.
+        simulated_seconds (float): Total simulated model time.
+        in_flight (int): Calls running right now.
+        peak_in_flight (int): Highest concurrency seen.
+    """
+    calls: int = 0
+    rate_limited: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    simulated_seconds: float = 0.0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+# ---------------------------
+# The fake LLM
+# ---------------------------
+class FakeLLM(LLM):
+    """
+    Offline LangChain LLM with rule-based answers, simulated latency and 429s.
+
+    Args:
+        latency (LatencyModel): Time-to-first-token distribution and token rate.
+        responses (list[str] | None): Scripted answers returned in order
+                                      (cycled), instead of the rules.
+        rules (list): Extra (marker, answer function) pairs, checked before
+                      DEFAULT_RULES.
+        default_words (int): Length of the filler answer when no rule matches.
+        rate_limit_probability (float): Chance that any call fails with a 429.
+        requests_per_minute (int | None): Quota over a sliding 60 s window;
+                                          calls over it fail with a 429.
+        quota_window_s (float): Length of that window. Shorten it to run a
+                                quota scenario in compressed time.
+        seed (int | None): Seed for latency and error draws.
+    """
+
+    latency: LatencyModel = Field(default_factory=LatencyModel)
+    responses: Optional[list[str]] = None
+    rules: list[tuple[str, Callable[[str], str]]] = Field(default_factory=list)
+    default_words: int = 60
+    rate_limit_probability: float = 0.0
+    requests_per_minute: Optional[int] = None
+    quota_window_s: float = 60.0
+    seed: Optional[int] = None
+
+    _rng: random.Random = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _stats: FakeLLMStats = PrivateAttr(default_factory=FakeLLMStats)
+    _recent_requests: deque = PrivateAttr(default_factory=deque)
+    _scripted_index: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-llm"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"latency": asdict(self.latency), "default_words": self.default_words}
+
+    @property
+    def stats(self) -> FakeLLMStats:
+        """
+        Live counters (see `reset_stats` to start a new measurement).
+        """
+        return self._stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = FakeLLMStats()
+
+    # ---------------------------
+    # Answer selection
+    # ---------------------------
+    def answer(self, prompt: str) -> str:
+        """
+        The text this fake returns for `prompt` (no latency, no accounting).
+        """
+        if self.responses:
+            with self._lock:
+                text = self.responses[self._scripted_index % len(self.responses)]
+                self._scripted_index += 1
+            return text
+        for marker, respond in [*self.rules, *DEFAULT_RULES]:
+            if marker in prompt:
+                return respond(prompt)
+        return filler_text(prompt, self.default_words)
+
+    def _begin(self, prompt: str, stop: Optional[list[str]]) -> tuple[str, float, float]:
+        """
+        Admit one call: apply the rate limits, pick the answer, draw the latency.
+
+        Returns:
+            tuple: (answer text, seconds to first token, seconds per later token)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.requests_per_minute is not None:
+                while self._recent_requests and now - self._recent_requests[0] >= self.quota_window_s:
+                    self._recent_requests.popleft()
+                if len(self._recent_requests) >= self.requests_per_minute:
+                    self._stats.rate_limited += 1
+                    retry_after = self.quota_window_s - (now - self._recent_requests[0])
+                    raise RateLimitError("429 Resource has been exhausted (simulated quota)", retry_after)
+                self._recent_requests.append(now)
+            if self.rate_limit_probability and self._rng.random() < self.rate_limit_probability:
+                self._stats.rate_limited += 1
+                raise RateLimitError("429 Resource has been exhausted (simulated)")
+            first_token = self.latency.sample_first_token(self._rng)
+
+        text = self.answer(prompt)
+        for sequence in stop or ():
+            text = text.split(sequence, 1)[0]
+
+        with self._lock:
+            stats = self._stats
+            stats.calls += 1
+            stats.prompt_tokens += approximate_token_count(prompt)
+            stats.completion_tokens += approximate_token_count(text)
+            stats.in_flight += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+            per_token = self.latency.seconds_per_token()
+            stats.simulated_seconds += first_token + per_token * approximate_token_count(text)
+        return text, first_token, per_token
+
+    def _end(self) -> None:
+        with self._lock:
+            self._stats.in_flight -= 1
+
+    @staticmethod
+    def _pieces(text: str) -> list[str]:
+        return re.findall(r"\s*\S+", text) or [text]
+
+    # ---------------------------
+    # LangChain LLM interface
+    # ---------------------------
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        text, first_token, per_token = self._begin(prompt, stop)
+        try:
+            time.sleep(first_token + per_token * approximate_token_count(text))
+        finally:
+            self._end()
+        return text
+
+    async def _acall(
+        self,
+        prompt: str,
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        text, first_token, per_token = self._begin(prompt, stop)
+        try:
+            await asyncio.sleep(first_token + per_token * approximate_token_count(text))
+        finally:
+            self._end()
+        return text
+
+    def _stream(
+        self,
+        prompt: str,
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[GenerationChunk]:
+        text, first_token, per_token = self._begin(prompt, stop)
+        try:
+            time.sleep(first_token)
+            for piece in self._pieces(text):
+                time.sleep(per_token * approximate_token_count(piece))
+                chunk = GenerationChunk(text=piece)
+                if run_manager:
+                    run_manager.on_llm_new_token(piece, chunk=chunk)
+                yield chunk
+        finally:
+            self._end()
+
+    async def _astream(
+        self,
+        prompt: str,
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[GenerationChunk]:
+        text, first_token, per_token = self._begin(prompt, stop)
+        try:
+            await asyncio.sleep(first_token)
+            for piece in self._pieces(text):
+                await asyncio.sleep(per_token * approximate_token_count(piece))
+                chunk = GenerationChunk(text=piece)
+                if run_manager:
+                    await run_manager.on_llm_new_token(piece, chunk=chunk)
+                yield chunk
+        finally:
+            self._end()
+
+
+if __name__ == "__main__":
+    llm = FakeLLM(latency=LATENCY_PROFILES["gemini-flash"], seed=0)
+
+    for prompt in [
+        "System: ... ONLY output one word: 'booker', 'info', or 'unclear'.\nHuman: Book me a flight to London.",
+        "System: ... ONLY output one word: 'booker', 'info', or 'unclear'.\nHuman: What is the capital of Italy?",
+        "System: ... respond with: CODE_IS_PERFECT\nHuman: Code to Review: def f(): ...",
+    ]:
+        start = time.perf_counter()
+        print(f"{llm.invoke(prompt)!r:20} {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    first = None
+    for piece in llm.stream("Write a short note about agents."):
+        first = first or time.perf_counter() - start
+    print(f"stream: first token {first:.2f}s, done {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    llm.batch([f"Question {i}" for i in range(5)])
+    print(f"batch of 5: {time.perf_counter() - start:.2f}s (sequential, like GoogleGenerativeAI.batch)")
+
+    async def concurrent(count: int):
+        await asyncio.gather(*(llm.ainvoke(f"Question {i}") for i in range(count)))
+
+    llm.reset_stats()
+    start = time.perf_counter()
+    asyncio.run(concurrent(5))
+    print(f"5 concurrent ainvoke: {time.perf_counter() - start:.2f}s, peak in flight {llm.stats.peak_in_flight}")
+
+    limited = FakeLLM(latency=LATENCY_PROFILES["instant"], requests_per_minute=5)
+    rejected = 0
+    for _ in range(8):
+        try:
+            limited.invoke("hi")
+        except RateLimitError:
+            rejected += 1
+    print(f"quota of 5/min: {rejected} of 8 calls got a 429")
+    print(llm.stats.as_dict())
@@ -0,0 +1,174 @@
+"""
+Import-Time Benchmark for the Pattern Modules
+=============================================
+
+The pattern scripts are imported inside long-running workers, so importing one
+must be cheap and must not set up an API client. This benchmark checks both:
+
+1. Every module is imported in a fresh interpreter, by file path (several
+   folders contain spaces or dots and are not packages).
+2. Before the import, `GoogleGenerativeAI.__init__` and
+   `ChatGoogleGenerativeAI.__init__` are patched to raise, and so is
+   `socket.socket.connect`. A module that builds an LLM or opens a connection
+   at import time fails the benchmark.
+3. The libraries that every pattern shares (langchain_core and
+   langchain_google_genai) are imported first and timed separately. Their
+   cost depends on the machine and the installed extras, not on our code, so
+   the budget applies to the time the module itself adds on top.
+4. Each module is measured `REPEATS` times and the fastest run is compared
+   with its budget.
+
+Requirements:
+-------------
+The dependencies of the pattern modules (langchain, langchain_core,
+langchain_community, langchain_google_genai). No API key is needed.
+
+Usage:
+------
+    python benchmarks/import_time_benchmark.py
+
+Exits with status 1 if any module is over budget or builds a client at import.
+Set IMPORT_BUDGET_SCALE (e.g. to 2) on slow machines to scale every budget.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REPEATS = 3
+
+# Shared third-party imports, timed before the module itself
+BASELINE_IMPORTS = (
+    "langchain_core.prompts",
+    "langchain_core.output_parsers",
+    "langchain_core.runnables",
+    "langchain_google_genai",
+)
+
+# Module path → budget in seconds on top of BASELINE_IMPORTS.
+# Modules that also pull in `langchain` agents/chains/memory get more room.
+MODULE_BUDGETS = {
+    "Phase_00_LLM_Engineering_Basics/2_prompt_engineering/zero_shot_example.py": 0.3,
+    "Phase_00_LLM_Engineering_Basics/2_prompt_engineering/few_shot_example.py": 0.3,
+    "Phase_00_LLM_Engineering_Basics/2_prompt_engineering/chain_of_thought_demo.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/0_langchain_basic_concepts/langchain_basics.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/0_langchain_basic_concepts/batch_name_generation.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/1_Prompt_Chaining/prompt_chaining.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/2_Routing/routing_pattern.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/2_Routing/local_router.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/2_Routing/micro_batch_router.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/3_Parallelization/gemini_scheduler.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/3_Parallelization/parallelization _example.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/3_Parallelization/programming_language_guide_parallel.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/4.1_mini_project/solution.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/4.1_mini_project/speculative_routing.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/4_Reflection/reflection_pattern.py": 0.3,
+    "Phase_01_Fundamentals_and_Basic_Agents/5_Tool_Use/tool_use.py": 1.0,
+    "Phase_01_Fundamentals_and_Basic_Agents/5.1_mini_project/solution.py": 1.0,
+    "Phase_01_Fundamentals_and_Basic_Agents/6_Planning/planning_pattern.py": 1.0,
+    "Phase_01_Fundamentals_and_Basic_Agents/7_Multi_Agent_Collaboration/multi_agent_collabration.py": 1.0,
+    "Phase_02_Memory_Learning_and_Goals/8_Memory_Management/chat_message_history.py": 1.0,
+    "Phase_02_Memory_Learning_and_Goals/8_Memory_Management/conversation_summary_memory.py": 1.0,
+}
+
+# Runs in the child interpreter: argv[1] = module path, argv[2:] = baseline imports
+_CHILD = r"""
+import importlib, importlib.util, json, socket, sys, time
+
+start = time.perf_counter()
+for name in sys.argv[2:]:
+    importlib.import_module(name)
+baseline = time.perf_counter() - start
+
+from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAI
+
+def forbidden(what):
+    def fail(*args, **kwargs):
+        raise RuntimeError(f"{what} at import time")
+    return fail
+
+GoogleGenerativeAI.__init__ = forbidden("GoogleGenerativeAI constructed")
+ChatGoogleGenerativeAI.__init__ = forbidden("ChatGoogleGenerativeAI constructed")
+socket.socket.connect = forbidden("network connection opened")
+
+path = sys.argv[1]
+sys.path.insert(0, path.rsplit("/", 1)[0])  # sibling imports, as when run as a script
+spec = importlib.util.spec_from_file_location("pattern_module", path)
+module = importlib.util.module_from_spec(spec)
+
+start = time.perf_counter()
+error = None
+try:
+    spec.loader.exec_module(module)
+except Exception as exc:
+    error = f"{type(exc).__name__}: {exc}"
+seconds = time.perf_counter() - start
+
+print(json.dumps({"baseline": baseline, "module": seconds, "error": error}))
+"""
+
+
+def measure_import(path: Path) -> dict:
+    """
+    Import one module in a fresh interpreter.
+
+    Args:
+        path (Path): The module file.
+
+    Returns:
+        dict: Baseline seconds, module seconds and the import error (or None).
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(path), *BASELINE_IMPORTS],
+        capture_output=True, text=True, cwd=path.parent,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if completed.returncode != 0 or not completed.stdout.strip():
+        lines = completed.stderr.strip().splitlines() or [f"exit status {completed.returncode}"]
+        return {"baseline": 0.0, "module": 0.0, "error": lines[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(repeats: int = REPEATS, scale: float = 1.0) -> list[dict]:
+    """
+    Measure every module in MODULE_BUDGETS.
+
+    Args:
+        repeats (int): Fresh-interpreter imports per module; the fastest counts.
+        scale (float): Multiplier applied to every budget.
+
+    Returns:
+        list[dict]: One row per module with its timings, budget and verdict.
+    """
+    rows = []
+    for relative_path, budget in MODULE_BUDGETS.items():
+        runs = [measure_import(REPO_ROOT / relative_path) for _ in range(repeats)]
+        error = next((run["error"] for run in runs if run["error"]), None)
+        best = min(runs, key=lambda run: run["module"])
+        rows.append({
+            "module": relative_path,
+            "baseline_s": best["baseline"],
+            "module_s": best["module"],
+            "budget_s": budget * scale,
+            "error": error,
+            "ok": error is None and best["module"] <= budget * scale,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    rows = run_benchmark(scale=float(os.getenv("IMPORT_BUDGET_SCALE", "1")))
+
+    print(f"{'module':96} {'shared':>7} {'own':>7} {'budget':>7}")
+    print("-" * 121)
+    for row in rows:
+        status = "ok" if row["ok"] else f"FAIL {row['error'] or 'over budget'}"
+        print(f"{row['module']:96} {row['baseline_s']:6.2f}s {row['module_s']:6.3f}s "
+              f"{row['budget_s']:6.2f}s  {status}")
+
+    failures = [row for row in rows if not row["ok"]]
+    print(f"\n{len(rows) - len(failures)}/{len(rows)} modules within budget")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,121 @@
+"""
+Benchmark for the Language Guide Pipeline and its Batch Mode
+============================================================
+
+1. Build cost: `run_pipeline` used to build the LLM and all four chains on
+   every call. This measures a call that rebuilds the pipeline against a call
+   on the pipeline built once (FakeLLM "instant": only orchestration time).
+2. Batch mode with resume: `agenerate_guides` runs for LANGUAGES languages
+   and is cancelled part-way (as if the process were interrupted). A second
+   run then finishes the job. The report shows what each run generated, the
+   LLM calls of the second run (only the unfinished languages should cost
+   calls), and whether every guide ended up on disk.
+
+Usage:
+------
+    python benchmarks/language_guide_batch_benchmark.py
+
+Environment variables:
+    GUIDE_BENCH_LANGUAGES     languages in the batch (default 300)
+    GUIDE_BENCH_CONCURRENCY   max_concurrency of the batch (default 32)
+    GUIDE_BENCH_PROFILE       FakeLLM latency profile of the batch (default "gemini-flash")
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from fake_llm import LATENCY_PROFILES, FakeLLM
+from pattern_benchmark_suite import PHASE_01, load_module
+
+CALLS_PER_GUIDE = 4  # explanation, frameworks, projects, synthesis
+INTERRUPT_AFTER = 0.4  # share of the expected batch time before the first run is cancelled
+
+BASE_LANGUAGES = [
+    "Python", "Rust", "Go", "C", "C++", "C#", "Java", "Kotlin", "Swift", "Ruby", "PHP", "Perl", "Haskell",
+    "OCaml", "F#", "Scala", "Clojure", "Elixir", "Erlang", "Julia", "R", "MATLAB", "Fortran", "COBOL", "Lua",
+    "Dart", "TypeScript", "JavaScript", "Zig", "Nim", "Crystal", "Racket", "Scheme", "Prolog", "Ada",
+]
+
+
+def languages(count: int) -> list[str]:
+    """
+    `count` distinct language names (real names, then numbered dialects of them).
+    """
+    names = []
+    for index in range(count):
+        name = BASE_LANGUAGES[index % len(BASE_LANGUAGES)]
+        names.append(name if index < len(BASE_LANGUAGES) else f"{name} dialect {index // len(BASE_LANGUAGES)}")
+    return names
+
+
+def build_cost(module, calls: int = 200) -> dict:
+    llm = FakeLLM(latency=LATENCY_PROFILES["instant"], seed=0)
+    inputs = {"programming_language": "Python"}
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        module.build_guide_chain(llm).invoke(inputs)
+    rebuilt = (time.perf_counter() - start) / calls
+
+    chain = module.build_guide_chain(llm)
+    start = time.perf_counter()
+    for _ in range(calls):
+        chain.invoke(inputs)
+    reused = (time.perf_counter() - start) / calls
+    return {"rebuild_ms": 1000 * rebuilt, "reuse_ms": 1000 * reused}
+
+
+def interrupted_batch(module, names: list[str], concurrency: int, profile: str) -> dict:
+    latency = LATENCY_PROFILES[profile]
+    llm = FakeLLM(latency=latency, seed=0)
+    chain = module.build_guide_chain(llm)
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Rough batch time: two sequential rounds of calls (parallel, then synthesis) per language
+        expected = 2 * max(latency.median_s, 0.01) * len(names) / concurrency
+        start = time.perf_counter()
+        try:
+            asyncio.run(asyncio.wait_for(
+                module.agenerate_guides(names, output_dir, concurrency, chain), INTERRUPT_AFTER * expected))
+        except (asyncio.TimeoutError, TimeoutError):
+            pass
+        first_seconds = time.perf_counter() - start
+        first_done = len(module.GuideCheckpoint(Path(output_dir) / "progress.jsonl").finished)
+        first_calls = llm.stats.calls
+
+        llm.reset_stats()
+        stats = module.generate_guides(names, output_dir, concurrency, chain)
+        on_disk = len(list(Path(output_dir).glob("*.md")))
+
+    return {
+        "first_run": {"seconds": first_seconds, "guides": first_done, "calls": first_calls,
+                      "wasted_calls": first_calls - CALLS_PER_GUIDE * first_done},
+        "resume": {"seconds": stats.seconds, "skipped": stats.skipped, "generated": stats.generated,
+                   "failed": len(stats.failed), "calls": llm.stats.calls,
+                   "expected_calls": CALLS_PER_GUIDE * (len(names) - first_done)},
+        "guides_on_disk": on_disk,
+    }
+
+
+if __name__ == "__main__":
+    count = int(os.getenv("GUIDE_BENCH_LANGUAGES", "300"))
+    concurrency = int(os.getenv("GUIDE_BENCH_CONCURRENCY", "32"))
+    profile = os.getenv("GUIDE_BENCH_PROFILE", "gemini-flash")
+    module = load_module(f"{PHASE_01}/3_Parallelization/programming_language_guide_parallel.py")
+
+    cost = build_cost(module)
+    print("Pipeline per call (FakeLLM instant, orchestration only)")
+    print(f"  rebuilt every call : {cost['rebuild_ms']:.2f} ms")
+    print(f"  built once         : {cost['reuse_ms']:.2f} ms")
+
+    report = interrupted_batch(module, languages(count), concurrency, profile)
+    first, resume = report["first_run"], report["resume"]
+    print(f"\nBatch of {count} languages, max_concurrency {concurrency}, FakeLLM profile {profile}")
+    print(f"  interrupted run : {first['guides']} guides in {first['seconds']:.1f}s, {first['calls']} calls "
+          f"({first['wasted_calls']} lost with the cancelled languages)")
+    print(f"  resumed run     : {resume['skipped']} skipped, {resume['generated']} generated, "
+          f"{resume['failed']} failed in {resume['seconds']:.1f}s, "
+          f"{resume['calls']} calls (expected {resume['expected_calls']})")
+    print(f"  guides on disk  : {report['guides_on_disk']} of {count}")
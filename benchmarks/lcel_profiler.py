@@ -0,0 +1,413 @@
+"""
+Orchestration-Overhead Profiler for LCEL Runnables
+==================================================
+
+When the LLM is fast (cached, local or the FakeLLM), the glue around it
+becomes a measurable share of every request: dict mapping,
+`RunnablePassthrough.assign`, `RunnableParallel`, `RunnableBranch`, lambdas,
+prompt formatting and output parsing. This profiler shows what each node of
+a composed chain costs.
+
+How it works:
+-------------
+Every LCEL runnable reports `on_chain_start` / `on_chain_end` (LLMs report
+`on_llm_start` / `on_llm_end`) to the callbacks in its config, together with
+its own run id and its parent's run id. `NodeProfiler` is such a callback. It
+rebuilds the call tree, so nothing in the chain has to be wrapped or changed.
+Per node it records:
+
+- wall time, and self time: wall time minus the time covered by its children.
+  Children that run in parallel are merged as one interval, so self time is
+  never negative.
+- net allocated blocks: `sys.getallocatedblocks()` at the end minus at the
+  start, the objects the node left alive. This counter is process-wide, so
+  parallel branches blur into each other. Profile with `max_concurrency=1` to
+  attribute allocations exactly.
+- thread hops: the node runs on a different thread than its parent (for
+  example, the `RunnableParallel` branches running in the thread pool).
+
+Nodes are aggregated by their stack (root;child;...;node) over all runs.
+
+Outputs:
+--------
+- a table sorted by self time, with each stack's share of the profiled
+  wall time. Parallel branches each count their own time, so the shares can
+  add up to more than 100%.
+- the orchestration share of the request: self time of every non-LLM node,
+  minus the profiler's own cost, over the latency measured without the
+  profiler (see below).
+- `<target>.folded`: folded stacks in microseconds of self time, one line per
+  stack, for flamegraph.pl, speedscope or inferno
+- `<target>.trace.json`: Chrome trace events for the first profiled run, one
+  row per thread (chrome://tracing or ui.perfetto.dev)
+
+The callbacks themselves cost time, and almost all of it lands in the self
+time of chain nodes (a node's clock starts before its callbacks run and stops
+after them). The latency is therefore also measured without the profiler; the
+difference (the callback cost per run) is taken out of the orchestration time,
+and the share is computed against the unprofiled latency. Without an
+unprofiled measurement, `format_report` reports the raw, inflated share and
+says so.
+
+Usage:
+------
+    python benchmarks/lcel_profiler.py
+    LCEL_PROFILE_TARGETS=parallelization LCEL_PROFILE_MAX_CONCURRENCY=1 python benchmarks/lcel_profiler.py
+
+Environment variables:
+    LCEL_PROFILE_TARGETS          comma-separated targets (default "routing,parallelization")
+    LCEL_PROFILE_RUNS             profiled invocations per target (default 200)
+    LCEL_PROFILE_BACKEND          backend, as in pattern_benchmark_suite.py (default "fake:instant")
+    LCEL_PROFILE_MAX_CONCURRENCY  max_concurrency passed to the chain (default: unset)
+    LCEL_PROFILE_OUTPUT_DIR       where the .folded / .trace.json files go (default ".")
+
+Any other runnable can be profiled from code:
+
+    >>> profiler = profile_runnable(chain, [{"topic": "Quantum Computing"}], runs=50)
+    >>> plain_ms = mean_latency_ms(chain, [{"topic": "Quantum Computing"}], runs=50)
+    >>> print(format_report(profiler.aggregate(), profiler.runs, unprofiled_ms=plain_ms))
+"""
+
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from pattern_benchmark_suite import PHASE_01, build_backend, load_module
+
+
+# ---------------------------
+# Call tree recording
+# ---------------------------
+@dataclass
+class Node:
+    """
+    One runnable invocation inside a profiled run.
+    """
+    run_id: object
+    parent_id: object
+    name: str
+    kind: str  # "chain", "llm" or "tool"
+    thread: int
+    start_ns: int
+    blocks_start: int
+    end_ns: int = 0
+    blocks_end: int = 0
+    children: list = field(default_factory=list)
+
+    @property
+    def wall_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    def self_ns(self) -> int:
+        """
+        Wall time not covered by any child (overlapping children merged).
+        """
+        covered, current_start, current_end = 0, None, None
+        for child in sorted(self.children, key=lambda node: node.start_ns):
+            if current_end is None or child.start_ns > current_end:
+                if current_end is not None:
+                    covered += current_end - current_start
+                current_start, current_end = child.start_ns, child.end_ns
+            else:
+                current_end = max(current_end, child.end_ns)
+        if current_end is not None:
+            covered += current_end - current_start
+        return max(self.wall_ns - covered, 0)
+
+
+@dataclass
+class PathStats:
+    """
+    Totals for one stack (root;...;node) over all profiled runs.
+    """
+    path: tuple
+    kind: str
+    calls: int = 0
+    wall_ns: int = 0
+    self_ns: int = 0
+    net_blocks: int = 0
+    thread_hops: int = 0
+
+
+def _node_name(serialized, kwargs, fallback: str) -> str:
+    if kwargs.get("name"):
+        return kwargs["name"]
+    serialized = serialized or {}
+    if serialized.get("name"):
+        return serialized["name"]
+    if serialized.get("id"):
+        return serialized["id"][-1]
+    return fallback
+
+
+class NodeProfiler(BaseCallbackHandler):
+    """
+    Callback handler that records the call tree of every run it sees.
+
+    Pass it in the config of the top-level call:
+    `chain.invoke(inputs, config={"callbacks": [profiler]})`.
+    """
+
+    run_inline = True  # record on the thread the node actually runs on
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: dict = {}
+        self.roots: list[Node] = []
+
+    @property
+    def runs(self) -> int:
+        return len(self.roots)
+
+    def _start(self, run_id, parent_run_id, name: str, kind: str) -> None:
+        node = Node(run_id, parent_run_id, name, kind, threading.get_ident(),
+                    time.perf_counter_ns(), sys.getallocatedblocks())
+        with self._lock:
+            self._open[run_id] = node
+            parent = self._open.get(parent_run_id)
+            if parent is not None:
+                parent.children.append(node)
+            else:
+                self.roots.append(node)
+
+    def _end(self, run_id) -> None:
+        end_ns, blocks = time.perf_counter_ns(), sys.getallocatedblocks()
+        with self._lock:
+            node = self._open.get(run_id)
+            if node is None:
+                return
+            node.end_ns, node.blocks_end = end_ns, blocks
+            if node.parent_id not in self._open:
+                self._forget(node)
+
+    def _forget(self, node: Node) -> None:
+        # A finished root: its subtree no longer needs to be looked up by id
+        for child in node.children:
+            self._forget(child)
+        self._open.pop(node.run_id, None)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs) -> None:
+        self._start(run_id, parent_run_id, _node_name(serialized, kwargs, "chain"), "chain")
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs) -> None:
+        self._start(run_id, parent_run_id, _node_name(serialized, kwargs, "llm"), "llm")
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs) -> None:
+        self._start(run_id, parent_run_id, _node_name(serialized, kwargs, "chat_model"), "llm")
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs) -> None:
+        self._start(run_id, parent_run_id, _node_name(serialized, kwargs, "tool"), "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+
+    def aggregate(self) -> dict[tuple, PathStats]:
+        """
+        Totals per stack over every recorded run.
+
+        Returns:
+            dict[tuple, PathStats]: Stack (tuple of node names) → totals.
+        """
+        totals: dict[tuple, PathStats] = {}
+
+        def visit(node: Node, parent_path: tuple, parent_thread: int | None) -> None:
+            path = parent_path + (node.name,)
+            stats = totals.setdefault(path, PathStats(path, node.kind))
+            stats.calls += 1
+            stats.wall_ns += node.wall_ns
+            stats.self_ns += node.self_ns()
+            stats.net_blocks += node.blocks_end - node.blocks_start - sum(
+                child.blocks_end - child.blocks_start for child in node.children)
+            stats.thread_hops += parent_thread is not None and node.thread != parent_thread
+            for child in node.children:
+                visit(child, path, node.thread)
+
+        for root in self.roots:
+            visit(root, (), None)
+        return totals
+
+
+# ---------------------------
+# Outputs
+# ---------------------------
+def folded_stacks(totals: dict[tuple, PathStats]) -> str:
+    """
+    Folded-stack lines ("root;child;node <self µs>") for flame-graph tools.
+    """
+    lines = [f"{';'.join(path)} {stats.self_ns // 1000}" for path, stats in totals.items() if stats.self_ns >= 1000]
+    return "\n".join(sorted(lines)) + "\n"
+
+
+def chrome_trace(root: Node) -> dict:
+    """
+    Chrome trace events ("X" complete events) for one run, one row per thread.
+    """
+    events, thread_rows = [], {}
+
+    def visit(node: Node) -> None:
+        tid = thread_rows.setdefault(node.thread, len(thread_rows))
+        events.append({
+            "name": node.name, "cat": node.kind, "ph": "X", "pid": 0, "tid": tid,
+            "ts": (node.start_ns - root.start_ns) / 1000, "dur": node.wall_ns / 1000,
+            "args": {"self_us": node.self_ns() / 1000, "net_blocks": node.blocks_end - node.blocks_start},
+        })
+        for child in node.children:
+            visit(child)
+
+    visit(root)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def format_report(totals: dict[tuple, PathStats], runs: int, limit: int = 25,
+                  unprofiled_ms: float | None = None) -> str:
+    """
+    Table of the most expensive stacks by self time, per run.
+
+    Args:
+        totals (dict[tuple, PathStats]): Output of `NodeProfiler.aggregate()`.
+        runs (int): Number of profiled runs.
+        limit (int): Rows to show.
+        unprofiled_ms (float | None): Mean latency measured without the profiler
+                                      (`mean_latency_ms`). When given, the callback
+                                      cost is removed from the orchestration share.
+    """
+    root_wall = sum(stats.wall_ns for path, stats in totals.items() if len(path) == 1)
+    glue_self = sum(stats.self_ns for stats in totals.values() if stats.kind == "chain")
+    lines = [
+        f"{'self ms/run':>11} {'self %':>7} {'wall ms/run':>11} {'calls/run':>9} "
+        f"{'blocks/run':>10} {'hops/run':>8}  stack",
+        "-" * 110,
+    ]
+    for stats in sorted(totals.values(), key=lambda item: item.self_ns, reverse=True)[:limit]:
+        share = 100 * stats.self_ns / root_wall if root_wall else 0.0
+        stack = " > ".join(stats.path[-3:]) if len(stats.path) <= 3 else "… > " + " > ".join(stats.path[-3:])
+        lines.append(
+            f"{stats.self_ns / runs / 1e6:11.3f} {share:6.1f}% {stats.wall_ns / runs / 1e6:11.3f} "
+            f"{stats.calls / runs:9.1f} {stats.net_blocks / runs:10.1f} {stats.thread_hops / runs:8.1f}  "
+            f"[{stats.kind}] {stack}"
+        )
+    if root_wall:
+        profiled_ms, glue_ms = root_wall / runs / 1e6, glue_self / runs / 1e6
+        lines.append("-" * 110)
+        if unprofiled_ms is None:
+            lines.append(
+                f"wall {profiled_ms:.3f} ms/run, orchestration (self time of non-LLM nodes) "
+                f"{glue_ms:.3f} ms/run = {100 * glue_ms / profiled_ms:.1f}% (includes the profiler's own cost)"
+            )
+        else:
+            callback_ms = max(profiled_ms - unprofiled_ms, 0.0)
+            orchestration_ms = max(glue_ms - callback_ms, 0.0)
+            share = 100 * orchestration_ms / unprofiled_ms if unprofiled_ms else 0.0
+            lines.append(
+                f"wall {unprofiled_ms:.3f} ms/run without profiler ({profiled_ms:.3f} with, callback cost "
+                f"{callback_ms:.3f}), orchestration {glue_ms:.3f} - {callback_ms:.3f} = "
+                f"{orchestration_ms:.3f} ms/run = {share:.1f}%"
+            )
+    return "\n".join(lines)
+
+
+# ---------------------------
+# Profiling entry points
+# ---------------------------
+def profile_runnable(runnable, inputs: list, runs: int = 100, config: dict | None = None,
+                     profiler: NodeProfiler | None = None) -> NodeProfiler:
+    """
+    Invoke a runnable `runs` times (cycling through `inputs`) under a NodeProfiler.
+
+    Args:
+        runnable: Any LCEL runnable.
+        inputs (list): Inputs to cycle through.
+        runs (int): Number of profiled invocations.
+        config (dict | None): Extra config (e.g. {"max_concurrency": 1}).
+        profiler (NodeProfiler | None): Profiler to record into (default: a new one).
+
+    Returns:
+        NodeProfiler: The profiler holding every recorded run.
+    """
+    profiler = profiler or NodeProfiler()
+    config = dict(config or {})
+    config["callbacks"] = [*config.get("callbacks", []), profiler]
+    for index in range(runs):
+        runnable.invoke(inputs[index % len(inputs)], config=config)
+    return profiler
+
+
+def mean_latency_ms(runnable, inputs: list, runs: int, config: dict | None = None) -> float:
+    """
+    Mean latency of `runs` invocations, without the profiler.
+    """
+    durations = []
+    for index in range(runs):
+        start = time.perf_counter()
+        runnable.invoke(inputs[index % len(inputs)], config=config)
+        durations.append(time.perf_counter() - start)
+    return 1000 * statistics.fmean(durations)
+
+
+def _routing(llm):
+    agent = load_module(f"{PHASE_01}/2_Routing/routing_pattern.py").build_coordinator_agent(llm)
+    inputs = ["Book me a flight to London.", "What is the capital of Italy?", "Tell me about quantum physics."]
+    return agent, [{"request": request} for request in inputs]
+
+
+def _parallelization(llm):
+    chain = load_module(f"{PHASE_01}/3_Parallelization/parallelization _example.py").build_full_parallel_chain(llm)
+    inputs = ["The History of Space Exploration", "Quantum Computing", "The Roman Empire"]
+    return chain, [{"topic": topic} for topic in inputs]
+
+
+# Target name → setup(llm) returning (runnable, inputs)
+TARGETS = {
+    "routing": _routing,
+    "parallelization": _parallelization,
+}
+
+
+if __name__ == "__main__":
+    targets = [name.strip() for name in os.getenv("LCEL_PROFILE_TARGETS", ",".join(TARGETS)).split(",") if name.strip()]
+    runs = int(os.getenv("LCEL_PROFILE_RUNS", "200"))
+    backend = os.getenv("LCEL_PROFILE_BACKEND", "fake:instant")
+    output_dir = Path(os.getenv("LCEL_PROFILE_OUTPUT_DIR", "."))
+    config = {}
+    if os.getenv("LCEL_PROFILE_MAX_CONCURRENCY"):
+        config["max_concurrency"] = int(os.environ["LCEL_PROFILE_MAX_CONCURRENCY"])
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for target in targets:
+        runnable, inputs = TARGETS[target](build_backend(backend))
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):  # handlers print progress
+            for request in inputs:  # warm-up: lazy imports, caches
+                runnable.invoke(request, config=config)
+            plain_ms = mean_latency_ms(runnable, inputs, runs, config)
+            profiler = profile_runnable(runnable, inputs, runs, config)
+        totals = profiler.aggregate()
+
+        (output_dir / f"{target}.folded").write_text(folded_stacks(totals))
+        (output_dir / f"{target}.trace.json").write_text(json.dumps(chrome_trace(profiler.roots[0])))
+
+        print(f"\n=== {target} ({backend}, {runs} runs) ===")
+        print(format_report(totals, profiler.runs, unprofiled_ms=plain_ms))
+        print(f"wrote {output_dir / f'{target}.folded'} and {output_dir / f'{target}.trace.json'}")
@@ -0,0 +1,112 @@
+"""
+Load Benchmark for the Micro-Batching Router
+============================================
+
+Sends an open-loop stream of routing requests (Poisson arrivals at QPS
+requests per second) through:
+
+- unbatched : `build_router_chain().invoke`, one LLM call per request
+- batched   : `MicroBatchRouter` at several `max_wait_ms` windows
+
+and reports LLM calls per request, routing latency (p50 / p95) and the
+queueing delay the batching window adds. The FakeLLM drops LINE_DROP_RATE of
+the numbered answer lines, so the per-item fallback is exercised too.
+
+Usage:
+------
+    python benchmarks/micro_batch_router_benchmark.py
+
+Environment variables:
+    ROUTER_BATCH_QPS        arrival rate (default 200)
+    ROUTER_BATCH_REQUESTS   requests per configuration (default 600)
+    ROUTER_BATCH_PROFILE    FakeLLM latency profile (default "gemini-flash")
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_llm import LATENCY_PROFILES, FakeLLM, route_coordinator_numbered
+from pattern_benchmark_suite import PHASE_01, load_module, percentile
+
+LINE_DROP_RATE = 0.02
+WINDOWS_MS = (5, 10, 20)
+
+REQUESTS = [
+    "Book me a flight to London.", "What is the capital of Italy?", "Reserve a hotel in Paris for Friday.",
+    "Who painted the Mona Lisa?", "Do the thing.", "How tall is Mount Everest?", "Get me a train ticket to Berlin.",
+    "Hmm.", "Explain how vaccines work.", "Book a table for two tonight.",
+]
+
+
+def lossy_numbered_router(seed: int = 0):
+    """
+    FakeLLM rule: the numbered router answer with some lines missing.
+    """
+    rng = random.Random(seed)
+
+    def respond(prompt: str) -> str:
+        lines = route_coordinator_numbered(prompt).splitlines()
+        return "\n".join(line for line in lines if rng.random() >= LINE_DROP_RATE)
+
+    return respond
+
+
+def open_loop(route, count: int, qps: float, seed: int = 0) -> list[float]:
+    """
+    Submit `count` requests at Poisson arrival times; return each routing latency.
+    """
+    rng = random.Random(seed)
+    latencies = []
+
+    def client(request: str) -> None:
+        start = time.perf_counter()
+        route(request)
+        latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=512) as pool:
+        next_arrival = time.perf_counter()
+        for index in range(count):
+            next_arrival += rng.expovariate(qps)
+            time.sleep(max(next_arrival - time.perf_counter(), 0))
+            pool.submit(client, REQUESTS[index % len(REQUESTS)])
+    return latencies
+
+
+def run(qps: float = 200, count: int = 600, profile: str = "gemini-flash") -> list[dict]:
+    module = load_module(f"{PHASE_01}/2_Routing/micro_batch_router.py")
+    marker = '"<number>. <decision>"'
+    rows = []
+
+    llm = FakeLLM(latency=LATENCY_PROFILES[profile], seed=0)
+    chain = module.build_router_chain(llm)
+    latencies = open_loop(lambda request: chain.invoke({"request": request}), count, qps)
+    rows.append({"config": "unbatched", "calls_per_request": llm.stats.calls / count,
+                 "p50_ms": 1000 * percentile(latencies, 50), "p95_ms": 1000 * percentile(latencies, 95),
+                 "queue_p50_ms": 0.0, "queue_p95_ms": 0.0, "mean_batch": 1.0, "fallbacks": 0})
+
+    for window in WINDOWS_MS:
+        llm = FakeLLM(latency=LATENCY_PROFILES[profile], rules=[(marker, lossy_numbered_router())], seed=0)
+        with module.MicroBatchRouter(llm, max_wait_ms=window, max_batch=32, max_in_flight=16) as router:
+            latencies = open_loop(router.route, count, qps)
+        summary = router.stats.summary()
+        rows.append({"config": f"batched {window} ms", "calls_per_request": llm.stats.calls / count,
+                     "p50_ms": 1000 * percentile(latencies, 50), "p95_ms": 1000 * percentile(latencies, 95),
+                     "queue_p50_ms": summary["queue_delay_p50_ms"], "queue_p95_ms": summary["queue_delay_p95_ms"],
+                     "mean_batch": summary["mean_batch_size"], "fallbacks": summary["fallback_calls"]})
+    return rows
+
+
+if __name__ == "__main__":
+    qps = float(os.getenv("ROUTER_BATCH_QPS", "200"))
+    count = int(os.getenv("ROUTER_BATCH_REQUESTS", "600"))
+    profile = os.getenv("ROUTER_BATCH_PROFILE", "gemini-flash")
+    rows = run(qps, count, profile)
+
+    print(f"{count} requests at {qps:.0f} QPS, FakeLLM profile {profile}, {LINE_DROP_RATE:.0%} of packed lines dropped")
+    print(f"{'config':16} {'calls/req':>9} {'batch':>6} {'fallbacks':>9} {'p50':>9} {'p95':>9} {'queue p50':>10} {'queue p95':>10}")
+    print("-" * 86)
+    for row in rows:
+        print(f"{row['config']:16} {row['calls_per_request']:9.3f} {row['mean_batch']:6.1f} {row['fallbacks']:9d} "
+              f"{row['p50_ms']:7.0f}ms {row['p95_ms']:7.0f}ms {row['queue_p50_ms']:8.1f}ms {row['queue_p95_ms']:8.1f}ms")
@@ -0,0 +1,428 @@
+"""
+Cross-Pattern Benchmark Suite
+=============================
+
+Runs a fixed workload through every agentic pattern and reports what each
+request costs, so the patterns can be compared and regressions can be spotted
+between commits.
+
+Patterns:
+---------
+- prompt_chaining    : `full_chain` (extract → transform), 1_Prompt_Chaining
+- prompt_chaining_single_call : the same documents, one structured-output call each
+- prompt_chaining_fast_path   : regex fast path, LLM only for unparsed fields
+- routing            : `coordinator_agent` (LLM router + handlers), 2_Routing
+- parallelization    : `full_parallel_chain` (3 branches + synthesis), 3_Parallelization
+- reflection         : `run_reflection_loop` (producer ↔ critic), 4_Reflection
+- tool_use           : ReAct agent with a search tool, 5_Tool_Use
+- tool_use_mini      : ReAct agent with 7 tools, 5.1_mini_project
+- sequential_blog    : `SequentialChain` research → writer, 7_Multi_Agent_Collaboration
+
+Per pattern it reports:
+-----------------------
+- wall-clock latency per request: p50 / p95 / p99 / mean
+- LLM calls per request
+- prompt / completion tokens per request. Provider usage metadata is used
+  when the backend reports it, otherwise the ~4 characters per token estimate.
+- peak RSS of the process and its growth while the requests ran
+
+Each pattern runs in a fresh interpreter, so imports and memory of one pattern
+do not leak into the next. Requests run one after another, so latency is the
+latency a single user would see.
+
+Backends:
+---------
+- "fake:instant"       FakeLLM with zero latency: pure orchestration overhead (default)
+- "fake:gemini-flash"  FakeLLM with a flash-class latency profile (see fake_llm.py)
+- "fake:slow"          FakeLLM with a slow, long-tailed profile
+- "gemini"             the real GoogleGenerativeAI (needs Gemini_APIKEY, costs money)
+
+Usage:
+------
+    python benchmarks/pattern_benchmark_suite.py
+    PATTERN_BENCH_BACKEND=fake:gemini-flash PATTERN_BENCH_REQUESTS=50 python benchmarks/pattern_benchmark_suite.py
+    python benchmarks/pattern_benchmark_suite.py compare old.json new.json
+
+Environment variables:
+    PATTERN_BENCH_BACKEND    backend name (default "fake:instant")
+    PATTERN_BENCH_REQUESTS   measured requests per pattern (default 30)
+    PATTERN_BENCH_PATTERNS   comma-separated subset of patterns (default: all)
+    PATTERN_BENCH_OUTPUT     JSON results file (default "pattern_benchmark_results.json")
+    PATTERN_BENCH_TOLERANCE  relative slowdown flagged by `compare` (default 0.10)
+"""
+
+import importlib.util
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import warnings
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from fake_llm import LATENCY_PROFILES, FakeLLM, approximate_token_count
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PHASE_01 = "Phase_01_Fundamentals_and_Basic_Agents"
+
+
+# ---------------------------
+# LLM call accounting
+# ---------------------------
+class CallCounter(BaseCallbackHandler):
+    """
+    Callback handler counting LLM calls and tokens, whatever the call path.
+
+    It is attached to the LLM itself (`llm.callbacks`), so it also sees calls
+    that do not go through a chain config, such as the direct `llm.invoke`
+    calls in the reflection loop or the agents' internal LLM chain.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending_prompt_tokens = {}
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self.calls += 1
+            self._pending_prompt_tokens[run_id] = sum(approximate_token_count(prompt) for prompt in prompts)
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        generations = [generation for batch in response.generations for generation in batch]
+        usage = next((
+            (generation.generation_info or {}).get("usage_metadata")
+            for generation in generations
+            if (generation.generation_info or {}).get("usage_metadata")
+        ), None)
+        with self._lock:
+            estimated_prompt = self._pending_prompt_tokens.pop(run_id, 0)
+            if usage:
+                self.prompt_tokens += usage.get("input_tokens", estimated_prompt)
+                self.completion_tokens += usage.get("output_tokens", 0)
+            else:
+                self.prompt_tokens += estimated_prompt
+                self.completion_tokens += sum(approximate_token_count(generation.text) for generation in generations)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self.errors += 1
+            self._pending_prompt_tokens.pop(run_id, None)
+
+
+# ---------------------------
+# Backends and patterns
+# ---------------------------
+def build_backend(name: str):
+    """
+    Create the LLM for a backend name ("fake:<profile>" or "gemini").
+    """
+    if name.startswith("fake"):
+        profile = name.partition(":")[2] or "instant"
+        return FakeLLM(latency=LATENCY_PROFILES[profile], seed=0)
+    if name == "gemini":
+        from langchain_google_genai import GoogleGenerativeAI
+        return GoogleGenerativeAI(model="gemini-2.5-flash", api_key=os.getenv("Gemini_APIKEY"))
+    raise ValueError(f"Unknown backend {name!r}; use fake:<{'|'.join(LATENCY_PROFILES)}> or gemini")
+
+
+def load_module(relative_path: str):
+    """
+    Import a pattern script by file path (its folder may contain spaces or dots).
+    """
+    path = REPO_ROOT / relative_path
+    sys.path.insert(0, str(path.parent))  # sibling imports, as when run as a script
+    spec = importlib.util.spec_from_file_location(path.stem.replace(" ", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _prompt_chaining(llm):
+    chain = load_module(f"{PHASE_01}/1_Prompt_Chaining/prompt_chaining.py").build_full_chain(llm)
+    inputs = [
+        "The new laptop model features a 3.5 GHz octa-core processor, 16GB of RAM, and a 1TB NVMe SSD.",
+        "This workstation ships with a 2.9 GHz 12-core processor, 64GB of RAM and a 2TB NVMe SSD.",
+        "A budget notebook: 2.1 GHz quad-core processor, 8GB RAM, 512GB SSD.",
+    ]
+    return (lambda text: chain.invoke({"text": text})), inputs
+
+
+def _prompt_chaining_mode(mode: str):
+    def setup(llm):
+        chain = load_module(f"{PHASE_01}/1_Prompt_Chaining/prompt_chaining.py").build_chain(mode, llm)
+        inputs = [
+            "The new laptop model features a 3.5 GHz octa-core processor, 16GB of RAM, and a 1TB NVMe SSD.",
+            "This workstation ships with a 2.9 GHz 12-core processor, 64GB of RAM and a 2TB NVMe SSD.",
+            "A budget notebook: 2.1 GHz quad-core processor, 8GB RAM, 512GB SSD.",
+            "Powered by the Snapdragon X Elite chip with 32GB LPDDR5x memory and half a terabyte of flash.",
+        ]
+        return (lambda text: chain.invoke({"text": text})), inputs
+    return setup
+
+
+def _routing(llm):
+    agent = load_module(f"{PHASE_01}/2_Routing/routing_pattern.py").build_coordinator_agent(llm)
+    inputs = ["Book me a flight to London.", "What is the capital of Italy?", "Tell me about quantum physics."]
+    return (lambda request: agent.invoke({"request": request})), inputs
+
+
+def _parallelization(llm):
+    module = load_module(f"{PHASE_01}/3_Parallelization/parallelization _example.py")
+    chain = module.build_full_parallel_chain(llm)
+    inputs = ["The History of Space Exploration", "Quantum Computing", "The Roman Empire"]
+    return (lambda topic: chain.invoke({"topic": topic})), inputs
+
+
+def _reflection(llm):
+    module = load_module(f"{PHASE_01}/4_Reflection/reflection_pattern.py")
+    return (lambda _: module.run_reflection_loop(max_iterations=3, llm=llm)), [None]
+
+
+def _tool_use(llm):
+    module = load_module(f"{PHASE_01}/5_Tool_Use/tool_use.py")
+    executor = module.get_agent_executor(module.get_tools(), llm)
+    executor.verbose = False
+    inputs = ["What is the capital of France?", "What's the weather like in London?", "Tell me something about dogs."]
+    return (lambda query: executor.invoke({"input": query})), inputs
+
+
+def _tool_use_mini(llm):
+    module = load_module(f"{PHASE_01}/5.1_mini_project/solution.py")
+    executor = module.get_agent_executor(llm, module.get_tools())
+    executor.verbose = False
+    inputs = ["Add 12 and 30", "What is the weather in London?", "Tell me a fun fact about the city I live in, Mumbai."]
+    return (lambda query: executor.invoke({"input": query})), inputs
+
+
+def _sequential_blog(llm):
+    module = load_module(f"{PHASE_01}/7_Multi_Agent_Collaboration/multi_agent_collabration.py")
+    chain = module.create_chains(llm, *module.build_prompts())
+    chain.verbose = False
+    return (lambda _: chain.invoke({})), [None]
+
+
+# Pattern name → setup(llm) returning (run one request, workload inputs)
+PATTERNS = {
+    "prompt_chaining": _prompt_chaining,
+    "prompt_chaining_single_call": _prompt_chaining_mode("single_call"),
+    "prompt_chaining_fast_path": _prompt_chaining_mode("fast_path"),
+    "routing": _routing,
+    "parallelization": _parallelization,
+    "reflection": _reflection,
+    "tool_use": _tool_use,
+    "tool_use_mini": _tool_use_mini,
+    "sequential_blog": _sequential_blog,
+}
+
+
+# ---------------------------
+# Measurement
+# ---------------------------
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> float | None:
+    """
+    Peak resident set size of this process in MiB (None where unsupported).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+def run_pattern(name: str, backend: str, requests: int, warmup: int = 1) -> dict:
+    """
+    Measure one pattern in the current process.
+
+    Args:
+        name (str): Key of PATTERNS.
+        backend (str): Backend name, see `build_backend`.
+        requests (int): Measured requests (inputs are cycled).
+        warmup (int): Unmeasured requests run first (lazy imports, caches).
+
+    Returns:
+        dict: Latency percentiles in milliseconds, per-request LLM calls and
+              tokens, failures and memory.
+    """
+    warnings.filterwarnings("ignore")  # deprecation warnings of the legacy agents / chains
+    llm = build_backend(backend)
+    counter = CallCounter()
+    llm.callbacks = [counter]
+    run, inputs = PATTERNS[name](llm)
+
+    durations, failures = [], 0
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):  # the patterns print a lot
+        for index in range(warmup):
+            run(inputs[index % len(inputs)])
+        counter.reset()
+        rss_before = peak_rss_mb()
+
+        for index in range(requests):
+            start = time.perf_counter()
+            try:
+                run(inputs[index % len(inputs)])
+            except Exception:
+                failures += 1
+            durations.append(time.perf_counter() - start)
+
+    rss_after = peak_rss_mb()
+    milliseconds = [duration * 1000 for duration in durations]
+    return {
+        "requests": requests,
+        "failures": failures,
+        "p50_ms": percentile(milliseconds, 50),
+        "p95_ms": percentile(milliseconds, 95),
+        "p99_ms": percentile(milliseconds, 99),
+        "mean_ms": statistics.mean(milliseconds),
+        "llm_calls_per_request": counter.calls / requests,
+        "llm_errors": counter.errors,
+        "prompt_tokens_per_request": counter.prompt_tokens / requests,
+        "completion_tokens_per_request": counter.completion_tokens / requests,
+        "peak_rss_mb": rss_after,
+        "rss_growth_mb": rss_after - rss_before if rss_after is not None else None,
+    }
+
+
+def run_suite(backend: str = "fake:instant", requests: int = 30, patterns: list[str] | None = None) -> dict:
+    """
+    Measure every pattern, each in a fresh interpreter.
+
+    Returns:
+        dict: {"meta": run description, "patterns": {name: measurements}}.
+              A pattern that crashed has {"error": "..."} instead.
+    """
+    results = {}
+    for name in patterns or list(PATTERNS):
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", name, backend, str(requests)],
+            capture_output=True, text=True, cwd=REPO_ROOT,
+        )
+        if completed.returncode == 0:
+            results[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+        else:
+            lines = completed.stderr.strip().splitlines() or [f"exit status {completed.returncode}"]
+            results[name] = {"error": lines[-1]}
+
+    return {"meta": _describe_run(backend, requests), "patterns": results}
+
+
+def _describe_run(backend: str, requests: int) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=REPO_ROOT).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "backend": backend,
+        "requests_per_pattern": requests,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+# ---------------------------
+# Comparing two result files
+# ---------------------------
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "llm_calls_per_request",
+                    "prompt_tokens_per_request", "completion_tokens_per_request", "peak_rss_mb")
+
+
+def compare(old: dict, new: dict, tolerance: float = 0.10) -> list[str]:
+    """
+    Print old → new for every pattern and metric.
+
+    Args:
+        old (dict): Results of the baseline commit.
+        new (dict): Results of the commit under test.
+        tolerance (float): Relative increase reported as a regression.
+
+    Returns:
+        list[str]: "pattern.metric" entries that got worse by more than `tolerance`.
+    """
+    regressions = []
+    print(f"{old['meta'].get('commit')} → {new['meta'].get('commit')} ({new['meta']['backend']})")
+    for name in sorted(set(old["patterns"]) & set(new["patterns"])):
+        before, after = old["patterns"][name], new["patterns"][name]
+        if "error" in before or "error" in after:
+            print(f"{name:28} error: {after.get('error') or before.get('error')}")
+            continue
+        cells = []
+        for metric in COMPARED_METRICS:
+            if before.get(metric) is None or after.get(metric) is None:
+                continue
+            change = (after[metric] - before[metric]) / before[metric] if before[metric] else 0.0
+            flag = " !" if change > tolerance else ""
+            if flag:
+                regressions.append(f"{name}.{metric}")
+            cells.append(f"{metric} {before[metric]:.1f}→{after[metric]:.1f} ({change:+.0%}){flag}")
+        print(f"{name:28} " + " | ".join(cells))
+    return regressions
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        name, backend, requests = sys.argv[2], sys.argv[3], int(sys.argv[4])
+        print(json.dumps(run_pattern(name, backend, requests)))
+
+    elif sys.argv[1:2] == ["compare"]:
+        with open(sys.argv[2]) as old_file, open(sys.argv[3]) as new_file:
+            regressions = compare(json.load(old_file), json.load(new_file),
+                                  float(os.getenv("PATTERN_BENCH_TOLERANCE", "0.10")))
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions) or '-'}")
+        sys.exit(1 if regressions else 0)
+
+    else:
+        selected = os.getenv("PATTERN_BENCH_PATTERNS")
+        report = run_suite(
+            backend=os.getenv("PATTERN_BENCH_BACKEND", "fake:instant"),
+            requests=int(os.getenv("PATTERN_BENCH_REQUESTS", "30")),
+            patterns=selected.split(",") if selected else None,
+        )
+        output = os.getenv("PATTERN_BENCH_OUTPUT", "pattern_benchmark_results.json")
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+        print(f"Backend: {report['meta']['backend']}, {report['meta']['requests_per_pattern']} requests per pattern")
+        print(f"{'pattern':28} {'p50':>9} {'p95':>9} {'p99':>9} {'calls/req':>10} "
+              f"{'prompt tok':>11} {'compl tok':>10} {'peak RSS':>9}")
+        print("-" * 102)
+        for name, row in report["patterns"].items():
+            if "error" in row:
+                print(f"{name:28} error: {row['error']}")
+                continue
+            rss = f"{row['peak_rss_mb']:.0f}MB" if row["peak_rss_mb"] is not None else "n/a"
+            print(f"{name:28} {row['p50_ms']:7.1f}ms {row['p95_ms']:7.1f}ms {row['p99_ms']:7.1f}ms "
+                  f"{row['llm_calls_per_request']:10.1f} {row['prompt_tokens_per_request']:11.0f} "
+                  f"{row['completion_tokens_per_request']:10.0f} {rss:>9}"
+                  + (f"  ({row['failures']} failed)" if row["failures"] else ""))
+        print(f"\nResults written to {output}")
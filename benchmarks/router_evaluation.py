@@ -0,0 +1,152 @@
+"""
+Offline Evaluation of the Local Router vs. the LLM Router
+=========================================================
+
+Evaluates `local_router.py` on held-out requests that are not in its training
+exemplars (EVALUATION_SET), and compares it with the LLM router chain of
+`routing_pattern.py`:
+
+- accuracy of the local classifier alone, the LLM router alone, and the hybrid
+  router (local when confident, LLM otherwise) at several thresholds
+- skip rate: the share of requests the hybrid router decides without a remote call
+- agreement between the hybrid and the LLM router
+- cost per decision: local classification time vs. LLM calls
+
+Backends:
+---------
+- "fake:instant" (default) uses FakeLLM's keyword router as the "LLM". It is a
+  rough stand-in, so its accuracy says little about Gemini's.
+- "gemini" uses the real router chain (needs Gemini_APIKEY; one call per request,
+  made once and reused for every threshold).
+
+Usage:
+------
+    python benchmarks/router_evaluation.py
+    ROUTER_EVAL_BACKEND=gemini python benchmarks/router_evaluation.py
+
+Environment variables:
+    ROUTER_EVAL_BACKEND     backend, as in pattern_benchmark_suite.py (default "fake:instant")
+    ROUTER_EVAL_THRESHOLDS  comma-separated thresholds (default "0.4,0.5,0.6,0.7,0.8,0.9")
+"""
+
+import os
+import time
+
+from pattern_benchmark_suite import PHASE_01, build_backend, load_module
+
+# (request, expected route): none of these are training exemplars
+EVALUATION_SET = [
+    ("Could you book me a flight to Paris next Tuesday?", "booker"),
+    ("I need two nights at a hotel in Rome.", "booker"),
+    ("Reserve a room for me in Zurich, please.", "booker"),
+    ("Get me a plane ticket to Athens.", "booker"),
+    ("Book a hotel close to the conference center in Munich.", "booker"),
+    ("Please arrange flights for three people to Dubai.", "booker"),
+    ("I'd like a table for six on Sunday at noon.", "booker"),
+    ("Book me on the earliest train to Edinburgh.", "booker"),
+    ("Can you reserve a cottage in the Lake District for August?", "booker"),
+    ("Grab me a seat on a flight to Toronto this weekend.", "booker"),
+    ("Find a hotel in Prague and reserve it for Friday.", "booker"),
+    ("Book a cab to the airport for 5am.", "booker"),
+    ("I want to fly to Bangkok on the 3rd, book it please.", "booker"),
+    ("Reserve two tickets for the museum tour.", "booker"),
+    ("Please book me a room in Seoul for a week.", "booker"),
+    ("What is the capital of Australia?", "info"),
+    ("Who discovered penicillin?", "info"),
+    ("How deep is the Pacific Ocean?", "info"),
+    ("When was the Eiffel Tower built?", "info"),
+    ("Explain how a blockchain works.", "info"),
+    ("What is the population of Tokyo?", "info"),
+    ("Which is the longest river in Africa?", "info"),
+    ("How do airplanes stay in the air?", "info"),
+    ("Who invented the telephone?", "info"),
+    ("What is the difference between a virus and a bacterium?", "info"),
+    ("Tell me about the history of the Ottoman Empire.", "info"),
+    ("What is the check-in time at most hotels?", "info"),
+    ("What are the visa requirements for visiting India?", "info"),
+    ("How many moons does Jupiter have?", "info"),
+    ("Describe how the stock market works.", "info"),
+    ("Um.", "unclear"),
+    ("Do that other thing.", "unclear"),
+    ("Idk, something.", "unclear"),
+    ("Please help me.", "unclear"),
+    ("Again.", "unclear"),
+    ("The usual.", "unclear"),
+    ("Hey.", "unclear"),
+    ("Can you sort it out?", "unclear"),
+    ("Whatever is best.", "unclear"),
+    ("Not that, the other.", "unclear"),
+    ("zzz", "unclear"),
+    ("Handle this for me.", "unclear"),
+    ("Hmm, maybe.", "unclear"),
+    ("Sure.", "unclear"),
+    ("What about it?", "unclear"),
+]
+
+
+def evaluate(backend: str = "fake:instant", thresholds: tuple = (0.4, 0.5, 0.6, 0.7, 0.8, 0.9)) -> dict:
+    """
+    Score the local, LLM and hybrid routers on EVALUATION_SET.
+
+    Returns:
+        dict: {"local": {...}, "llm": {...}, "hybrid": [one row per threshold]}.
+    """
+    module = load_module(f"{PHASE_01}/2_Routing/local_router.py")
+    requests = [request for request, _ in EVALUATION_SET]
+    expected = [label for _, label in EVALUATION_SET]
+
+    start = time.perf_counter()
+    local_router = module.get_local_router()
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    local = [module.get_local_router().route(request) for request in requests]
+    local_seconds = (time.perf_counter() - start) / len(requests)
+
+    llm_router = module.build_router_chain(build_backend(backend))
+    start = time.perf_counter()
+    remote = [llm_router.invoke({"request": request}).strip() for request in requests]
+    llm_seconds = (time.perf_counter() - start) / len(requests)
+
+    def accuracy(predicted: list[str]) -> float:
+        return sum(p == e for p, e in zip(predicted, expected)) / len(expected)
+
+    hybrid_rows = []
+    for threshold in thresholds:
+        predicted = [label if confidence >= threshold else fallback
+                     for (label, confidence), fallback in zip(local, remote)]
+        skipped = sum(confidence >= threshold for _, confidence in local)
+        hybrid_rows.append({
+            "threshold": threshold,
+            "accuracy": accuracy(predicted),
+            "skip_rate": skipped / len(requests),
+            "agreement_with_llm": sum(p == r for p, r in zip(predicted, remote)) / len(requests),
+        })
+
+    return {
+        "requests": len(requests),
+        "local": {"accuracy": accuracy([label for label, _ in local]), "ms_per_request": 1000 * local_seconds,
+                  "train_ms": 1000 * train_seconds, "labels": local_router.labels},
+        "llm": {"accuracy": accuracy(remote), "ms_per_request": 1000 * llm_seconds},
+        "hybrid": hybrid_rows,
+        "misrouted_locally": [(request, label, round(confidence, 2), gold)
+                              for request, (label, confidence), gold in zip(requests, local, expected) if label != gold],
+    }
+
+
+if __name__ == "__main__":
+    backend = os.getenv("ROUTER_EVAL_BACKEND", "fake:instant")
+    thresholds = tuple(float(value) for value in os.getenv("ROUTER_EVAL_THRESHOLDS", "0.4,0.5,0.6,0.7,0.8,0.9").split(","))
+    report = evaluate(backend, thresholds)
+
+    print(f"{report['requests']} held-out requests, LLM router backend: {backend}")
+    print(f"local only : accuracy {report['local']['accuracy']:.1%}, {report['local']['ms_per_request']:.2f} ms/request "
+          f"(trained in {report['local']['train_ms']:.0f} ms)")
+    print(f"LLM only   : accuracy {report['llm']['accuracy']:.1%}, {report['llm']['ms_per_request']:.2f} ms/request, 1 call/request")
+    print(f"\n{'threshold':>9} {'accuracy':>9} {'skip rate':>10} {'agrees w/ LLM':>14}")
+    for row in report["hybrid"]:
+        print(f"{row['threshold']:9.2f} {row['accuracy']:9.1%} {row['skip_rate']:10.1%} {row['agreement_with_llm']:14.1%}")
+    if report["misrouted_locally"]:
+        print("\nMisrouted by the local classifier (request, predicted, p, expected):")
+        for row in report["misrouted_locally"]:
+            print(f"  {row}")
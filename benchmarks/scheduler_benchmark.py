@@ -0,0 +1,136 @@
+"""
+Quota Benchmark for the Gemini Scheduler
+========================================
+
+Runs the same mixed workload against a FakeLLM with a requests-per-minute
+quota, twice:
+
+- unscheduled : the LLM is used directly and wrapped in `.with_retry()`
+                (exponential backoff without jitter), as a plain client retries
+- scheduled   : every call goes through `GeminiScheduler` (sliding quota
+                windows, priorities, AIMD concurrency)
+
+The workload is JOBS concurrent `full_parallel_chain` runs ("batch" class,
+4 calls each) plus one interactive summary every INTERACTIVE_EVERY seconds.
+The quota window is shortened to QUOTA_WINDOW_S seconds so a one-minute quota
+scenario runs in a few seconds. The report shows the 429s, failed jobs, the
+makespan, interactive vs. batch latency and the scheduler's `metrics()`.
+
+Usage:
+------
+    python benchmarks/scheduler_benchmark.py
+
+Environment variables:
+    SCHEDULER_JOBS        concurrent full_parallel_chain runs (default 12)
+    SCHEDULER_QUOTA       requests allowed per quota window (default 30)
+    SCHEDULER_PROFILE     FakeLLM latency profile (default "gemini-flash")
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_llm import LATENCY_PROFILES, FakeLLM, RateLimitError
+from pattern_benchmark_suite import PHASE_01, load_module, percentile
+
+QUOTA_WINDOW_S = 6.0
+INTERACTIVE_EVERY = 0.5
+
+TOPICS = [
+    "Quantum Computing", "Photosynthesis", "The French Revolution", "Neural Networks", "Plate Tectonics",
+    "Blockchain", "The Immune System", "Black Holes", "Supply Chains", "Climate Change", "CRISPR", "Compilers",
+]
+
+
+def run_workload(batch_llm, interactive_llm, module, jobs: int) -> dict:
+    """
+    Run `jobs` full chains and the interactive calls next to them; time everything.
+    """
+    full_chain = module.build_full_parallel_chain(batch_llm)
+    summary_chain = module.build_summarize_chain(interactive_llm)
+    batch_latencies, interactive_latencies = [], []
+    failures = {"batch": 0, "interactive": 0}
+    done = threading.Event()
+
+    def job(topic: str) -> None:
+        start = time.perf_counter()
+        try:
+            full_chain.invoke({"topic": topic})
+            batch_latencies.append(time.perf_counter() - start)
+        except RateLimitError:
+            failures["batch"] += 1
+
+    def interactive() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                summary_chain.invoke({"topic": "What is a rate limit?"})
+                interactive_latencies.append(time.perf_counter() - start)
+            except RateLimitError:
+                failures["interactive"] += 1
+            done.wait(INTERACTIVE_EVERY)
+
+    start = time.perf_counter()
+    user = threading.Thread(target=interactive)
+    user.start()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(job, [TOPICS[index % len(TOPICS)] for index in range(jobs)]))
+    done.set()
+    user.join()
+    makespan = time.perf_counter() - start
+
+    def ms(values: list, q: float) -> float:
+        return 1000 * percentile(values, q) if values else float("nan")
+
+    return {
+        "makespan_s": makespan,
+        "failed_jobs": failures["batch"],
+        "failed_interactive": failures["interactive"],
+        "batch_p50_ms": ms(batch_latencies, 50), "batch_p95_ms": ms(batch_latencies, 95),
+        "interactive_p50_ms": ms(interactive_latencies, 50), "interactive_p95_ms": ms(interactive_latencies, 95),
+        "interactive_calls": len(interactive_latencies),
+    }
+
+
+def run(jobs: int = 12, quota: int = 30, profile: str = "gemini-flash") -> dict:
+    module = load_module(f"{PHASE_01}/3_Parallelization/parallelization _example.py")
+    scheduler_module = load_module(f"{PHASE_01}/3_Parallelization/gemini_scheduler.py")
+    rows = {}
+
+    llm = FakeLLM(latency=LATENCY_PROFILES[profile], requests_per_minute=quota, quota_window_s=QUOTA_WINDOW_S, seed=0)
+    # Exponential backoff without jitter (1, 2, 4, 8, 16 s): every client retries at the same moments
+    retrying = llm.with_retry(retry_if_exception_type=(RateLimitError,), stop_after_attempt=6,
+                              exponential_jitter_params={"initial": 1, "jitter": 0})
+    rows["unscheduled"] = {**run_workload(retrying, retrying, module, jobs),
+                           "calls": llm.stats.calls, "429s": llm.stats.rate_limited}
+
+    llm = FakeLLM(latency=LATENCY_PROFILES[profile], requests_per_minute=quota, quota_window_s=QUOTA_WINDOW_S, seed=0)
+    # Same quota over the same compressed window as the FakeLLM
+    scale = 60 / QUOTA_WINDOW_S
+    scheduler = scheduler_module.GeminiScheduler(requests_per_minute=quota, tokens_per_minute=None,
+                                                 window_seconds=QUOTA_WINDOW_S, cooldown=2.0 / scale)
+    rows["scheduled"] = {**run_workload(scheduler_module.scheduled(llm, "batch", scheduler),
+                                        scheduler_module.scheduled(llm, "interactive", scheduler), module, jobs),
+                         "calls": llm.stats.calls, "429s": llm.stats.rate_limited, "metrics": scheduler.metrics()}
+    return rows
+
+
+if __name__ == "__main__":
+    jobs = int(os.getenv("SCHEDULER_JOBS", "12"))
+    quota = int(os.getenv("SCHEDULER_QUOTA", "30"))
+    profile = os.getenv("SCHEDULER_PROFILE", "gemini-flash")
+    rows = run(jobs, quota, profile)
+
+    print(f"{jobs} full_parallel_chain jobs + interactive calls every {INTERACTIVE_EVERY}s, "
+          f"quota {quota} requests / {QUOTA_WINDOW_S:.0f}s, FakeLLM profile {profile}")
+    print(f"{'mode':12} {'calls':>6} {'429s':>5} {'failed':>7} {'makespan':>9} {'batch p50':>10} {'batch p95':>10} "
+          f"{'inter p50':>10} {'inter p95':>10}")
+    print("-" * 90)
+    for mode, row in rows.items():
+        failed = f"{row['failed_jobs']}+{row['failed_interactive']}"
+        print(f"{mode:12} {row['calls']:6d} {row['429s']:5d} {failed:>7} {row['makespan_s']:8.1f}s "
+              f"{row['batch_p50_ms']:8.0f}ms {row['batch_p95_ms']:8.0f}ms "
+              f"{row['interactive_p50_ms']:8.0f}ms {row['interactive_p95_ms']:8.0f}ms")
+    print("\nfailed = failed jobs + failed interactive calls")
+    print(f"scheduler metrics: {rows['scheduled']['metrics']}")
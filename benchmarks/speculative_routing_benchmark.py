@@ -0,0 +1,128 @@
+"""
+Benchmark for Speculative Routing in the 4.1 Research & Summarization Agent
+===========================================================================
+
+Answers the same skewed query mix (RESEARCH_SHARE research questions, the
+rest summaries and "explain and summarize" requests) with:
+
+- sequential  : router, then the decided branch (as `main()` in solution.py)
+- speculative : `SpeculativeRouter` at several speculation budgets
+
+and reports the end-to-end latency (router + branch; the critic step is the
+same in both modes and left out), the latency saved, the hit rate and the
+wasted-call rate. The predictor is the routing history, which starts empty.
+
+Usage:
+------
+    python benchmarks/speculative_routing_benchmark.py
+
+Environment variables:
+    SPECULATION_QUERIES       queries per mode (default 80)
+    SPECULATION_CONCURRENCY   queries in flight at the same time (default 8)
+    SPECULATION_PROFILE       FakeLLM latency profile (default "gemini-flash")
+"""
+
+import asyncio
+import os
+import random
+import time
+
+from fake_llm import LATENCY_PROFILES, FakeLLM
+from pattern_benchmark_suite import PHASE_01, load_module, percentile
+
+RESEARCH_SHARE = 0.7
+SUMMARY_SHARE = 0.2
+
+# (name, min_confidence, max_waste_rate, max_speculative_calls)
+BUDGETS = [
+    ("default", 0.5, 0.2, 2),
+    ("aggressive", 0.0, 1.0, 2),
+    ("conservative", 0.8, 0.05, 1),
+]
+
+TOPICS = [
+    "blockchain in supply chains", "CRISPR gene editing", "the history of the printing press", "quantum error correction",
+    "urban heat islands", "the causes of inflation", "coral reef bleaching", "transformer language models",
+    "the Roman road network", "battery recycling",
+]
+
+
+def query_mix(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    queries = []
+    for index in range(count):
+        topic = TOPICS[index % len(TOPICS)]
+        draw = rng.random()
+        if draw < RESEARCH_SHARE:
+            queries.append(f"Explain {topic} in detail")
+        elif draw < RESEARCH_SHARE + SUMMARY_SHARE:
+            queries.append(f"Summarize {topic}")
+        else:
+            queries.append(f"Explain and summarize {topic}")
+    return queries
+
+
+async def run_queries(answer, queries: list[str], concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(query: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await answer(query)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(query) for query in queries))
+    return latencies
+
+
+def run(count: int = 80, concurrency: int = 8, profile: str = "gemini-flash") -> list[dict]:
+    solution = load_module(f"{PHASE_01}/4.1_mini_project/solution.py")
+    speculative = load_module(f"{PHASE_01}/4.1_mini_project/speculative_routing.py")
+    queries = query_mix(count)
+    rows = []
+
+    llm = FakeLLM(latency=LATENCY_PROFILES[profile], seed=0)
+    chains = solution.build_agent_chains(llm)
+    branches = {"Research": chains["research"], "Summarization": chains["summarization"], "BOTH": chains["both"]}
+
+    async def sequential(query: str):
+        decision = speculative.normalize_decision(await chains["router"].ainvoke({"query": query}))
+        return await branches[decision].ainvoke({"query": query})
+
+    latencies = asyncio.run(run_queries(sequential, queries, concurrency))
+    rows.append({"mode": "sequential", "calls_per_query": llm.stats.calls / count,
+                 "mean_ms": 1000 * sum(latencies) / count, "p50_ms": 1000 * percentile(latencies, 50),
+                 "p95_ms": 1000 * percentile(latencies, 95), "speculated": 0, "hit_rate": 0.0,
+                 "wasted_call_rate": 0.0, "saved_mean_ms": 0.0})
+
+    for name, min_confidence, max_waste_rate, max_calls in BUDGETS:
+        llm = FakeLLM(latency=LATENCY_PROFILES[profile], seed=0)
+        router = speculative.SpeculativeRouter(solution.build_agent_chains(llm), min_confidence=min_confidence,
+                                               max_waste_rate=max_waste_rate, max_speculative_calls=max_calls)
+        latencies = asyncio.run(run_queries(router.ainvoke, queries, concurrency))
+        summary = router.stats.summary()
+        rows.append({"mode": f"speculative {name}", "calls_per_query": llm.stats.calls / count,
+                     "mean_ms": 1000 * sum(latencies) / count, "p50_ms": 1000 * percentile(latencies, 50),
+                     "p95_ms": 1000 * percentile(latencies, 95), "speculated": summary["speculated"],
+                     "hit_rate": summary["hit_rate"], "wasted_call_rate": summary["wasted_call_rate"],
+                     "saved_mean_ms": summary["latency_saved_mean_ms"]})
+    return rows
+
+
+if __name__ == "__main__":
+    count = int(os.getenv("SPECULATION_QUERIES", "80"))
+    concurrency = int(os.getenv("SPECULATION_CONCURRENCY", "8"))
+    profile = os.getenv("SPECULATION_PROFILE", "gemini-flash")
+    rows = run(count, concurrency, profile)
+
+    print(f"{count} queries ({RESEARCH_SHARE:.0%} research, {SUMMARY_SHARE:.0%} summaries, rest both), "
+          f"{concurrency} in flight, FakeLLM profile {profile}")
+    print("budgets (min_confidence, max_waste_rate, max_speculative_calls): "
+          + ", ".join(f"{name} {budget}" for name, *budget in BUDGETS))
+    print(f"{'mode':24} {'calls/q':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'spec':>5} {'hits':>6} {'wasted':>7} {'saved':>8}")
+    print("-" * 88)
+    for row in rows:
+        print(f"{row['mode']:24} {row['calls_per_query']:7.2f} {row['mean_ms']:6.0f}ms {row['p50_ms']:6.0f}ms "
+              f"{row['p95_ms']:6.0f}ms {row['speculated']:5d} {row['hit_rate']:6.0%} {row['wasted_call_rate']:7.1%} "
+              f"{row['saved_mean_ms']:6.0f}ms")
@@ -0,0 +1,114 @@
+"""
+Time-to-First-Field Benchmark for Streamed Spec Extraction
+==========================================================
+
+Compares, for long product documents, how soon the first JSON field
+(CPU / RAM / storage) is available:
+
+- two_step           : `full_chain.invoke`. Nothing is usable before both calls finish.
+- two_step_streamed  : `build_streaming_chain()`. The transform call starts as soon
+                       as the streamed extraction mentions all three specs, and
+                       fields are yielded by `IncrementalJsonParser` as they complete.
+- single_call_streamed : the single-call prompt, streamed through the same parser.
+
+On long documents a real model's extraction answer lists the specs and then
+keeps explaining them. The FakeLLM here answers the extraction prompt the same
+way: the spec list first, then EXPLANATION_WORDS words of commentary.
+
+Usage:
+------
+    python benchmarks/streaming_extraction_benchmark.py
+
+Environment variables:
+    STREAM_BENCH_PROFILE      FakeLLM latency profile (default "gemini-flash")
+    STREAM_BENCH_DOCUMENTS    documents per mode (default 10)
+"""
+
+import os
+import statistics
+import time
+
+from fake_llm import LATENCY_PROFILES, FakeLLM, filler_text, spec_list
+from pattern_benchmark_suite import PHASE_01, load_module
+
+EXPLANATION_WORDS = 300
+
+DOCUMENT = (
+    "The new laptop model features a 3.5 GHz octa-core processor, 16GB of RAM, and a 1TB NVMe SSD. "
+    + " ".join(["It is designed for creators who need a portable machine with a long battery life."] * 40)
+)
+
+
+def chatty_extraction(prompt: str) -> str:
+    return spec_list(prompt) + "\n\n" + filler_text(prompt, EXPLANATION_WORDS)
+
+
+def timed_stream(stream) -> tuple[float, float]:
+    """
+    Consume a stream of {field: value} chunks.
+
+    Returns:
+        tuple: (seconds to the first field, seconds to the last field)
+    """
+    start = time.perf_counter()
+    first = None
+    for _ in stream:
+        first = first if first is not None else time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def timed_invoke(chain, request: dict) -> tuple[float, float]:
+    """
+    Every field arrives together when the chain returns.
+    """
+    start = time.perf_counter()
+    chain.invoke(request)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def run(profile: str = "gemini-flash", documents: int = 10) -> dict:
+    """
+    Measure every mode on `documents` copies of DOCUMENT.
+
+    Returns:
+        dict: Mode → {"first_field_s": [...], "all_fields_s": [...], "calls": int}.
+    """
+    module = load_module(f"{PHASE_01}/1_Prompt_Chaining/prompt_chaining.py")
+    llm = FakeLLM(
+        latency=LATENCY_PROFILES[profile],
+        rules=[("Extract the technical specifications from the following text:\n", chatty_extraction)],
+        seed=0,
+    )
+    full_chain = module.build_full_chain(llm)
+    streaming_chain = module.build_streaming_chain(llm)
+    single_call = module.prompt_single_call | llm | module.StrOutputParser() | module.json_field_stream
+    modes = {
+        "two_step": lambda request: timed_invoke(full_chain, request),
+        "two_step_streamed": lambda request: timed_stream(streaming_chain.stream(request)),
+        "single_call_streamed": lambda request: timed_stream(single_call.stream(request)),
+    }
+
+    results = {}
+    for name, measure in modes.items():
+        llm.reset_stats()
+        firsts, totals = [], []
+        for _ in range(documents):
+            first, total = measure({"text": DOCUMENT})
+            firsts.append(first)
+            totals.append(total)
+        results[name] = {"first_field_s": firsts, "all_fields_s": totals, "calls": llm.stats.calls}
+    return results
+
+
+if __name__ == "__main__":
+    profile = os.getenv("STREAM_BENCH_PROFILE", "gemini-flash")
+    documents = int(os.getenv("STREAM_BENCH_DOCUMENTS", "10"))
+    results = run(profile, documents)
+
+    print(f"FakeLLM profile {profile}, {documents} documents, extraction answers of ~{EXPLANATION_WORDS} words")
+    print(f"{'mode':22} {'first field p50':>16} {'all fields p50':>15} {'calls/doc':>10}")
+    print("-" * 66)
+    for name, row in results.items():
+        print(f"{name:22} {statistics.median(row['first_field_s']) * 1000:14.0f}ms "
+              f"{statistics.median(row['all_fields_s']) * 1000:13.0f}ms {row['calls'] / documents:10.1f}")
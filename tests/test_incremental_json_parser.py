@@ -0,0 +1,57 @@
+"""
+IncrementalJsonParser must return the same fields however the stream is split.
+
+Run with:
+    python -m pytest tests
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Phase_01_Fundamentals_and_Basic_Agents" / "1_Prompt_Chaining"))
+
+from prompt_chaining import IncrementalJsonParser  # noqa: E402
+
+DOCUMENTS = [
+    '{"CPU": "3.5 GHz octa-core processor", "RAM": "16GB", "storage": "1TB NVMe SSD"}',
+    '{"ghz": 3.5, "cores": 8, "n": 1e3, "scale": -2.5E-2, "ok": true, "gpu": null}',
+    '{"ports": ["USB-C", "HDMI"], "size": {"inches": 14.0, "weight_kg": 1.35}, "price": 1299}',
+    '```json\n{\n  "ghz": 3.2,\n  "RAM": "32GB"\n}\n```',
+    '{"last": 42}',
+]
+
+
+def parse(chunks: list[str]) -> list[tuple[str, object]]:
+    parser = IncrementalJsonParser()
+    fields = []
+    for chunk in chunks:
+        fields.extend(parser.feed(chunk))
+    fields.extend(parser.close())
+    return fields
+
+
+def expected(document: str) -> list[tuple[str, object]]:
+    return list(json.loads(document[document.index("{"):document.rindex("}") + 1]).items())
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_every_split_offset(document):
+    for offset in range(len(document) + 1):
+        assert parse([document[:offset], document[offset:]]) == expected(document), offset
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_one_character_at_a_time(document):
+    assert parse(list(document)) == expected(document)
+
+
+def test_number_is_held_back_until_a_delimiter():
+    parser = IncrementalJsonParser()
+    assert parser.feed('{"ghz": 3.') == []
+    assert parser.feed('5') == []
+    assert parser.feed(', "n": 1e') == [("ghz", 3.5)]
+    assert parser.feed('3') == []
+    assert parser.close() == [("n", 1000.0)]
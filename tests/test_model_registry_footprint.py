@@ -0,0 +1,39 @@
+"""
+The warm pool must count int8 weights when it sizes a quantized pipeline.
+
+Run with:
+    python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+sys.path.insert(0, str(
+    Path(__file__).resolve().parent.parent
+    / "Phase_00_LLM_Engineering_Basics" / "1_pretrained_models" / "1_huggingface_transformers" / "1_pipelines"
+))
+
+from model_registry import ModelRegistry  # noqa: E402
+from quantized_backend import quantize_int8, state_dict_bytes  # noqa: E402
+
+
+def small_model() -> torch.nn.Module:
+    return torch.nn.Sequential(torch.nn.Linear(256, 512), torch.nn.ReLU(), torch.nn.Linear(512, 256))
+
+
+def test_fp32_footprint_matches_serialized_size():
+    model = small_model()
+    footprint = ModelRegistry._parameter_bytes(SimpleNamespace(model=model))
+    assert footprint == pytest.approx(state_dict_bytes(model), rel=0.1)
+
+
+def test_int8_footprint_matches_serialized_size():
+    model = quantize_int8(small_model())
+    footprint = ModelRegistry._parameter_bytes(SimpleNamespace(model=model))
+    assert footprint == pytest.approx(state_dict_bytes(model), rel=0.1)